@@ -1,5 +1,11 @@
 from django.contrib import admin
+from django.utils import timezone
 from django.utils.html import format_html
+from django.db.models import Count, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.contrib.contenttypes.models import ContentType
+from apps.core.admin import AnnotatedCountAdminMixin
+from apps.core.models import TagUsage
 from .models import (
     BlogCategory, BlogPost, BlogComment, BlogNewsletter,
     BlogSeries, BlogSeriesPost, BlogTag
@@ -7,12 +13,15 @@ from .models import (
 
 
 @admin.register(BlogCategory)
-class BlogCategoryAdmin(admin.ModelAdmin):
+class BlogCategoryAdmin(AnnotatedCountAdminMixin, admin.ModelAdmin):
     list_display = ('name', 'post_count', 'is_active', 'sort_order', 'created_at')
     list_filter = ('is_active', 'created_at')
     search_fields = ('name', 'description')
     prepopulated_fields = {'slug': ('name',)}
     readonly_fields = ('created_at', 'updated_at', 'post_count')
+    count_annotations = {
+        'post_count': Count('posts', filter=Q(posts__is_published=True), distinct=True),
+    }
     
     fieldsets = (
         ('Category Information', {
@@ -32,12 +41,13 @@ class BlogCategoryAdmin(admin.ModelAdmin):
     )
     
     def post_count(self, obj):
-        return obj.post_count
+        return self.annotated_count(obj, 'post_count')
     post_count.short_description = 'Posts'
+    post_count.admin_order_field = '_post_count'
 
 
 @admin.register(BlogPost)
-class BlogPostAdmin(admin.ModelAdmin):
+class BlogPostAdmin(AnnotatedCountAdminMixin, admin.ModelAdmin):
     list_display = (
         'title', 'author', 'category', 'status', 'is_published',
         'is_featured', 'view_count', 'comment_count', 'published_at'
@@ -48,6 +58,9 @@ class BlogPostAdmin(admin.ModelAdmin):
     readonly_fields = ('created_at', 'updated_at', 'view_count', 'comment_count')
     filter_horizontal = ()
     date_hierarchy = 'published_at'
+    count_annotations = {
+        'comment_count': Count('comments', filter=Q(comments__is_approved=True), distinct=True),
+    }
     
     fieldsets = (
         ('Post Information', {
@@ -79,23 +92,24 @@ class BlogPostAdmin(admin.ModelAdmin):
     actions = ['publish_posts', 'unpublish_posts', 'feature_posts']
     
     def publish_posts(self, request, queryset):
-        queryset.update(is_published=True, status='published')
+        queryset.update(is_published=True, status='published', updated_at=timezone.now())
         self.message_user(request, f"{queryset.count()} posts published.")
     publish_posts.short_description = "Publish selected posts"
     
     def unpublish_posts(self, request, queryset):
-        queryset.update(is_published=False, status='draft')
+        queryset.update(is_published=False, status='draft', updated_at=timezone.now())
         self.message_user(request, f"{queryset.count()} posts unpublished.")
     unpublish_posts.short_description = "Unpublish selected posts"
     
     def feature_posts(self, request, queryset):
-        queryset.update(is_featured=True)
+        queryset.update(is_featured=True, updated_at=timezone.now())
         self.message_user(request, f"{queryset.count()} posts featured.")
     feature_posts.short_description = "Feature selected posts"
     
     def comment_count(self, obj):
-        return obj.comment_count
+        return self.annotated_count(obj, 'comment_count')
     comment_count.short_description = 'Comments'
+    comment_count.admin_order_field = '_comment_count'
 
 
 @admin.register(BlogComment)
@@ -125,7 +139,6 @@ class BlogCommentAdmin(admin.ModelAdmin):
     actions = ['approve_comments', 'disapprove_comments', 'mark_as_spam']
     
     def approve_comments(self, request, queryset):
-        from django.utils import timezone
         queryset.update(is_approved=True, approved_by=request.user, approved_at=timezone.now())
         self.message_user(request, f"{queryset.count()} comments approved.")
     approve_comments.short_description = "Approve selected comments"
@@ -168,13 +181,16 @@ class BlogSeriesPostInline(admin.TabularInline):
 
 
 @admin.register(BlogSeries)
-class BlogSeriesAdmin(admin.ModelAdmin):
+class BlogSeriesAdmin(AnnotatedCountAdminMixin, admin.ModelAdmin):
     list_display = ('name', 'post_count', 'is_active', 'created_at')
     list_filter = ('is_active', 'created_at')
     search_fields = ('name', 'description')
     prepopulated_fields = {'slug': ('name',)}
     readonly_fields = ('created_at', 'updated_at', 'post_count')
     inlines = [BlogSeriesPostInline]
+    count_annotations = {
+        'post_count': Count('posts', filter=Q(posts__post__is_published=True), distinct=True),
+    }
     
     fieldsets = (
         ('Series Information', {
@@ -194,8 +210,9 @@ class BlogSeriesAdmin(admin.ModelAdmin):
     )
     
     def post_count(self, obj):
-        return obj.post_count
+        return self.annotated_count(obj, 'post_count')
     post_count.short_description = 'Posts'
+    post_count.admin_order_field = '_post_count'
 
 
 @admin.register(BlogSeriesPost)
@@ -206,13 +223,28 @@ class BlogSeriesPostAdmin(admin.ModelAdmin):
 
 
 @admin.register(BlogTag)
-class BlogTagAdmin(admin.ModelAdmin):
+class BlogTagAdmin(AnnotatedCountAdminMixin, admin.ModelAdmin):
     list_display = ('name', 'post_count', 'is_featured', 'color', 'created_at')
     list_filter = ('is_featured', 'created_at')
     search_fields = ('name', 'description')
     prepopulated_fields = {'slug': ('name',)}
     readonly_fields = ('created_at', 'updated_at', 'post_count')
     
+    def get_count_annotations(self, request):
+        # Built per request so the ContentType lookup never runs at import time
+        return {
+            'post_count': Coalesce(
+                Subquery(
+                    TagUsage.objects.filter(
+                        tag__name=OuterRef('name'),
+                        content_type=ContentType.objects.get_for_model(BlogPost),
+                    ).values('count')[:1]
+                ),
+                Value(0),
+            ),
+        }
+    
     def post_count(self, obj):
-        return obj.post_count
-    post_count.short_description = 'Posts'
\ No newline at end of file
+        return self.annotated_count(obj, 'post_count')
+    post_count.short_description = 'Posts'
+    post_count.admin_order_field = '_post_count'
\ No newline at end of file
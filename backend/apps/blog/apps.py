@@ -4,4 +4,7 @@ from django.apps import AppConfig
 class BlogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.blog'
-    verbose_name = 'Blog'
\ No newline at end of file
+    verbose_name = 'Blog'
+    
+    def ready(self):
+        import apps.blog.signals
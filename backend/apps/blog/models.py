@@ -66,6 +66,9 @@ class BlogPost(TimeStampedModel, SEOModel):
         verbose_name = 'Blog Post'
         verbose_name_plural = 'Blog Posts'
         ordering = ['-published_at', '-created_at']
+        indexes = [
+            models.Index(fields=['is_published', 'created_at', 'id']),
+        ]
     
     def __str__(self):
         return self.title
@@ -148,7 +151,7 @@ class BlogSeries(TimeStampedModel, SEOModel):
     
     @property
     def post_count(self):
-        return self.posts.filter(is_published=True).count()
+        return self.posts.filter(post__is_published=True).count()
 
 
 class BlogSeriesPost(TimeStampedModel):
@@ -187,5 +190,5 @@ class BlogTag(TimeStampedModel):
     
     @property
     def post_count(self):
-        from taggit.models import TaggedItem
-        return TaggedItem.objects.filter(tag__name=self.name).count()
\ No newline at end of file
+        from apps.core.tagging import tag_count
+        return tag_count(BlogPost, self.name)
\ No newline at end of file
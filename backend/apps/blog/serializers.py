@@ -0,0 +1,28 @@
+from rest_framework import serializers
+from taggit.serializers import TagListSerializerField
+
+from apps.core.serializers import SparseFieldsetMixin
+from .models import BlogCategory, BlogPost
+
+
+class BlogCategorySummarySerializer(serializers.ModelSerializer):
+    
+    class Meta:
+        model = BlogCategory
+        fields = ('id', 'name', 'slug')
+        read_only_fields = fields
+
+
+class BlogPostSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    author_name = serializers.CharField(source='author.full_name', read_only=True)
+    category = BlogCategorySummarySerializer(read_only=True)
+    tags = TagListSerializerField(read_only=True)
+    
+    class Meta:
+        model = BlogPost
+        fields = (
+            'id', 'title', 'slug', 'excerpt', 'content', 'author_name', 'category', 'tags',
+            'featured_image', 'featured_image_alt', 'is_featured', 'published_at',
+            'view_count', 'meta_title', 'meta_description', 'created_at', 'updated_at'
+        )
+        read_only_fields = fields
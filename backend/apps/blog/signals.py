@@ -0,0 +1,8 @@
+from django.contrib.auth import get_user_model
+from apps.core.freshness import touch_on_change
+from .models import BlogCategory, BlogPost
+
+
+# Posts show their category's name and slug and the author's name
+touch_on_change(BlogCategory, ('name', 'slug'), lambda category: BlogPost.objects.filter(category_id=category.pk))
+touch_on_change(get_user_model(), ('first_name', 'last_name'), lambda user: BlogPost.objects.filter(author_id=user.pk))
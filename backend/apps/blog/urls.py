@@ -0,0 +1,9 @@
+from rest_framework.routers import SimpleRouter
+from .views import BlogPostViewSet
+
+app_name = 'blog'
+
+router = SimpleRouter()
+router.register('blog/posts', BlogPostViewSet, basename='blog-post')
+
+urlpatterns = router.urls
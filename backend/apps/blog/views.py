@@ -0,0 +1,29 @@
+from apps.core.tagging import tagged_with
+from apps.core.views import CachedReadOnlyViewSet
+from .models import BlogPost
+from .serializers import BlogPostSerializer
+
+
+class BlogPostViewSet(CachedReadOnlyViewSet):
+    """Published posts, newest first.
+    
+    Filters: ``?category=<slug>``, ``?tag=`` and ``?featured=true``.
+    """
+    serializer_class = BlogPostSerializer
+    lookup_field = 'slug'
+    cache_timeout = 60 * 5
+    
+    def get_queryset(self):
+        queryset = BlogPost.objects.filter(is_published=True).select_related(
+            'author', 'category'
+        ).prefetch_related('tags')
+        if getattr(self, 'swagger_fake_view', False):
+            return queryset
+        params = self.request.query_params
+        if params.get('category'):
+            queryset = queryset.filter(category__slug=params['category'])
+        if params.get('tag'):
+            queryset = tagged_with(queryset, params['tag'])
+        if params.get('featured') == 'true':
+            queryset = queryset.filter(is_featured=True)
+        return queryset
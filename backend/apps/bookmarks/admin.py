@@ -1,4 +1,6 @@
 from django.contrib import admin
+from django.db.models import Count
+from apps.core.admin import AnnotatedCountAdminMixin
 from .models import Bookmark, BookmarkCollection, BookmarkCollectionItem, BusinessComparison, Shortlist, ShortlistItem
 
 
@@ -17,16 +19,20 @@ class BookmarkCollectionItemInline(admin.TabularInline):
 
 
 @admin.register(BookmarkCollection)
-class BookmarkCollectionAdmin(admin.ModelAdmin):
+class BookmarkCollectionAdmin(AnnotatedCountAdminMixin, admin.ModelAdmin):
     list_display = ('user', 'name', 'bookmark_count', 'is_public', 'created_at')
     list_filter = ('is_public', 'created_at')
     search_fields = ('user__email', 'name', 'description')
     readonly_fields = ('created_at', 'updated_at', 'bookmark_count')
     inlines = [BookmarkCollectionItemInline]
+    count_annotations = {
+        'bookmark_count': Count('bookmarks', distinct=True),
+    }
     
     def bookmark_count(self, obj):
-        return obj.bookmark_count
+        return self.annotated_count(obj, 'bookmark_count')
     bookmark_count.short_description = 'Bookmarks'
+    bookmark_count.admin_order_field = '_bookmark_count'
 
 
 @admin.register(BookmarkCollectionItem)
@@ -37,16 +43,20 @@ class BookmarkCollectionItemAdmin(admin.ModelAdmin):
 
 
 @admin.register(BusinessComparison)
-class BusinessComparisonAdmin(admin.ModelAdmin):
+class BusinessComparisonAdmin(AnnotatedCountAdminMixin, admin.ModelAdmin):
     list_display = ('user', 'name', 'business_count', 'created_at')
     list_filter = ('created_at',)
     search_fields = ('user__email', 'name', 'notes')
     readonly_fields = ('created_at', 'updated_at', 'business_count')
     filter_horizontal = ('businesses',)
+    count_annotations = {
+        'business_count': Count('businesses', distinct=True),
+    }
     
     def business_count(self, obj):
-        return obj.business_count
+        return self.annotated_count(obj, 'business_count')
     business_count.short_description = 'Businesses'
+    business_count.admin_order_field = '_business_count'
 
 
 class ShortlistItemInline(admin.TabularInline):
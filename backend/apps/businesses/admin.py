@@ -2,15 +2,21 @@ from django.contrib import admin
 from django.utils.html import format_html
 from django.db.models import Count, Avg, Q
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.safestring import mark_safe
 from import_export import resources
 from import_export.admin import ImportExportModelAdmin
 from .models import (
     Business, BusinessImage, BusinessDocument, BusinessLocation,
     BusinessService, BusinessProduct, BusinessAnalytics, 
-    BusinessVerification, BusinessSubscription
+    BusinessVerification, BusinessSubscription, BusinessAttributeValue
 )
 from apps.crm.models import Lead, CRMContact, CRMDeal, CRMActivity, CRMTask
+from apps.categories.utils import refresh_category_business_counts
+from apps.core.admin import PrefixAutocompleteAdminMixin
+from apps.core.autocomplete import get_autocomplete_index
+from apps.reviews.stats import attach_review_stats
+from .search import all_matching_ids, get_search_backend
 
 
 class BusinessResource(resources.ModelResource):
@@ -72,6 +78,13 @@ class BusinessProductInline(admin.TabularInline):
     fields = ('name', 'price', 'is_active', 'is_featured', 'stock_quantity', 'sort_order')
 
 
+class BusinessAttributeValueInline(admin.TabularInline):
+    model = BusinessAttributeValue
+    extra = 0
+    fields = ('attribute', 'option', 'text_value', 'number_value', 'boolean_value')
+    raw_id_fields = ('attribute', 'option')
+
+
 class BusinessVerificationInline(admin.TabularInline):
     model = BusinessVerification
     extra = 0
@@ -114,8 +127,9 @@ class CRMDealInline(admin.TabularInline):
 
 
 @admin.register(Business)
-class BusinessAdmin(ImportExportModelAdmin, admin.ModelAdmin):
+class BusinessAdmin(PrefixAutocompleteAdminMixin, ImportExportModelAdmin, admin.ModelAdmin):
     resource_class = BusinessResource
+    autocomplete_index = 'businesses'
     
     list_display = (
         'name', 'owner', 'category', 'business_type', 'verification_badge',
@@ -137,7 +151,7 @@ class BusinessAdmin(ImportExportModelAdmin, admin.ModelAdmin):
     filter_horizontal = ()
     inlines = [
         BusinessImageInline, BusinessDocumentInline, BusinessLocationInline, 
-        BusinessServiceInline, BusinessProductInline, BusinessVerificationInline,
+        BusinessServiceInline, BusinessProductInline, BusinessAttributeValueInline, BusinessVerificationInline,
         LeadInline, CRMContactInline, CRMDealInline
     ]
     
@@ -211,6 +225,30 @@ class BusinessAdmin(ImportExportModelAdmin, admin.ModelAdmin):
         'recalculate_health_status', 'send_verification_reminder'
     ]
     
+    list_select_related = ('owner', 'category', 'subscription__plan')
+    
+    def get_changelist_instance(self, request):
+        # Review stats for the whole page come from one cache read / grouped query
+        changelist = super().get_changelist_instance(request)
+        attach_review_stats(changelist.result_list)
+        return changelist
+    
+    def get_search_results(self, request, queryset, search_term):
+        """Match text through the search index and contact details by substring."""
+        if self.is_autocomplete_request(request):
+            return super().get_search_results(request, queryset, search_term)
+        
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        
+        matched_ids = all_matching_ids(search_term, active_only=False)
+        queryset = queryset.filter(
+            Q(pk__in=matched_ids) | Q(email__icontains=search_term) |
+            Q(phone_number__icontains=search_term) | Q(owner__email__icontains=search_term)
+        )
+        return queryset, False
+    
     def verification_badge(self, obj):
         colors = {
             'verified': '#28a745',
@@ -267,11 +305,11 @@ class BusinessAdmin(ImportExportModelAdmin, admin.ModelAdmin):
     def analytics_summary(self, obj):
         return format_html(
             '<div style="font-size: 11px;">'
-            'Views: {} | Leads: {} | Conv: {:.1f}%<br>'
-            'Rating: {:.1f} ({} reviews)'
+            'Views: {} | Leads: {} | Conv: {}%<br>'
+            'Rating: {} ({} reviews)'
             '</div>',
-            obj.view_count, obj.lead_count, obj.conversion_rate,
-            obj.average_rating or 0, obj.review_count
+            obj.view_count, obj.lead_count, f'{obj.conversion_rate:.1f}',
+            f'{obj.average_rating or 0:.1f}', obj.review_count
         )
     analytics_summary.short_description = 'Analytics'
     
@@ -284,32 +322,44 @@ class BusinessAdmin(ImportExportModelAdmin, admin.ModelAdmin):
     
     # Bulk Actions
     def verify_businesses(self, request, queryset):
-        from django.utils import timezone
         updated = queryset.update(
             verification_status='verified',
             verified_at=timezone.now(),
-            verified_by=request.user
+            verified_by=request.user,
+            updated_at=timezone.now()
         )
         self.message_user(request, f"{updated} businesses verified successfully.")
     verify_businesses.short_description = "✓ Verify selected businesses"
     
     def feature_businesses(self, request, queryset):
-        updated = queryset.update(is_featured=True)
+        business_ids = list(queryset.values_list('id', flat=True))
+        updated = queryset.update(is_featured=True, updated_at=timezone.now())
+        get_search_backend().index_businesses(business_ids)
         self.message_user(request, f"{updated} businesses featured successfully.")
     feature_businesses.short_description = "⭐ Feature selected businesses"
     
     def unfeature_businesses(self, request, queryset):
-        updated = queryset.update(is_featured=False)
+        business_ids = list(queryset.values_list('id', flat=True))
+        updated = queryset.update(is_featured=False, updated_at=timezone.now())
+        get_search_backend().index_businesses(business_ids)
         self.message_user(request, f"{updated} businesses unfeatured successfully.")
     unfeature_businesses.short_description = "Remove feature from selected businesses"
     
     def suspend_businesses(self, request, queryset):
-        updated = queryset.update(verification_status='suspended', is_active=False)
+        business_ids = list(queryset.values_list('id', flat=True))
+        updated = queryset.update(verification_status='suspended', is_active=False, updated_at=timezone.now())
+        refresh_category_business_counts()
+        get_search_backend().index_businesses(business_ids)
+        get_autocomplete_index('businesses').refresh(business_ids)
         self.message_user(request, f"{updated} businesses suspended successfully.")
     suspend_businesses.short_description = "🚫 Suspend selected businesses"
     
     def activate_businesses(self, request, queryset):
-        updated = queryset.update(is_active=True)
+        business_ids = list(queryset.values_list('id', flat=True))
+        updated = queryset.update(is_active=True, updated_at=timezone.now())
+        refresh_category_business_counts()
+        get_search_backend().index_businesses(business_ids)
+        get_autocomplete_index('businesses').refresh(business_ids)
         self.message_user(request, f"{updated} businesses activated successfully.")
     activate_businesses.short_description = "✅ Activate selected businesses"
     
@@ -443,6 +493,7 @@ class BusinessSubscriptionAdmin(admin.ModelAdmin):
     )
     list_filter = ('plan', 'is_active', 'auto_renew', 'start_date', 'end_date')
     search_fields = ('business__name', 'plan__name')
+    list_select_related = ('business', 'plan')
     readonly_fields = ('created_at', 'updated_at', 'days_remaining_display', 'is_expired')
     
     fieldsets = (
@@ -455,7 +506,7 @@ class BusinessSubscriptionAdmin(admin.ModelAdmin):
         ('Usage Tracking', {
             'fields': (
                 'used_listings', 'used_images', 'used_services',
-                'used_products', 'used_lead_credits'
+                'used_products', 'used_lead_credits', 'credits_reset_at'
             )
         }),
         ('Timestamps', {
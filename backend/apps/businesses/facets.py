@@ -0,0 +1,121 @@
+"""Faceted filtering over category attributes.
+
+Businesses store attribute values in ``BusinessAttributeValue``. Facet counts
+for a result set come from one grouped query over that table, restricted to
+the result set by subquery and to a category subtree by MPTT range.
+
+Selections follow the usual directory semantics: options of the same
+attribute are OR-ed, different attributes are AND-ed, and counts for a
+selected attribute ignore that attribute's own selection so its other
+options stay visible.
+"""
+from django.db.models import Count, Q
+
+from apps.categories.models import Category, CategoryAttribute
+from apps.categories.utils import subtree_q
+from .models import BusinessAttributeValue
+
+FACET_TYPES = ('choice', 'multi_choice', 'boolean')
+
+
+def resolve_category(category):
+    """Accept a ``Category`` or its primary key, like ``subtree_q``."""
+    if category is None or isinstance(category, Category):
+        return category
+    return Category.objects.only('tree_id', 'lft', 'rght').get(pk=category)
+
+
+def applicable_attributes(category=None):
+    """Filterable attributes defined on ``category``, its ancestors or its descendants.
+    
+    ``category`` may be a ``Category`` or its primary key.
+    """
+    attributes = CategoryAttribute.objects.filter(is_filterable=True, attribute_type__in=FACET_TYPES)
+    category = resolve_category(category)
+    if category is not None:
+        ancestors = Q(
+            category__tree_id=category.tree_id,
+            category__lft__lte=category.lft, category__rght__gte=category.rght
+        )
+        attributes = attributes.filter(ancestors | subtree_q(category))
+    return attributes.order_by('sort_order', 'name')
+
+
+def _selection_q(attribute_id, values):
+    if isinstance(values, bool):
+        return Q(attribute_id=attribute_id, boolean_value=values)
+    return Q(attribute_id=attribute_id, option_id__in=values)
+
+
+def filter_by_attributes(queryset, selections):
+    """Narrow ``queryset`` by ``{attribute_id: [option_id, ...] or bool}``."""
+    for attribute_id, values in selections.items():
+        queryset = queryset.filter(
+            pk__in=BusinessAttributeValue.objects.filter(_selection_q(attribute_id, values)).values('business_id')
+        )
+    return queryset
+
+
+def _grouped_counts(queryset, attribute_ids):
+    """``{(attribute_id, option_id, boolean_value): count}`` in one grouped query."""
+    if not attribute_ids:
+        return {}
+    rows = (
+        BusinessAttributeValue.objects
+        .filter(attribute_id__in=attribute_ids, business_id__in=queryset.order_by().values('pk'))
+        .values('attribute_id', 'option_id', 'boolean_value')
+        .annotate(count=Count('business_id', distinct=True))
+        .order_by()
+    )
+    return {(row['attribute_id'], row['option_id'], row['boolean_value']): row['count'] for row in rows}
+
+
+def facet_counts(queryset, category=None, selections=None):
+    """Return facets for the businesses in ``queryset``.
+
+    ``queryset`` is the unfiltered result set (search, location, etc.);
+    ``category`` (a ``Category`` or its primary key) narrows it to that
+    subtree and ``selections`` are applied here. Returns a list of
+    ``{'attribute': CategoryAttribute, 'options': [{'value', 'label', 'count', 'selected'}]}``.
+    """
+    selections = selections or {}
+    category = resolve_category(category)
+    if category is not None:
+        queryset = queryset.filter(subtree_q(category))
+    attributes = list(applicable_attributes(category).prefetch_related('options'))
+    attribute_ids = [attribute.id for attribute in attributes]
+
+    # Unselected attributes share one query over the fully filtered set;
+    # each selected attribute is counted without its own selection
+    counts = _grouped_counts(
+        filter_by_attributes(queryset, selections),
+        [attribute_id for attribute_id in attribute_ids if attribute_id not in selections]
+    )
+    for attribute_id in attribute_ids:
+        if attribute_id in selections:
+            others = {key: value for key, value in selections.items() if key != attribute_id}
+            counts.update(_grouped_counts(filter_by_attributes(queryset, others), [attribute_id]))
+
+    facets = []
+    for attribute in attributes:
+        selected = selections.get(attribute.id)
+        if attribute.attribute_type == 'boolean':
+            options = [
+                {
+                    'value': value, 'label': label,
+                    'count': counts.get((attribute.id, None, value), 0),
+                    'selected': selected is value,
+                }
+                for value, label in ((True, 'Yes'), (False, 'No'))
+            ]
+        else:
+            options = [
+                {
+                    'value': option.id, 'label': option.display_name,
+                    'count': counts.get((attribute.id, option.id, None), 0),
+                    'selected': bool(selected) and option.id in selected,
+                }
+                for option in attribute.options.all()
+            ]
+        facets.append({'attribute': attribute, 'options': options})
+    return facets
@@ -0,0 +1,75 @@
+"""Nearby and bounding-box lookups for businesses and their branch locations.
+
+Candidates are pre-filtered through the indexed ``geohash`` column (see
+``apps.core.geo``); only those rows are ranked by exact haversine distance.
+A business matches through its own coordinates or through any active
+``BusinessLocation``, and is reported at its closest point.
+"""
+from django.db.models import Q
+
+from apps.categories.utils import subtree_q
+from apps.core.geo import covering_cells, geohash_cells_q, haversine_km, radius_bounding_box
+from .models import Business, BusinessLocation
+
+
+def _candidate_points(min_lat, min_lng, max_lat, max_lng, category=None):
+    """Yield ``(business_id, latitude, longitude)`` for active points in the box."""
+    cells = covering_cells(min_lat, min_lng, max_lat, max_lng)
+    business_category = subtree_q(category) if category is not None else Q()
+    location_category = subtree_q(category, 'business__category__') if category is not None else Q()
+    box = dict(
+        latitude__gte=min_lat, latitude__lte=max_lat,
+        longitude__gte=min_lng, longitude__lte=max_lng,
+    )
+
+    yield from Business.objects.filter(
+        geohash_cells_q(cells), business_category, is_active=True, **box
+    ).order_by().values_list('id', 'latitude', 'longitude')
+
+    yield from BusinessLocation.objects.filter(
+        geohash_cells_q(cells), location_category,
+        is_active=True, business__is_active=True, **box
+    ).order_by().values_list('business_id', 'latitude', 'longitude')
+
+
+def _with_distances(distances, limit):
+    ranked = sorted(distances.items(), key=lambda item: (item[1], item[0]))
+    if limit is not None:
+        ranked = ranked[:limit]
+    businesses = Business.objects.select_related('category').in_bulk([business_id for business_id, _ in ranked])
+    results = []
+    for business_id, distance in ranked:
+        business = businesses[business_id]
+        business.distance_km = round(distance, 3)
+        results.append(business)
+    return results
+
+
+def nearby_businesses(latitude, longitude, radius_km, category=None, limit=50):
+    """Return active businesses within ``radius_km``, nearest first.
+
+    Each business carries a ``distance_km`` attribute measured to its closest
+    matching point (main address or branch). ``category`` includes its
+    subcategories.
+    """
+    latitude, longitude = float(latitude), float(longitude)
+    distances = {}
+    for business_id, lat, lng in _candidate_points(
+        *radius_bounding_box(latitude, longitude, radius_km), category=category
+    ):
+        distance = haversine_km(latitude, longitude, lat, lng)
+        if distance <= radius_km and distance < distances.get(business_id, float('inf')):
+            distances[business_id] = distance
+    return _with_distances(distances, limit)
+
+
+def businesses_in_bounds(min_lat, min_lng, max_lat, max_lng, category=None, limit=200):
+    """Return active businesses with a point inside the box, nearest to its centre first."""
+    min_lat, min_lng, max_lat, max_lng = map(float, (min_lat, min_lng, max_lat, max_lng))
+    center_lat, center_lng = (min_lat + max_lat) / 2, (min_lng + max_lng) / 2
+    distances = {}
+    for business_id, lat, lng in _candidate_points(min_lat, min_lng, max_lat, max_lng, category=category):
+        distance = haversine_km(center_lat, center_lng, lat, lng)
+        if distance < distances.get(business_id, float('inf')):
+            distances[business_id] = distance
+    return _with_distances(distances, limit)
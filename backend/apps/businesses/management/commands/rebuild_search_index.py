@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from apps.businesses.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the business full-text search index from the database'
+    
+    def handle(self, *args, **options):
+        start_time = timezone.now()
+        backend = get_search_backend()
+        self.stdout.write(
+            self.style.SUCCESS(f'Rebuilding search index ({backend.__class__.__name__}) at {start_time}')
+        )
+        
+        try:
+            indexed_count = backend.rebuild()
+            
+            end_time = timezone.now()
+            duration = end_time - start_time
+            
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f'Successfully indexed {indexed_count} businesses in {duration.total_seconds():.2f} seconds'
+                )
+            )
+            
+        except Exception as e:
+            self.stdout.write(
+                self.style.ERROR(f'Error rebuilding search index: {str(e)}')
+            )
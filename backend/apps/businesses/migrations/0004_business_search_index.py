@@ -0,0 +1,68 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:00
+
+from django.db import migrations
+
+
+SEARCH_TABLE = 'businesses_business_search'
+
+
+def fts5_available(connection):
+    if connection.vendor != 'sqlite':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+        return bool(cursor.fetchone()[0])
+
+
+def create_search_index(apps, schema_editor):
+    """Create and fill the FTS5 table; other databases use the in-process index."""
+    connection = schema_editor.connection
+    if not fts5_available(connection):
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+            "name, short_description, description, tags, city, category, "
+            "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+        cursor.execute(f"""
+            INSERT INTO {SEARCH_TABLE} (rowid, name, short_description, description, tags, city, category)
+            SELECT b.id, b.name, COALESCE(b.short_description, ''), b.description,
+                   COALESCE((
+                       SELECT group_concat(t.name, ' ')
+                       FROM taggit_taggeditem ti
+                       INNER JOIN taggit_tag t ON t.id = ti.tag_id
+                       INNER JOIN django_content_type ct ON ct.id = ti.content_type_id
+                       WHERE ti.object_id = b.id AND ct.app_label = 'businesses' AND ct.model = 'business'
+                   ), ''),
+                   b.city,
+                   COALESCE((
+                       SELECT group_concat(a.name, ' ')
+                       FROM categories_category a
+                       WHERE a.tree_id = c.tree_id AND a.lft <= c.lft AND a.rght >= c.rght
+                   ), '')
+            FROM businesses_business b
+            INNER JOIN categories_category c ON c.id = b.category_id
+        """)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('businesses', '0003_alter_businessdocument_options_and_more'),
+        ('categories', '0002_category_business_counts'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('taggit', '0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
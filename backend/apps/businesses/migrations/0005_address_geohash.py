@@ -0,0 +1,66 @@
+# Generated by Django 4.2.7 on 2026-10-19 14:00
+
+from django.db import migrations, models
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+GEOHASH_PRECISION = 9
+
+
+def encode_geohash(latitude, longitude, precision=GEOHASH_PRECISION):
+    # Frozen copy of apps.core.geo.encode_geohash as of this migration
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    latitude, longitude = float(latitude), float(longitude)
+    geohash = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(geohash) < precision:
+        value, bounds = (longitude, lng_range) if even else (latitude, lat_range)
+        mid = (bounds[0] + bounds[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            bounds[0] = mid
+        else:
+            bounds[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            geohash.append(BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return ''.join(geohash)
+
+
+def populate_geohashes(apps, schema_editor):
+    for model_name in ('Business', 'BusinessLocation'):
+        model = apps.get_model('businesses', model_name)
+        rows = list(
+            model.objects.filter(latitude__isnull=False, longitude__isnull=False)
+            .only('id', 'latitude', 'longitude')
+        )
+        for row in rows:
+            row.geohash = encode_geohash(row.latitude, row.longitude)
+        model.objects.bulk_update(rows, ['geohash'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('businesses', '0004_business_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='business',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, editable=False, help_text='Geohash of latitude/longitude, used for nearby lookups', max_length=12),
+        ),
+        migrations.AddField(
+            model_name='businesslocation',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, editable=False, help_text='Geohash of latitude/longitude, used for nearby lookups', max_length=12),
+        ),
+        migrations.RunPython(populate_geohashes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,104 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+WEEKDAYS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+
+# The schedule helpers below are copied from apps.core.schedule as they were
+# when this migration was written, so later edits there cannot change it.
+
+def weekly_intervals(obj, open_suffix, close_suffix):
+    intervals = []
+    for day_index, day in enumerate(WEEKDAYS):
+        opens = getattr(obj, f'{day}_{open_suffix}')
+        closes = getattr(obj, f'{day}_{close_suffix}')
+        if opens is None or closes is None:
+            continue
+        start = day_index * MINUTES_PER_DAY + opens.hour * 60 + opens.minute
+        end = day_index * MINUTES_PER_DAY + closes.hour * 60 + closes.minute
+        if end <= start:
+            end += MINUTES_PER_DAY
+        if end > MINUTES_PER_WEEK:
+            intervals.append((start, MINUTES_PER_WEEK))
+            intervals.append((0, end - MINUTES_PER_WEEK))
+        else:
+            intervals.append((start, end))
+    
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def encode_intervals(intervals):
+    return ','.join(f'{start}-{end}' for start, end in intervals)
+
+
+def hour_slots(intervals):
+    for start, end in intervals:
+        minute = start
+        while minute < end:
+            hour = minute // 60
+            slot_end = min(end, (hour + 1) * 60)
+            yield hour, minute, slot_end
+            minute = slot_end
+
+
+def populate_opening_schedules(apps, schema_editor):
+    Business = apps.get_model('businesses', 'Business')
+    BusinessScheduleSlot = apps.get_model('businesses', 'BusinessScheduleSlot')
+    
+    businesses = []
+    slots = []
+    for business in Business.objects.iterator(chunk_size=500):
+        intervals = weekly_intervals(business, 'open', 'close')
+        if not intervals:
+            continue
+        business.opening_schedule = encode_intervals(intervals)
+        businesses.append(business)
+        slots.extend(
+            BusinessScheduleSlot(business_id=business.pk, kind='opening_hours', hour_of_week=hour, start_minute=start, end_minute=end)
+            for hour, start, end in hour_slots(intervals)
+        )
+    
+    Business.objects.bulk_update(businesses, ['opening_schedule'], batch_size=500)
+    BusinessScheduleSlot.objects.bulk_create(slots, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('businesses', '0005_address_geohash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='business',
+            name='opening_schedule',
+            field=models.CharField(blank=True, editable=False, help_text='Opening hours as minute-of-week intervals, derived from the weekday fields', max_length=255),
+        ),
+        migrations.CreateModel(
+            name='BusinessScheduleSlot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('opening_hours', 'Opening Hours'), ('chat', 'Chat Availability')], max_length=20)),
+                ('hour_of_week', models.PositiveSmallIntegerField(help_text='Hours since Monday 00:00 (0-167)')),
+                ('start_minute', models.PositiveSmallIntegerField(help_text='Minute of the week the open span starts within this hour')),
+                ('end_minute', models.PositiveSmallIntegerField(help_text='Minute of the week the open span ends within this hour (exclusive)')),
+                ('business', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='schedule_slots', to='businesses.business')),
+            ],
+            options={
+                'verbose_name': 'Business Schedule Slot',
+                'verbose_name_plural': 'Business Schedule Slots',
+                'indexes': [models.Index(fields=['kind', 'hour_of_week', 'start_minute', 'end_minute', 'business'], name='businesses__kind_ba7efb_idx')],
+            },
+        ),
+        migrations.RunPython(populate_opening_schedules, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.7 on 2026-10-19 16:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('categories', '0002_category_business_counts'),
+        ('businesses', '0006_business_schedule_slots'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BusinessAttributeValue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('text_value', models.CharField(blank=True, help_text='Value for text attributes', max_length=255)),
+                ('number_value', models.DecimalField(blank=True, decimal_places=2, help_text='Value for number and range attributes', max_digits=14, null=True)),
+                ('boolean_value', models.BooleanField(blank=True, help_text='Value for boolean attributes', null=True)),
+                ('attribute', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='business_values', to='categories.categoryattribute')),
+                ('business', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attribute_values', to='businesses.business')),
+                ('option', models.ForeignKey(blank=True, help_text='Selected option for choice attributes', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='business_values', to='categories.categoryattributeoption')),
+            ],
+            options={
+                'verbose_name': 'Business Attribute Value',
+                'verbose_name_plural': 'Business Attribute Values',
+                'indexes': [models.Index(fields=['attribute', 'option', 'business'], name='businesses__attribu_72e60b_idx'), models.Index(fields=['attribute', 'boolean_value', 'business'], name='businesses__attribu_d22267_idx'), models.Index(fields=['attribute', 'number_value'], name='businesses__attribu_83f610_idx')],
+                'unique_together': {('business', 'attribute', 'option')},
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='businessattributevalue',
+            constraint=models.UniqueConstraint(condition=models.Q(('option__isnull', True)), fields=('business', 'attribute'), name='unique_business_attribute_value'),
+        ),
+    ]
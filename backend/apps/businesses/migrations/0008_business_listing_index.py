@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('businesses', '0007_business_attribute_values'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='business',
+            index=models.Index(fields=['is_active', 'created_at', 'id'], name='businesses__is_acti_5f4ca3_idx'),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 4.2.7 on 2026-10-19 19:40
+
+import calendar
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def shift_months(moment, months):
+    local = timezone.localtime(moment)
+    index = local.year * 12 + local.month - 1 + months
+    year, month = index // 12, index % 12 + 1
+    return local.replace(year=year, month=month, day=min(local.day, calendar.monthrange(year, month)[1]))
+
+
+def period_start(start, now):
+    # Monthly credit period containing ``now``, computed the way
+    # apps.payments.renewals did when this migration was written
+    if start > now:
+        return start
+    local = timezone.localtime(now)
+    anchor = timezone.localtime(start)
+    elapsed = (local.year - anchor.year) * 12 + local.month - anchor.month
+    current = shift_months(start, elapsed)
+    while current > now:
+        elapsed -= 1
+        current = shift_months(start, elapsed)
+    return current
+
+
+def populate_credits_reset_at(apps, schema_editor):
+    BusinessSubscription = apps.get_model('businesses', 'BusinessSubscription')
+    now = timezone.now()
+    subscriptions = list(BusinessSubscription.objects.only('id', 'start_date'))
+    for subscription in subscriptions:
+        subscription.credits_reset_at = period_start(subscription.start_date, now)
+    BusinessSubscription.objects.bulk_update(subscriptions, ['credits_reset_at'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('businesses', '0008_business_listing_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='businesssubscription',
+            name='credits_reset_at',
+            field=models.DateTimeField(blank=True, help_text='Start of the current monthly lead-credit period', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='businesssubscription',
+            index=models.Index(fields=['is_active', 'end_date'], name='businesses__is_acti_76168e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='businesssubscription',
+            index=models.Index(fields=['is_active', 'credits_reset_at'], name='businesses__is_acti_99a3d0_idx'),
+        ),
+        migrations.RunPython(populate_credits_reset_at, migrations.RunPython.noop),
+    ]
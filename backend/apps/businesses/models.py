@@ -1,15 +1,27 @@
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator, MaxValueValidator
 from phonenumber_field.modelfields import PhoneNumberField
 from taggit.managers import TaggableManager
 from decimal import Decimal
 from apps.core.models import TimeStampedModel, AddressModel, SEOModel
-from apps.categories.models import Category
+from apps.core.schedule import weekly_intervals, encode_intervals, decode_intervals, hour_slots, minute_of_week, is_open_at
+from apps.categories.models import Category, CategoryAttribute, CategoryAttributeOption
 
 User = get_user_model()
 
 
+class BusinessQuerySet(models.QuerySet):
+    
+    def open_at(self, moment):
+        """Businesses whose opening hours cover ``moment``."""
+        return self.filter(pk__in=BusinessScheduleSlot.open_business_ids('opening_hours', moment))
+    
+    def open_now(self):
+        return self.open_at(None)
+
+
 class Business(TimeStampedModel, AddressModel, SEOModel):
     """Main business model with enhanced features."""
     
@@ -97,6 +109,7 @@ class Business(TimeStampedModel, AddressModel, SEOModel):
     saturday_close = models.TimeField(null=True, blank=True, help_text="Saturday closing time")
     sunday_open = models.TimeField(null=True, blank=True, help_text="Sunday opening time")
     sunday_close = models.TimeField(null=True, blank=True, help_text="Sunday closing time")
+    opening_schedule = models.CharField(max_length=255, blank=True, editable=False, help_text="Opening hours as minute-of-week intervals, derived from the weekday fields")
     
     # Social Media
     facebook_url = models.URLField(blank=True, help_text="Facebook page URL")
@@ -114,6 +127,8 @@ class Business(TimeStampedModel, AddressModel, SEOModel):
     # Tags
     tags = TaggableManager(blank=True, help_text="Tags for better discoverability (comma-separated)")
     
+    objects = BusinessQuerySet.as_manager()
+    
     class Meta:
         verbose_name = 'Business'
         verbose_name_plural = 'Businesses'
@@ -124,23 +139,31 @@ class Business(TimeStampedModel, AddressModel, SEOModel):
             models.Index(fields=['health_status']),
             models.Index(fields=['category']),
             models.Index(fields=['owner']),
+            models.Index(fields=['is_active', 'created_at', 'id']),
         ]
     
     def __str__(self):
         return self.name
     
+    @property
+    def review_stats(self):
+        """Approved-review stats, from ``attach_review_stats`` or the stats cache."""
+        from apps.reviews.stats import empty_stats, get_review_stats
+        if self.pk is None:
+            return empty_stats()
+        if getattr(self, '_review_stats', None) is None:
+            self._review_stats = get_review_stats([self.pk])[self.pk]
+        return self._review_stats
+    
     @property
     def average_rating(self):
-        """Calculate average rating from reviews."""
-        reviews = self.reviews.filter(is_approved=True)
-        if reviews.exists():
-            return reviews.aggregate(models.Avg('rating'))['rating__avg']
-        return 0
+        """Average rating of approved reviews."""
+        return self.review_stats['average_rating']
     
     @property
     def review_count(self):
         """Count of approved reviews."""
-        return self.reviews.filter(is_approved=True).count()
+        return self.review_stats['review_count']
     
     @property
     def conversion_rate(self):
@@ -149,6 +172,10 @@ class Business(TimeStampedModel, AddressModel, SEOModel):
             return (self.conversion_count / self.lead_count) * 100
         return 0
     
+    @property
+    def is_open_now(self):
+        return is_open_at(decode_intervals(self.opening_schedule))
+    
     def calculate_profile_completeness(self):
         """Calculate profile completeness percentage."""
         total_fields = 20
@@ -222,7 +249,19 @@ class Business(TimeStampedModel, AddressModel, SEOModel):
         # Calculate metrics before saving
         self.calculate_profile_completeness()
         self.calculate_health_status()
+        
+        # Re-derive the schedule index only when the hours actually changed
+        intervals = weekly_intervals(self, 'open', 'close')
+        schedule = encode_intervals(intervals)
+        schedule_changed = schedule != self.opening_schedule
+        self.opening_schedule = schedule
+        if schedule_changed and kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = set(kwargs['update_fields']) | {'opening_schedule'}
+        
         super().save(*args, **kwargs)
+        
+        if schedule_changed:
+            BusinessScheduleSlot.sync(self.pk, 'opening_hours', intervals)
 
 
 class BusinessAnalytics(TimeStampedModel):
@@ -437,15 +476,25 @@ class BusinessSubscription(TimeStampedModel):
     used_services = models.PositiveIntegerField(default=0)
     used_products = models.PositiveIntegerField(default=0)
     used_lead_credits = models.PositiveIntegerField(default=0)
+    credits_reset_at = models.DateTimeField(null=True, blank=True, help_text="Start of the current monthly lead-credit period")
     
     class Meta:
         verbose_name = 'Business Subscription'
         verbose_name_plural = 'Business Subscriptions'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['is_active', 'end_date']),
+            models.Index(fields=['is_active', 'credits_reset_at']),
+        ]
     
     def __str__(self):
         return f"{self.business.name} - {self.plan.name}"
     
+    def save(self, *args, **kwargs):
+        if self.credits_reset_at is None:
+            self.credits_reset_at = self.start_date
+        super().save(*args, **kwargs)
+    
     @property
     def is_expired(self):
         from django.utils import timezone
@@ -456,4 +505,110 @@ class BusinessSubscription(TimeStampedModel):
         from django.utils import timezone
         if self.is_expired:
             return 0
-        return (self.end_date - timezone.now()).days
\ No newline at end of file
+        return (self.end_date - timezone.now()).days
+
+
+class BusinessScheduleSlot(models.Model):
+    """One hour of the week in which a business schedule is at least partly open.
+    
+    Derived from the weekday time fields of ``Business`` (opening hours) and
+    ``ChatSettings`` (chat availability); never edited directly.
+    """
+    
+    KIND_CHOICES = [
+        ('opening_hours', 'Opening Hours'),
+        ('chat', 'Chat Availability'),
+    ]
+    
+    business = models.ForeignKey(Business, on_delete=models.CASCADE, related_name='schedule_slots')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    hour_of_week = models.PositiveSmallIntegerField(help_text="Hours since Monday 00:00 (0-167)")
+    start_minute = models.PositiveSmallIntegerField(help_text="Minute of the week the open span starts within this hour")
+    end_minute = models.PositiveSmallIntegerField(help_text="Minute of the week the open span ends within this hour (exclusive)")
+    
+    class Meta:
+        verbose_name = 'Business Schedule Slot'
+        verbose_name_plural = 'Business Schedule Slots'
+        indexes = [
+            models.Index(fields=['kind', 'hour_of_week', 'start_minute', 'end_minute', 'business']),
+        ]
+    
+    def __str__(self):
+        return f"{self.business_id} {self.kind} {self.start_minute}-{self.end_minute}"
+    
+    @classmethod
+    def sync(cls, business_id, kind, intervals):
+        """Replace the slots of one schedule with those covering ``intervals``."""
+        cls.objects.filter(business_id=business_id, kind=kind).delete()
+        cls.objects.bulk_create([
+            cls(business_id=business_id, kind=kind, hour_of_week=hour, start_minute=start, end_minute=end)
+            for hour, start, end in hour_slots(intervals)
+        ])
+    
+    @classmethod
+    def open_business_ids(cls, kind, moment=None):
+        """Subquery of business ids whose ``kind`` schedule covers ``moment`` (default: now)."""
+        minute = minute_of_week(moment)
+        return cls.objects.filter(
+            kind=kind, hour_of_week=minute // 60,
+            start_minute__lte=minute, end_minute__gt=minute
+        ).values('business_id')
+
+
+class BusinessAttributeValue(TimeStampedModel):
+    """Value of a category attribute for a business.
+    
+    Choice and multi-choice attributes point at an option (one row per
+    selected option); other types use the matching typed column.
+    """
+    
+    business = models.ForeignKey(Business, on_delete=models.CASCADE, related_name='attribute_values')
+    attribute = models.ForeignKey(CategoryAttribute, on_delete=models.CASCADE, related_name='business_values')
+    option = models.ForeignKey(CategoryAttributeOption, on_delete=models.CASCADE, null=True, blank=True, related_name='business_values', help_text="Selected option for choice attributes")
+    text_value = models.CharField(max_length=255, blank=True, help_text="Value for text attributes")
+    number_value = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True, help_text="Value for number and range attributes")
+    boolean_value = models.BooleanField(null=True, blank=True, help_text="Value for boolean attributes")
+    
+    class Meta:
+        verbose_name = 'Business Attribute Value'
+        verbose_name_plural = 'Business Attribute Values'
+        unique_together = ['business', 'attribute', 'option']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['business', 'attribute'], condition=models.Q(option__isnull=True),
+                name='unique_business_attribute_value'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['attribute', 'option', 'business']),
+            models.Index(fields=['attribute', 'boolean_value', 'business']),
+            models.Index(fields=['attribute', 'number_value']),
+        ]
+    
+    def __str__(self):
+        return f"{self.business_id} - {self.attribute.name}: {self.display_value}"
+    
+    @property
+    def display_value(self):
+        if self.option_id:
+            return self.option.display_name
+        if self.boolean_value is not None:
+            return 'Yes' if self.boolean_value else 'No'
+        if self.number_value is not None:
+            return self.number_value
+        return self.text_value
+    
+    def clean(self):
+        if self.option_id and self.option.attribute_id != self.attribute_id:
+            raise ValidationError({'option': 'Option does not belong to this attribute.'})
+        if self.attribute_id and self.attribute.attribute_type in ('choice', 'multi_choice') and not self.option_id:
+            raise ValidationError({'option': 'Choice attributes need an option.'})
+        if self.business_id and self.attribute_id:
+            category = self.business.category
+            attribute_category = self.attribute.category
+            if not (
+                attribute_category.tree_id == category.tree_id
+                and attribute_category.lft <= category.lft
+                and attribute_category.rght >= category.rght
+            ):
+                raise ValidationError({'attribute': "Attribute does not apply to this business's category."})
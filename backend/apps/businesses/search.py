@@ -0,0 +1,383 @@
+"""Full-text search over business listings.
+
+Two interchangeable backends share the same documents and ranking:
+
+* ``SQLiteFTSBackend`` keeps an FTS5 virtual table (``businesses_business_search``,
+  rowid = business id) and ranks with the built-in ``bm25()``.
+* ``InMemorySearchBackend`` keeps a per-process inverted index and computes
+  BM25 itself, for databases without FTS5.
+
+Both apply the same multiplicative boosts for ``is_featured`` and for an
+active plan with ``priority_listing``. The backend can be forced with the
+``BUSINESS_SEARCH_BACKEND`` setting (dotted path to a backend class).
+"""
+import math
+import re
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Business, BusinessSubscription
+
+SEARCH_TABLE = 'businesses_business_search'
+
+# Column order of the FTS table; weights feed bm25() and the in-memory scorer
+FIELD_WEIGHTS = (
+    ('name', 10.0),
+    ('short_description', 4.0),
+    ('description', 1.0),
+    ('tags', 5.0),
+    ('city', 3.0),
+    ('category', 4.0),
+)
+
+FEATURED_BOOST = 0.5
+PRIORITY_LISTING_BOOST = 0.3
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def tokenize(text):
+    return TOKEN_RE.findall((text or '').lower())
+
+
+def category_paths(category_ids=None):
+    """Map category id to its space-separated path of names from the root.
+    
+    With ``category_ids`` only those categories and their ancestors are
+    loaded (one ``lft``/``rght`` range per category), not the whole tree.
+    """
+    from apps.categories.models import Category
+
+    categories = Category.objects.order_by('tree_id', 'lft').only('id', 'name', 'parent_id')
+    if category_ids is not None:
+        ancestors = Q(pk__in=[])
+        for tree_id, lft, rght in Category.objects.filter(pk__in=category_ids).values_list('tree_id', 'lft', 'rght'):
+            ancestors |= Q(tree_id=tree_id, lft__lte=lft, rght__gte=rght)
+        categories = categories.filter(ancestors)
+
+    paths = {}
+    for category in categories:
+        parent_path = paths.get(category.parent_id, '')
+        paths[category.id] = f"{parent_path} {category.name}".strip()
+    return paths
+
+
+def build_documents(business_ids=None, chunk_size=500):
+    """Yield one search document per business, with tag and category-path text."""
+    businesses = Business.objects.prefetch_related('tags').only(
+        'id', 'name', 'short_description', 'description', 'city', 'category_id',
+        'is_active', 'is_featured'
+    )
+    if business_ids is None:
+        paths = category_paths()
+        businesses = businesses.iterator(chunk_size=chunk_size)
+    else:
+        businesses = list(businesses.filter(pk__in=business_ids))
+        paths = category_paths({business.category_id for business in businesses})
+
+    for business in businesses:
+        yield {
+            'id': business.pk,
+            'name': business.name,
+            'short_description': business.short_description,
+            'description': business.description,
+            'tags': ' '.join(tag.name for tag in business.tags.all()),
+            'city': business.city,
+            'category': paths.get(business.category_id, ''),
+            'is_active': business.is_active,
+            'is_featured': business.is_featured,
+        }
+
+
+def priority_listing_ids(business_ids=None):
+    """Ids of businesses whose current plan includes priority listing."""
+    subscriptions = BusinessSubscription.objects.filter(
+        is_active=True, end_date__gt=timezone.now(), plan__priority_listing=True
+    )
+    if business_ids is not None:
+        subscriptions = subscriptions.filter(business_id__in=business_ids)
+    return set(subscriptions.values_list('business_id', flat=True))
+
+
+class SearchBackend(ABC):
+    """Interface shared by the search backends."""
+
+    @abstractmethod
+    def index_businesses(self, business_ids):
+        """(Re-)index the given businesses; return how many documents were written."""
+
+    @abstractmethod
+    def remove_businesses(self, business_ids):
+        """Drop the given businesses from the index."""
+
+    @abstractmethod
+    def rebuild(self):
+        """Re-index every business; return how many documents were written."""
+
+    @abstractmethod
+    def search(self, query, limit=20, offset=0, active_only=True):
+        """Return ``[(business_id, score), ...]`` best match first."""
+
+
+class SQLiteFTSBackend(SearchBackend):
+    """FTS5-backed index stored next to the business table."""
+
+    @classmethod
+    def is_available(cls):
+        if connection.vendor != 'sqlite':
+            return False
+        return SEARCH_TABLE in connection.introspection.table_names()
+
+    def _write(self, documents):
+        columns = ', '.join(name for name, _ in FIELD_WEIGHTS)
+        placeholders = ', '.join(['%s'] * (len(FIELD_WEIGHTS) + 1))
+        rows = [
+            [doc['id']] + [doc[name] or '' for name, _ in FIELD_WEIGHTS]
+            for doc in documents
+        ]
+        if rows:
+            with connection.cursor() as cursor:
+                cursor.executemany(
+                    f"INSERT INTO {SEARCH_TABLE} (rowid, {columns}) VALUES ({placeholders})", rows
+                )
+        return len(rows)
+
+    def index_businesses(self, business_ids):
+        business_ids = list(business_ids)
+        self.remove_businesses(business_ids)
+        return self._write(build_documents(business_ids))
+
+    def remove_businesses(self, business_ids):
+        business_ids = list(business_ids)
+        if not business_ids:
+            return
+        placeholders = ', '.join(['%s'] * len(business_ids))
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {SEARCH_TABLE} WHERE rowid IN ({placeholders})", business_ids)
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+        return self._write(build_documents())
+
+    def search(self, query, limit=20, offset=0, active_only=True):
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        match = ' '.join(f'"{token}"*' for token in tokens)
+        weights = ', '.join(str(weight) for _, weight in FIELD_WEIGHTS)
+        SubscriptionPlan = BusinessSubscription._meta.get_field('plan').related_model
+
+        sql = f"""
+            SELECT s.rowid,
+                   -bm25({SEARCH_TABLE}, {weights})
+                   * (1 + CASE WHEN b.is_featured THEN %s ELSE 0 END
+                        + CASE WHEN EXISTS (
+                              SELECT 1
+                              FROM {BusinessSubscription._meta.db_table} bs
+                              INNER JOIN {SubscriptionPlan._meta.db_table} p ON p.id = bs.plan_id
+                              WHERE bs.business_id = b.id AND bs.is_active AND bs.end_date > %s
+                                    AND p.priority_listing
+                          ) THEN %s ELSE 0 END) AS score
+            FROM {SEARCH_TABLE} s
+            INNER JOIN {Business._meta.db_table} b ON b.id = s.rowid
+            WHERE {SEARCH_TABLE} MATCH %s{' AND b.is_active' if active_only else ''}
+            ORDER BY score DESC, s.rowid DESC
+            LIMIT %s OFFSET %s
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [FEATURED_BOOST, timezone.now(), PRIORITY_LISTING_BOOST, match, limit, offset])
+            return [(row[0], row[1]) for row in cursor.fetchall()]
+
+
+class InMemorySearchBackend(SearchBackend):
+    """Process-local inverted index with BM25 scoring.
+
+    Built lazily from the database on first search and kept current by the
+    business signals of this process; other processes catch up on restart or
+    via ``rebuild_search_index``.
+    """
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._built = False
+        self._reset()
+
+    def _reset(self):
+        self._postings = defaultdict(dict)  # term -> {business_id: weighted tf}
+        self._doc_terms = {}                # business_id -> set(terms)
+        self._doc_length = {}
+        self._doc_boost = {}
+        self._active = set()
+        self._total_length = 0.0
+        self._vocabulary = []
+        self._vocabulary_dirty = False
+
+    def _ensure_built(self):
+        if not self._built:
+            self.rebuild()
+
+    def _remove(self, business_id):
+        for term in self._doc_terms.pop(business_id, ()):
+            postings = self._postings[term]
+            postings.pop(business_id, None)
+            if not postings:
+                del self._postings[term]
+                self._vocabulary_dirty = True
+        self._total_length -= self._doc_length.pop(business_id, 0.0)
+        self._doc_boost.pop(business_id, None)
+        self._active.discard(business_id)
+
+    def _add(self, document, priority_ids):
+        business_id = document['id']
+        frequencies = defaultdict(float)
+        for name, weight in FIELD_WEIGHTS:
+            for token in tokenize(document[name]):
+                frequencies[token] += weight
+
+        for term, frequency in frequencies.items():
+            if term not in self._postings:
+                self._vocabulary_dirty = True
+            self._postings[term][business_id] = frequency
+        self._doc_terms[business_id] = set(frequencies)
+        self._doc_length[business_id] = sum(frequencies.values())
+        self._total_length += self._doc_length[business_id]
+        self._doc_boost[business_id] = (
+            1 + (FEATURED_BOOST if document['is_featured'] else 0)
+            + (PRIORITY_LISTING_BOOST if business_id in priority_ids else 0)
+        )
+        if document['is_active']:
+            self._active.add(business_id)
+
+    def index_businesses(self, business_ids):
+        business_ids = list(business_ids)
+        with self._lock:
+            if not self._built:
+                return 0
+            documents = list(build_documents(business_ids))
+            priority_ids = priority_listing_ids(business_ids)
+            for business_id in business_ids:
+                self._remove(business_id)
+            for document in documents:
+                self._add(document, priority_ids)
+            return len(documents)
+
+    def remove_businesses(self, business_ids):
+        with self._lock:
+            for business_id in business_ids:
+                self._remove(business_id)
+
+    def rebuild(self):
+        with self._lock:
+            self._reset()
+            priority_ids = priority_listing_ids()
+            for document in build_documents():
+                self._add(document, priority_ids)
+            self._built = True
+            return len(self._doc_length)
+
+    def _expand(self, token):
+        """All indexed terms starting with ``token`` (prefix search)."""
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self._postings)
+            self._vocabulary_dirty = False
+        start = bisect_left(self._vocabulary, token)
+        terms = []
+        for term in self._vocabulary[start:]:
+            if not term.startswith(token):
+                break
+            terms.append(term)
+        return terms
+
+    def search(self, query, limit=20, offset=0, active_only=True):
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        with self._lock:
+            self._ensure_built()
+            doc_count = len(self._doc_length) or 1
+            average_length = (self._total_length / doc_count) or 1.0
+
+            scores = None
+            for token in tokens:
+                token_scores = defaultdict(float)
+                for term in self._expand(token):
+                    postings = self._postings[term]
+                    idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                    for business_id, frequency in postings.items():
+                        norm = self.k1 * (1 - self.b + self.b * self._doc_length[business_id] / average_length)
+                        token_scores[business_id] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+                if scores is None:
+                    scores = token_scores
+                else:
+                    scores = {
+                        business_id: score + token_scores[business_id]
+                        for business_id, score in scores.items() if business_id in token_scores
+                    }
+                if not scores:
+                    return []
+
+            ranked = sorted(
+                ((business_id, score * self._doc_boost[business_id])
+                 for business_id, score in scores.items()
+                 if not active_only or business_id in self._active),
+                key=lambda item: (-item[1], -item[0]),
+            )
+        return ranked[offset:offset + limit]
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_search_backend():
+    """Return the process-wide search backend, choosing one on first use."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                backend_path = getattr(settings, 'BUSINESS_SEARCH_BACKEND', None)
+                if backend_path:
+                    _backend = import_string(backend_path)()
+                elif SQLiteFTSBackend.is_available():
+                    _backend = SQLiteFTSBackend()
+                else:
+                    _backend = InMemorySearchBackend()
+    return _backend
+
+
+def search_business_ids(query, limit=20, offset=0, active_only=True):
+    return [
+        business_id for business_id, _ in get_search_backend().search(query, limit, offset, active_only)
+    ]
+
+
+def all_matching_ids(query, active_only=True, page_size=1000):
+    """Ids of every business matching ``query``, fetched from the backend a page at a time."""
+    matched = []
+    offset = 0
+    while True:
+        page = search_business_ids(query, page_size, offset, active_only)
+        matched.extend(page)
+        if len(page) < page_size:
+            return matched
+        offset += page_size
+
+
+def search_businesses(query, limit=20, offset=0, queryset=None):
+    """Return active businesses matching ``query`` in rank order."""
+    ranked_ids = search_business_ids(query, limit, offset)
+    queryset = Business.objects.all() if queryset is None else queryset
+    businesses = queryset.in_bulk(ranked_ids)
+    return [businesses[business_id] for business_id in ranked_ids if business_id in businesses]
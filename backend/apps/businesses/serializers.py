@@ -0,0 +1,31 @@
+from rest_framework import serializers
+from taggit.serializers import TagListSerializerField
+
+from apps.categories.serializers import CategorySummarySerializer
+from apps.core.serializers import SparseFieldsetMixin
+from .models import Business
+
+
+class BusinessSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    category = CategorySummarySerializer(read_only=True)
+    tags = TagListSerializerField(read_only=True)
+    is_open_now = serializers.BooleanField(read_only=True)
+    average_rating = serializers.FloatField(read_only=True)
+    review_count = serializers.IntegerField(read_only=True)
+    rating_histogram = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = Business
+        fields = (
+            'id', 'name', 'slug', 'short_description', 'description', 'business_type',
+            'category', 'tags', 'address_line_1', 'address_line_2', 'city', 'state',
+            'pincode', 'country', 'latitude', 'longitude', 'phone_number', 'email',
+            'website', 'logo', 'cover_image', 'established_year', 'is_featured',
+            'verification_status', 'is_open_now', 'average_rating', 'review_count',
+            'rating_histogram', 'meta_title', 'meta_description',
+            'created_at', 'updated_at'
+        )
+        read_only_fields = fields
+    
+    def get_rating_histogram(self, obj):
+        return {str(rating): count for rating, count in obj.review_stats['histogram'].items()}
@@ -1,10 +1,13 @@
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import post_save, post_delete, pre_save, m2m_changed
 from django.dispatch import receiver
 from django.utils import timezone
+from apps.categories.models import Category
+from apps.core.freshness import touch_on_change
 from .models import (
     Business, BusinessImage, BusinessService, BusinessProduct, 
-    BusinessDocument, BusinessAnalytics
+    BusinessDocument, BusinessAnalytics, BusinessSubscription
 )
+from .search import get_search_backend
 from .utils import BusinessMetricsCalculator
 
 
@@ -134,4 +137,77 @@ def update_business_on_document_change(sender, instance, created, **kwargs):
     """Update business metrics when documents are added/updated."""
     business = instance.business
     business.last_activity_at = timezone.now()
-    business.save()
\ No newline at end of file
+    business.save()
+
+
+# Businesses embed their category's name and slug
+touch_on_change(Category, ('name', 'slug'), lambda category: Business.objects.filter(category_id=category.pk))
+
+
+# Full-text search index maintenance
+
+SEARCH_INDEXED_FIELDS = {
+    'name', 'short_description', 'description', 'city', 'category', 'is_active', 'is_featured'
+}
+SEARCH_INDEXED_COLUMNS = tuple(
+    Business._meta.get_field(name).attname for name in sorted(SEARCH_INDEXED_FIELDS)
+)
+
+
+@receiver(pre_save, sender=Business)
+def remember_search_indexed_values(sender, instance, update_fields=None, **kwargs):
+    """Store the persisted searchable values so post_save can tell whether they changed."""
+    instance._search_indexed_values = None
+    if update_fields is not None and not SEARCH_INDEXED_FIELDS.intersection(update_fields):
+        return
+    if instance.pk and not instance._state.adding:
+        instance._search_indexed_values = (
+            Business.objects.filter(pk=instance.pk).values_list(*SEARCH_INDEXED_COLUMNS).first()
+        )
+
+
+@receiver(post_save, sender=Business)
+def update_business_search_index(sender, instance, created, update_fields=None, **kwargs):
+    """Re-index a business when one of its searchable fields changed."""
+    if update_fields is not None and not SEARCH_INDEXED_FIELDS.intersection(update_fields):
+        return
+    current = tuple(getattr(instance, column) for column in SEARCH_INDEXED_COLUMNS)
+    if not created and getattr(instance, '_search_indexed_values', None) == current:
+        return
+    get_search_backend().index_businesses([instance.pk])
+
+
+@receiver(post_delete, sender=Business)
+def remove_business_from_search_index(sender, instance, **kwargs):
+    """Drop a deleted business from the search index."""
+    get_search_backend().remove_businesses([instance.pk])
+
+
+@receiver(m2m_changed, sender=Business.tags.through)
+def update_search_index_on_tag_change(sender, instance, action, **kwargs):
+    """Re-index a business after its tags change."""
+    if action in ('post_add', 'post_remove', 'post_clear') and isinstance(instance, Business):
+        get_search_backend().index_businesses([instance.pk])
+
+
+@receiver(post_save, sender=Category)
+def update_search_index_on_category_change(sender, instance, created, **kwargs):
+    """Category names are indexed along the whole path, so re-index the subtree."""
+    if created:
+        return
+    business_ids = list(
+        Business.objects.filter(
+            category__tree_id=instance.tree_id,
+            category__lft__gte=instance.lft,
+            category__rght__lte=instance.rght,
+        ).values_list('id', flat=True)
+    )
+    if business_ids:
+        get_search_backend().index_businesses(business_ids)
+
+
+@receiver(post_save, sender=BusinessSubscription)
+@receiver(post_delete, sender=BusinessSubscription)
+def update_search_index_on_subscription_change(sender, instance, **kwargs):
+    """Plan changes move the priority-listing boost."""
+    get_search_backend().index_businesses([instance.business_id])
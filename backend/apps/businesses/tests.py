@@ -0,0 +1,117 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+
+from apps.categories.models import Category
+from apps.payments.models import SubscriptionPlan
+from .models import Business, BusinessSubscription
+from .search import SQLiteFTSBackend, all_matching_ids
+
+User = get_user_model()
+
+
+class SQLiteFTSBackendTests(TestCase):
+    """Ranking, filtering and boosts of the FTS5 index kept by the business signals."""
+
+    def setUp(self):
+        if not SQLiteFTSBackend.is_available():
+            self.skipTest('FTS5 search table not available')
+        self.backend = SQLiteFTSBackend()
+        self.owner = User.objects.create_user(username='owner', email='owner@example.com', password='x')
+        self.category = Category.objects.create(name='Food', slug='food')
+
+    def make_business(self, name, description='', **kwargs):
+        slug = name.lower().replace(' ', '-')
+        return Business.objects.create(
+            name=name, slug=slug, description=description or name, business_type='service',
+            category=self.category, owner=self.owner, phone_number='+919876543210',
+            email=f'{slug}@example.com', address_line_1='1 Main Road', city='Pune', state='MH',
+            pincode='411001', **kwargs
+        )
+
+    def subscribe(self, business, priority_listing=True, end_date=None):
+        plan = SubscriptionPlan.objects.create(
+            name='Gold', plan_type='gold', description='Gold', price=Decimal('999.00'),
+            priority_listing=priority_listing,
+        )
+        now = timezone.now()
+        return BusinessSubscription.objects.create(
+            business=business, plan=plan, start_date=now - timedelta(days=1),
+            end_date=end_date or now + timedelta(days=30),
+        )
+
+    def ids(self, query, **kwargs):
+        return [business_id for business_id, _ in self.backend.search(query, **kwargs)]
+
+    def test_prefix_match_ranks_name_above_description(self):
+        named = self.make_business('Pizza Corner')
+        described = self.make_business('Corner Cafe', description='Coffee and pizza slices')
+        self.make_business('Book House')
+
+        self.assertEqual(self.ids('piz'), [named.pk, described.pk])
+        self.assertEqual(self.ids('pizza corner'), [named.pk, described.pk])
+        self.assertEqual(self.ids('!!'), [])
+
+    def test_inactive_businesses_are_left_out(self):
+        active = self.make_business('Pizza Corner')
+        inactive = self.make_business('Pizza Hut', is_active=False)
+
+        self.assertEqual(self.ids('pizza'), [active.pk])
+        self.assertEqual(set(self.ids('pizza', active_only=False)), {active.pk, inactive.pk})
+
+    def test_priority_listing_boosts_once_per_business(self):
+        plain = self.make_business('Pizza Corner')
+        other = self.make_business('Pizza Point')
+        self.assertEqual(self.ids('pizza'), [other.pk, plain.pk])
+        plain_score = dict(self.backend.search('pizza'))[plain.pk]
+
+        self.subscribe(plain)
+
+        results = self.backend.search('pizza')
+        self.assertEqual([business_id for business_id, _ in results], [plain.pk, other.pk])
+        self.assertAlmostEqual(dict(results)[plain.pk], plain_score * 1.3, places=6)
+
+    def test_expired_plans_do_not_boost(self):
+        plain = self.make_business('Pizza Corner')
+        other = self.make_business('Pizza Point')
+        self.subscribe(plain, end_date=timezone.now() - timedelta(days=1))
+
+        self.assertEqual(self.ids('pizza'), [other.pk, plain.pk])
+
+    def test_signals_keep_the_index_current(self):
+        business = self.make_business('Pizza Corner', description='Family restaurant')
+
+        business.name = 'Burger Corner'
+        business.save()
+        self.assertEqual(self.ids('pizza'), [])
+        self.assertEqual(self.ids('burger'), [business.pk])
+
+        business.delete()
+        self.assertEqual(self.ids('burger'), [])
+
+    def test_all_matching_ids_pages_past_the_page_size(self):
+        businesses = [self.make_business(f'Pizza {i}') for i in range(5)]
+        self.make_business('Book House')
+
+        self.assertEqual(
+            sorted(all_matching_ids('pizza', page_size=2)), [business.pk for business in businesses]
+        )
+
+    def test_admin_search_matches_text_and_contact_substrings(self):
+        by_name = self.make_business('Pizza Corner')
+        by_email = self.make_business('Book House')
+        by_email.email = 'orders@pizzapost.example.com'
+        by_email.save()
+        self.make_business('Tea Stall')
+        model_admin = admin.site._registry[Business]
+        request = RequestFactory().get('/admin/businesses/business/')
+
+        queryset, _ = model_admin.get_search_results(request, Business.objects.all(), 'pizza')
+        self.assertEqual(set(queryset), {by_name, by_email})
+
+        queryset, _ = model_admin.get_search_results(request, Business.objects.all(), 'owner@example')
+        self.assertEqual(queryset.count(), 3)
@@ -0,0 +1,9 @@
+from rest_framework.routers import SimpleRouter
+from .views import BusinessViewSet
+
+app_name = 'businesses'
+
+router = SimpleRouter()
+router.register('businesses', BusinessViewSet, basename='business')
+
+urlpatterns = router.urls
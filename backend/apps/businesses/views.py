@@ -0,0 +1,48 @@
+from apps.categories.models import Category
+from apps.categories.utils import subtree_q
+from apps.core.schedule import minute_of_week
+from apps.core.tagging import tagged_with
+from apps.core.views import CachedReadOnlyViewSet
+from apps.reviews.stats import attach_review_stats
+from .models import Business
+from .serializers import BusinessSerializer
+
+
+class BusinessViewSet(CachedReadOnlyViewSet):
+    """Active businesses, newest first.
+    
+    Filters: ``?category=<slug>`` (includes subcategories), ``?city=``,
+    ``?tag=``, ``?featured=true`` and ``?open_now=true``.
+    """
+    serializer_class = BusinessSerializer
+    lookup_field = 'slug'
+    
+    def get_queryset(self):
+        queryset = Business.objects.filter(is_active=True).select_related('category').prefetch_related('tags')
+        if getattr(self, 'swagger_fake_view', False):
+            return queryset
+        params = self.request.query_params
+        if params.get('category'):
+            category = Category.objects.filter(slug=params['category'], is_active=True).first()
+            if category is None:
+                return queryset.none()
+            queryset = queryset.filter(subtree_q(category))
+        if params.get('city'):
+            queryset = queryset.filter(city__iexact=params['city'])
+        if params.get('tag'):
+            queryset = tagged_with(queryset, params['tag'])
+        if params.get('featured') == 'true':
+            queryset = queryset.filter(is_featured=True)
+        if params.get('open_now') == 'true':
+            queryset = queryset.open_now()
+        return queryset
+    
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if page is not None:
+            attach_review_stats(page)
+        return page
+    
+    def get_etag_parts(self):
+        # ``is_open_now`` and ``?open_now=`` change with the clock, not the rows
+        return (minute_of_week(),)
@@ -3,6 +3,7 @@ from mptt.admin import MPTTModelAdmin
 from .models import Category, CategoryAttribute, CategoryAttributeOption, Tag
 from import_export import resources
 from import_export.admin import ImportExportModelAdmin
+from apps.core.admin import PrefixAutocompleteAdminMixin
 
 class CategoryResource(resources.ModelResource):
     class Meta:
@@ -21,15 +22,16 @@ class CategoryAttributeOptionInline(admin.TabularInline):
 
 
 @admin.register(Category)
-class CategoryAdmin(ImportExportModelAdmin, MPTTModelAdmin):
+class CategoryAdmin(PrefixAutocompleteAdminMixin, ImportExportModelAdmin, MPTTModelAdmin):
     resource_class = CategoryResource
+    autocomplete_index = 'categories'
 
 
-    list_display = ('name', 'parent', 'is_active', 'sort_order', 'business_count', 'created_at')
+    list_display = ('name', 'parent', 'is_active', 'sort_order', 'business_count', 'direct_business_count', 'created_at')
     list_filter = ('is_active', 'is_service', 'is_product', 'is_manufacturing', 'is_freelancer', 'parent')
     search_fields = ('name', 'description')
     prepopulated_fields = {'slug': ('name',)}
-    readonly_fields = ('created_at', 'updated_at', 'business_count')
+    readonly_fields = ('created_at', 'updated_at', 'business_count', 'direct_business_count')
     inlines = [CategoryAttributeInline]
     
     fieldsets = (
@@ -39,6 +41,10 @@ class CategoryAdmin(ImportExportModelAdmin, MPTTModelAdmin):
         ('Visual', {
             'fields': ('icon', 'image', 'color')
         }),
+        ('Statistics', {
+            'fields': ('business_count', 'direct_business_count'),
+            'classes': ('collapse',)
+        }),
         ('Business Types', {
             'fields': ('is_service', 'is_product', 'is_manufacturing', 'is_freelancer'),
             'description': 'Select which business types this category applies to'
@@ -56,6 +62,7 @@ class CategoryAdmin(ImportExportModelAdmin, MPTTModelAdmin):
     def business_count(self, obj):
         return obj.business_count
     business_count.short_description = 'Businesses'
+    business_count.admin_order_field = 'subtree_business_count'
 
 
 @admin.register(CategoryAttribute)
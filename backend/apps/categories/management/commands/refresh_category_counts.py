@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from apps.categories.utils import refresh_category_business_counts
+
+
+class Command(BaseCommand):
+    help = 'Recompute direct and subtree business counts for all categories'
+    
+    def handle(self, *args, **options):
+        start_time = timezone.now()
+        self.stdout.write(
+            self.style.SUCCESS(f'Starting category count refresh at {start_time}')
+        )
+        
+        try:
+            updated_count = refresh_category_business_counts()
+            
+            end_time = timezone.now()
+            duration = end_time - start_time
+            
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f'Successfully updated {updated_count} categories in {duration.total_seconds():.2f} seconds'
+                )
+            )
+            
+        except Exception as e:
+            self.stdout.write(
+                self.style.ERROR(f'Error refreshing category counts: {str(e)}')
+            )
@@ -0,0 +1,52 @@
+# Generated by Django 4.2.7 on 2026-10-19 10:00
+
+from django.db import migrations, models
+
+
+def populate_business_counts(apps, schema_editor):
+    Category = apps.get_model('categories', 'Category')
+    Business = apps.get_model('businesses', 'Business')
+    
+    direct = dict(
+        Business.objects.filter(is_active=True)
+        .values_list('category_id')
+        .annotate(total=models.Count('id'))
+    )
+    
+    # Walk each tree in lft order; a stack of open ancestors receives every count
+    categories = list(Category.objects.order_by('tree_id', 'lft'))
+    stack = []
+    for category in categories:
+        while stack and (stack[-1].tree_id != category.tree_id or stack[-1].rght < category.lft):
+            stack.pop()
+        category.direct_business_count = direct.get(category.id, 0)
+        category.subtree_business_count = 0
+        stack.append(category)
+        for ancestor in stack:
+            ancestor.subtree_business_count += category.direct_business_count
+    
+    Category.objects.bulk_update(
+        categories, ['direct_business_count', 'subtree_business_count'], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('categories', '0001_initial'),
+        ('businesses', '0003_alter_businessdocument_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='direct_business_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Active businesses assigned directly to this category'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='subtree_business_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Active businesses in this category and all its descendants'),
+        ),
+        migrations.RunPython(populate_business_counts, migrations.RunPython.noop),
+    ]
@@ -22,6 +22,10 @@ class Category(MPTTModel, TimeStampedModel, SEOModel):
     is_manufacturing = models.BooleanField(default=False, help_text="Allow manufacturing businesses in this category")
     is_freelancer = models.BooleanField(default=False, help_text="Allow freelancer/professional services in this category")
     
+    # Denormalized counters (maintained by apps.categories.signals)
+    direct_business_count = models.PositiveIntegerField(default=0, editable=False, help_text="Active businesses assigned directly to this category")
+    subtree_business_count = models.PositiveIntegerField(default=0, editable=False, help_text="Active businesses in this category and all its descendants")
+    
     class MPTTMeta:
         order_insertion_by = ['sort_order', 'name']
     
@@ -35,9 +39,8 @@ class Category(MPTTModel, TimeStampedModel, SEOModel):
     
     @property
     def business_count(self):
-        """Count of businesses in this category and its children."""
-        from apps.businesses.models import Business
-        return Business.objects.filter(category__in=self.get_descendants(include_self=True)).count()
+        """Count of active businesses in this category and its children."""
+        return self.subtree_business_count
 
 
 class CategoryAttribute(TimeStampedModel):
@@ -0,0 +1,25 @@
+from rest_framework import serializers
+
+from apps.core.serializers import SparseFieldsetMixin
+from .models import Category
+
+
+class CategorySummarySerializer(serializers.ModelSerializer):
+    
+    class Meta:
+        model = Category
+        fields = ('id', 'name', 'slug')
+        read_only_fields = fields
+
+
+class CategorySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    business_count = serializers.IntegerField(source='subtree_business_count', read_only=True)
+    
+    class Meta:
+        model = Category
+        fields = (
+            'id', 'name', 'slug', 'description', 'parent', 'level', 'icon', 'image',
+            'color', 'sort_order', 'business_count', 'meta_title', 'meta_description',
+            'created_at', 'updated_at'
+        )
+        read_only_fields = fields
@@ -0,0 +1,51 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from .models import Category
+from .utils import adjust_category_business_count, refresh_category_business_counts
+
+
+@receiver(pre_save, sender='businesses.Business')
+def remember_business_category_state(sender, instance, **kwargs):
+    """Store the persisted category and active flag so post_save can diff them."""
+    previous = None
+    if instance.pk:
+        previous = sender.objects.filter(pk=instance.pk).values_list('category_id', 'is_active').first()
+    instance._category_count_state = previous
+
+
+@receiver(post_save, sender='businesses.Business')
+def update_category_counts_on_business_save(sender, instance, created, **kwargs):
+    """Move the business between category counters when its category or status changes."""
+    previous = getattr(instance, '_category_count_state', None)
+    current = (instance.category_id, instance.is_active)
+    if previous == current:
+        return
+    
+    if previous and previous[1]:
+        adjust_category_business_count(previous[0], -1)
+    if instance.is_active:
+        adjust_category_business_count(instance.category_id, 1)
+    instance._category_count_state = current
+
+
+@receiver(post_delete, sender='businesses.Business')
+def update_category_counts_on_business_delete(sender, instance, **kwargs):
+    """Drop a deleted active business from its category counters."""
+    if instance.is_active:
+        adjust_category_business_count(instance.category_id, -1)
+
+
+@receiver(pre_save, sender=Category)
+def remember_category_parent(sender, instance, **kwargs):
+    """Store the persisted parent so a move can be detected after save."""
+    previous_parent = None
+    if instance.pk:
+        previous_parent = Category.objects.filter(pk=instance.pk).values_list('parent_id', flat=True).first()
+    instance._previous_parent_id = previous_parent
+
+
+@receiver(post_save, sender=Category)
+def refresh_counts_on_category_move(sender, instance, created, **kwargs):
+    """Subtree totals depend on tree shape, so recompute them after a move."""
+    if not created and instance._previous_parent_id != instance.parent_id:
+        refresh_category_business_counts()
@@ -0,0 +1,80 @@
+from django.db import connection, transaction
+from django.db.models import F, Q, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from .models import Category
+
+
+def refresh_category_business_counts():
+    """Recompute direct and subtree business counts for every category.
+    
+    One pass over the tree: each category is joined to its descendants via
+    the MPTT ``lft``/``rght`` range, descendants are joined to their active
+    businesses, and the result is grouped per category.
+    """
+    from apps.businesses.models import Business
+    
+    category_table = connection.ops.quote_name(Category._meta.db_table)
+    business_table = connection.ops.quote_name(Business._meta.db_table)
+    sql = f"""
+        SELECT anc.id,
+               SUM(CASE WHEN d.id = anc.id AND b.id IS NOT NULL THEN 1 ELSE 0 END),
+               COUNT(b.id)
+        FROM {category_table} anc
+        INNER JOIN {category_table} d
+            ON d.tree_id = anc.tree_id AND d.lft >= anc.lft AND d.lft <= anc.rght
+        LEFT OUTER JOIN {business_table} b
+            ON b.category_id = d.id AND b.is_active = %s
+        GROUP BY anc.id
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [True])
+        counts = {row[0]: (row[1] or 0, row[2] or 0) for row in cursor.fetchall()}
+    
+    now = timezone.now()
+    changed = []
+    for category in Category.objects.only('id', 'direct_business_count', 'subtree_business_count'):
+        direct, subtree = counts.get(category.id, (0, 0))
+        if (category.direct_business_count, category.subtree_business_count) != (direct, subtree):
+            category.direct_business_count = direct
+            category.subtree_business_count = subtree
+            category.updated_at = now
+            changed.append(category)
+    
+    with transaction.atomic():
+        Category.objects.bulk_update(
+            changed, ['direct_business_count', 'subtree_business_count', 'updated_at'], batch_size=500
+        )
+    return len(changed)
+
+
+def adjust_category_business_count(category_id, delta):
+    """Apply ``delta`` to a category's direct count and to every ancestor's subtree count."""
+    category = Category.objects.filter(pk=category_id).values('tree_id', 'lft', 'rght').first()
+    if category is None or not delta:
+        return
+    
+    now = timezone.now()
+    Category.objects.filter(pk=category_id).update(
+        direct_business_count=Greatest(F('direct_business_count') + delta, Value(0)), updated_at=now
+    )
+    Category.objects.filter(
+        tree_id=category['tree_id'],
+        lft__lte=category['lft'],
+        rght__gte=category['rght'],
+    ).update(subtree_business_count=Greatest(F('subtree_business_count') + delta, Value(0)), updated_at=now)
+
+
+def subtree_q(category, prefix='category__'):
+    """Filter rows whose category is ``category`` or one of its descendants.
+    
+    Uses the MPTT ``tree_id``/``lft``/``rght`` range, so no recursive query is
+    needed. ``category`` may be a ``Category`` or its primary key.
+    """
+    if not isinstance(category, Category):
+        category = Category.objects.only('tree_id', 'lft', 'rght').get(pk=category)
+    return Q(**{
+        f'{prefix}tree_id': category.tree_id,
+        f'{prefix}lft__gte': category.lft,
+        f'{prefix}rght__lte': category.rght,
+    })
@@ -0,0 +1,22 @@
+from apps.core.views import CachedReadOnlyViewSet
+from .models import Category
+from .serializers import CategorySerializer
+
+
+class CategoryViewSet(CachedReadOnlyViewSet):
+    """Active categories in creation order; ``?parent=<slug>`` or ``?parent=root``."""
+    serializer_class = CategorySerializer
+    lookup_field = 'slug'
+    cursor_descending = False
+    cache_timeout = 60 * 10
+    
+    def get_queryset(self):
+        queryset = Category.objects.filter(is_active=True)
+        if getattr(self, 'swagger_fake_view', False):
+            return queryset
+        parent = self.request.query_params.get('parent')
+        if parent == 'root':
+            queryset = queryset.filter(parent__isnull=True)
+        elif parent:
+            queryset = queryset.filter(parent__slug=parent)
+        return queryset
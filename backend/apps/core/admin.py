@@ -1,4 +1,5 @@
 from django.contrib import admin
+from .autocomplete import get_autocomplete_index
 
 
 class TimeStampedModelAdmin(admin.ModelAdmin):
@@ -16,4 +17,60 @@ class SEOModelAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
-    prepopulated_fields = {'slug': ('name',)}
\ No newline at end of file
+    prepopulated_fields = {'slug': ('name',)}
+
+
+class AnnotatedCountAdminMixin:
+    """Annotate per-row relation counts onto the changelist queryset.
+    
+    ``count_annotations`` maps a display name to the expression computing it,
+    e.g. ``{'post_count': Count('posts')}``. Values are stored under
+    ``_<name>`` so they never clash with a model property of the same name;
+    use ``annotated_count`` to read them and ``'_<name>'`` as the
+    ``admin_order_field`` to make the column sortable. Override
+    ``get_count_annotations`` when an expression can only be built at
+    request time.
+    """
+    count_annotations = {}
+    
+    def get_count_annotations(self, request):
+        return self.count_annotations
+    
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        annotations = self.get_count_annotations(request)
+        if annotations:
+            queryset = queryset.annotate(**{
+                f'_{name}': expression for name, expression in annotations.items()
+            })
+        return queryset
+    
+    def annotated_count(self, obj, name):
+        """Return the annotated count, falling back to the model property."""
+        value = getattr(obj, f'_{name}', None)
+        if value is None:
+            return getattr(obj, name)
+        return value
+
+
+class PrefixAutocompleteAdminMixin:
+    """Answer admin autocomplete lookups from an in-process prefix index.
+    
+    Set ``autocomplete_index`` to a name from ``apps.core.autocomplete.SOURCES``.
+    Only the autocomplete view is affected; the changelist search box keeps
+    using ``search_fields`` (or the admin's own ``get_search_results``).
+    """
+    autocomplete_index = None
+    autocomplete_limit = 100
+    
+    def is_autocomplete_request(self, request):
+        match = getattr(request, 'resolver_match', None)
+        return match is not None and match.url_name == 'autocomplete'
+    
+    def get_search_results(self, request, queryset, search_term):
+        if self.autocomplete_index and search_term and self.is_autocomplete_request(request):
+            matches = get_autocomplete_index(self.autocomplete_index).search(
+                search_term, limit=self.autocomplete_limit, include_hidden=True
+            )
+            return queryset.filter(pk__in=[object_id for object_id, _ in matches]), False
+        return super().get_search_results(request, queryset, search_term)
@@ -0,0 +1,278 @@
+"""In-process prefix indexes for autocomplete.
+
+Each index is a sorted array of ``(key, object_id)`` pairs searched with
+``bisect``, so a lookup costs O(log n) plus the matches returned. For names
+every word start is indexed ("luigi pizza house", "pizza house", "house"),
+so "piz" finds the business. Indexes are built on first use and shared by
+the whole process.
+
+Signals (``connect_signals``) keep an index current for writes made in the
+same process, deletions included. Writes from other processes are picked up
+by a background thread, started by a search at most every ``SYNC_INTERVAL``
+seconds while the search itself answers from the current arrays: it reloads
+the rows whose ``updated_at`` moved since the last sync (for sources without
+such a column, the rows above the highest indexed pk), and rebuilds
+completely once the index is older than ``MAX_AGE``, which is also when rows
+deleted or renamed elsewhere drop out. Rows are read and new arrays built
+outside the lock; only the swap holds it.
+"""
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection
+from django.db.models.signals import post_save, post_delete
+from django.utils import timezone
+
+WORD_START_RE = re.compile(r'(?<![\w])\w', re.UNICODE)
+
+SYNC_INTERVAL = 30
+MAX_AGE = 60 * 15
+# Re-read a little before the last sync, for clock skew between app servers
+SYNC_OVERLAP = timedelta(seconds=60)
+
+
+def normalize(text):
+    return ' '.join((text or '').lower().split())
+
+
+class AutocompleteSource:
+    """Where an index gets its entries from.
+
+    ``hidden_field`` names a boolean field; rows where it is false are kept
+    in the index (admin lookups need them) but left out of public results.
+    """
+
+    def __init__(self, model, field, word_starts=True, hidden_field=None, public=True, updated_field='updated_at'):
+        self.model_label = model
+        self.field = field
+        self.word_starts = word_starts
+        self.hidden_field = hidden_field
+        self.public = public
+        self.updated_field = updated_field
+    
+    @property
+    def indexed_fields(self):
+        return {self.field} | ({self.hidden_field} if self.hidden_field else set())
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    def keys(self, text):
+        text = normalize(text)
+        if not text:
+            return []
+        if not self.word_starts:
+            return [text]
+        return sorted({text[match.start():] for match in WORD_START_RE.finditer(text)})
+
+    def is_hidden(self, obj):
+        return self.hidden_field is not None and not getattr(obj, self.hidden_field)
+
+    def changed_ids(self, since, last_id):
+        """Ids of rows written since ``since``, or added after ``last_id`` without an ``updated_field``."""
+        if self.updated_field is None:
+            lookup = {'pk__gt': last_id} if last_id is not None else {}
+        else:
+            lookup = {f'{self.updated_field}__gte': since}
+        return set(self.model._default_manager.filter(**lookup).values_list('pk', flat=True))
+    
+    def rows(self, object_ids=None):
+        fields = ['pk', self.field] + ([self.hidden_field] if self.hidden_field else [])
+        queryset = self.model._default_manager.order_by()
+        if object_ids is not None:
+            queryset = queryset.filter(pk__in=object_ids)
+        for row in queryset.values_list(*fields).iterator(chunk_size=5000):
+            yield row[0], row[1], self.hidden_field is not None and not row[2]
+
+
+class PrefixIndex:
+
+    def __init__(self, source):
+        self.source = source
+        self._lock = threading.RLock()
+        self._built = False
+        self._entries = []   # sorted (key, object_id)
+        self._keys = {}      # object_id -> keys
+        self._labels = {}
+        self._hidden = set()
+        self._built_at = 0.0     # monotonic time of the last full build
+        self._checked_at = 0.0   # monotonic time the last sync was started
+        self._synced_at = None   # database-side time the last sync started
+        self._syncing = False
+        self._touched = None     # ids written by signals while a rebuild runs
+
+    def rebuild(self):
+        """Read every row and swap in fresh arrays; writes seen meanwhile are re-read after the swap."""
+        with self._lock:
+            self._touched = set()
+        started = timezone.now()
+        entries = []
+        keys = {}
+        labels = {}
+        hidden = set()
+        for object_id, text, is_hidden in self.source.rows():
+            object_keys = self.source.keys(text)
+            keys[object_id] = object_keys
+            labels[object_id] = text
+            if is_hidden:
+                hidden.add(object_id)
+            entries.extend((key, object_id) for key in object_keys)
+        entries.sort()
+        with self._lock:
+            touched, self._touched = self._touched, None
+            self._entries, self._keys, self._labels, self._hidden = entries, keys, labels, hidden
+            self._built = True
+            self._built_at = self._checked_at = time.monotonic()
+            self._synced_at = started
+        if touched:
+            self.refresh(touched)
+        return len(labels)
+
+    def sync(self):
+        """Catch up with writes made by other processes (see module docstring)."""
+        if not self._built or time.monotonic() - self._built_at > MAX_AGE:
+            return self.rebuild()
+        started = timezone.now()
+        with self._lock:
+            since, last_id = self._synced_at - SYNC_OVERLAP, max(self._labels, default=None)
+        changed = self.source.changed_ids(since, last_id)
+        if changed:
+            self.refresh(changed)
+        self._synced_at = started
+        return len(changed)
+
+    def _sync_in_background(self):
+        try:
+            self.sync()
+        finally:
+            self._syncing = False
+            connection.close()
+
+    def start_sync(self):
+        """Run ``sync`` in a background thread unless one is already running."""
+        with self._lock:
+            if self._syncing:
+                return
+            self._syncing = True
+            self._checked_at = time.monotonic()
+        threading.Thread(
+            target=self._sync_in_background, name=f'autocomplete-sync-{self.source.model_label}', daemon=True
+        ).start()
+
+    def _remove(self, object_id):
+        for key in self._keys.pop(object_id, ()):
+            position = bisect_left(self._entries, (key, object_id))
+            if position < len(self._entries) and self._entries[position] == (key, object_id):
+                del self._entries[position]
+        self._labels.pop(object_id, None)
+        self._hidden.discard(object_id)
+
+    def _add(self, object_id, text, is_hidden):
+        object_keys = self.source.keys(text)
+        for key in object_keys:
+            insort(self._entries, (key, object_id))
+        self._keys[object_id] = object_keys
+        self._labels[object_id] = text
+        if is_hidden:
+            self._hidden.add(object_id)
+
+    def update(self, obj):
+        text = getattr(obj, self.source.field)
+        is_hidden = self.source.is_hidden(obj)
+        with self._lock:
+            if self._touched is not None:
+                self._touched.add(obj.pk)
+            if not self._built:
+                return
+            if self._labels.get(obj.pk) == text and (obj.pk in self._hidden) == is_hidden:
+                return
+            self._remove(obj.pk)
+            self._add(obj.pk, text, is_hidden)
+
+    def refresh(self, object_ids):
+        """Reload entries for rows changed without signals (``QuerySet.update``)."""
+        if not self._built:
+            return
+        object_ids = set(object_ids)
+        rows = list(self.source.rows(object_ids))
+        with self._lock:
+            if self._touched is not None:
+                self._touched.update(object_ids)
+            for object_id in object_ids:
+                self._remove(object_id)
+            for object_id, text, is_hidden in rows:
+                self._add(object_id, text, is_hidden)
+
+    def remove(self, object_id):
+        with self._lock:
+            if self._touched is not None:
+                self._touched.add(object_id)
+            if self._built:
+                self._remove(object_id)
+
+    def search(self, prefix, limit=10, include_hidden=False):
+        """Return up to ``limit`` ``(object_id, label)`` pairs matching ``prefix``."""
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        if not self._built:
+            with self._lock:
+                if not self._built:
+                    self.rebuild()
+        elif time.monotonic() - self._checked_at > SYNC_INTERVAL:
+            self.start_sync()
+        with self._lock:
+            results = []
+            seen = set()
+            position = bisect_left(self._entries, (prefix,))
+            while position < len(self._entries) and len(results) < limit:
+                key, object_id = self._entries[position]
+                if not key.startswith(prefix):
+                    break
+                position += 1
+                if object_id in seen or (not include_hidden and object_id in self._hidden):
+                    continue
+                seen.add(object_id)
+                results.append((object_id, self._labels[object_id]))
+            return results
+
+
+SOURCES = {
+    'businesses': AutocompleteSource('businesses.Business', 'name', hidden_field='is_active'),
+    'categories': AutocompleteSource('categories.Category', 'name', hidden_field='is_active'),
+    'tags': AutocompleteSource('taggit.Tag', 'name', updated_field=None),
+    'users': AutocompleteSource(settings.AUTH_USER_MODEL, 'email', word_starts=False, public=False),
+}
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_autocomplete_index(name):
+    """Return the process-wide index called ``name`` (see ``SOURCES``)."""
+    if name not in _indexes:
+        with _indexes_lock:
+            if name not in _indexes:
+                _indexes[name] = PrefixIndex(SOURCES[name])
+    return _indexes[name]
+
+
+def connect_signals():
+    """Keep every index current from its model's save and delete signals."""
+    for name, source in SOURCES.items():
+        def update_index(sender, instance, name=name, update_fields=None, **kwargs):
+            if update_fields is not None and not SOURCES[name].indexed_fields.intersection(update_fields):
+                return
+            get_autocomplete_index(name).update(instance)
+
+        def remove_from_index(sender, instance, name=name, **kwargs):
+            get_autocomplete_index(name).remove(instance.pk)
+
+        post_save.connect(update_index, sender=source.model, weak=False, dispatch_uid=f'autocomplete_update_{name}')
+        post_delete.connect(remove_from_index, sender=source.model, weak=False, dispatch_uid=f'autocomplete_remove_{name}')
@@ -0,0 +1,18 @@
+from django.db import models
+
+
+class SubqueryCount(models.Subquery):
+    """Correlated COUNT(*) over a queryset, usable in annotate() and order_by()."""
+    template = '(SELECT COUNT(*) FROM (%(subquery)s) _count)'
+    output_field = models.PositiveIntegerField()
+
+
+class SubquerySum(models.Subquery):
+    """Correlated SUM of one column of a queryset (0 when it is empty).
+    
+    The queryset must select ``column`` with ``values(column)``.
+    """
+    template = '(SELECT COALESCE(SUM(_sum.%(column)s), 0) FROM (%(subquery)s) _sum)'
+    
+    def __init__(self, queryset, column, output_field=None, **extra):
+        super().__init__(queryset.values(column), output_field=output_field, column=column, **extra)
@@ -0,0 +1,64 @@
+"""Keep ``updated_at`` in step with values serialized from related rows.
+
+The read-only API derives its validators from ``updated_at``. When an
+endpoint renders a value that lives on another row (a category's name, an
+author's name, a business slug), changing that row must also touch the rows
+that show it, or clients keep getting 304s for stale data.
+
+``touch_on_change(model, fields, related)`` registers such a dependency:
+when a saved ``model`` instance changes one of ``fields``,
+``related(instance)`` (a queryset) gets its ``updated_at`` set to now. The
+stored values are read once per save, in one query covering every field
+registered for the model; saves whose ``update_fields`` leave all of them
+out cost nothing.
+"""
+from collections import defaultdict
+
+from django.db.models.signals import post_save, pre_save
+from django.utils import timezone
+
+_dependencies = defaultdict(list)
+
+
+def touch(queryset):
+    """Set ``updated_at`` to now on every row of ``queryset``; returns how many."""
+    return queryset.update(updated_at=timezone.now())
+
+
+def _watched_fields(model):
+    return {field for fields, related in _dependencies[model] for field in fields}
+
+
+def _remember(sender, instance, update_fields=None, **kwargs):
+    fields = _watched_fields(sender)
+    if update_fields is not None:
+        fields &= set(update_fields)
+    instance._watched_values = None
+    if fields and instance.pk and not instance._state.adding:
+        fields = sorted(fields)
+        attnames = [sender._meta.get_field(field).attname for field in fields]
+        row = sender._default_manager.filter(pk=instance.pk).values_list(*attnames).first()
+        if row is not None:
+            instance._watched_values = dict(zip(fields, row))
+
+
+def _touch_related(sender, instance, created, **kwargs):
+    stored = getattr(instance, '_watched_values', None)
+    if created or not stored:
+        return
+    changed = {
+        field for field, value in stored.items()
+        if getattr(instance, sender._meta.get_field(field).attname) != value
+    }
+    for fields, related in _dependencies[sender]:
+        if changed.intersection(fields):
+            touch(related(instance))
+    instance._watched_values = None
+
+
+def touch_on_change(model, fields, related):
+    """Touch ``related(instance)`` whenever a save of ``model`` changes one of ``fields``."""
+    _dependencies[model].append((tuple(fields), related))
+    uid = f'touch_on_change_{model._meta.label_lower}'
+    pre_save.connect(_remember, sender=model, weak=False, dispatch_uid=uid)
+    post_save.connect(_touch_related, sender=model, weak=False, dispatch_uid=uid)
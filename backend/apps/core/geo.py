@@ -0,0 +1,110 @@
+"""Geohash encoding and distance helpers for coordinate lookups.
+
+Coordinates are stored with a fixed-precision geohash in an indexed column.
+A radius or bounding-box query is turned into a handful of geohash cells;
+each cell becomes a ``[prefix, prefix + '~')`` range on that column, which
+every database can answer from a plain b-tree index. Exact distances are
+then computed only for the rows inside those cells.
+"""
+import math
+
+from django.db.models import Q
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+GEOHASH_PRECISION = 9
+EARTH_RADIUS_KM = 6371.0088
+MAX_QUERY_CELLS = 16
+
+
+def encode_geohash(latitude, longitude, precision=GEOHASH_PRECISION):
+    """Return the geohash of a point, or ``''`` if either coordinate is missing."""
+    if latitude is None or longitude is None:
+        return ''
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    latitude, longitude = float(latitude), float(longitude)
+
+    geohash = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(geohash) < precision:
+        value, bounds = (longitude, lng_range) if even else (latitude, lat_range)
+        mid = (bounds[0] + bounds[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            bounds[0] = mid
+        else:
+            bounds[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            geohash.append(BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return ''.join(geohash)
+
+
+def cell_size(precision):
+    """Return the ``(lat_degrees, lng_degrees)`` size of a cell at ``precision``."""
+    lng_bits = math.ceil(precision * 5 / 2)
+    lat_bits = math.floor(precision * 5 / 2)
+    return 180.0 / (2 ** lat_bits), 360.0 / (2 ** lng_bits)
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    lat1, lng1, lat2, lng2 = map(math.radians, (float(lat1), float(lng1), float(lat2), float(lng2)))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def radius_bounding_box(latitude, longitude, radius_km):
+    """Return ``(min_lat, min_lng, max_lat, max_lng)`` enclosing a circle."""
+    latitude, longitude = float(latitude), float(longitude)
+    lat_delta = math.degrees(radius_km / EARTH_RADIUS_KM)
+    cos_lat = math.cos(math.radians(latitude))
+    lng_delta = 180.0 if cos_lat < 1e-6 else min(180.0, lat_delta / cos_lat)
+    return (
+        max(-90.0, latitude - lat_delta), max(-180.0, longitude - lng_delta),
+        min(90.0, latitude + lat_delta), min(180.0, longitude + lng_delta),
+    )
+
+
+def covering_cells(min_lat, min_lng, max_lat, max_lng, max_cells=MAX_QUERY_CELLS):
+    """Return the smallest set of geohash prefixes covering a bounding box.
+
+    Picks the finest precision that needs at most ``max_cells`` cells.
+    """
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        lat_step, lng_step = cell_size(precision)
+        rows = math.floor(max_lat / lat_step) - math.floor(min_lat / lat_step) + 1
+        columns = math.floor(max_lng / lng_step) - math.floor(min_lng / lng_step) + 1
+        if rows * columns > max_cells:
+            continue
+
+        cells = set()
+        for row in range(rows):
+            lat = min(max_lat, min_lat + row * lat_step)
+            for column in range(columns):
+                lng = min(max_lng, min_lng + column * lng_step)
+                cells.add(encode_geohash(lat, lng, precision))
+            cells.add(encode_geohash(lat, max_lng, precision))
+        for column in range(columns):
+            cells.add(encode_geohash(max_lat, min(max_lng, min_lng + column * lng_step), precision))
+        cells.add(encode_geohash(max_lat, max_lng, precision))
+        return sorted(cells)
+    return ['']
+
+
+def geohash_cells_q(cells, field='geohash'):
+    """Build an index-friendly filter matching rows inside any of ``cells``."""
+    if cells == ['']:
+        return ~Q(**{field: ''})
+    condition = Q()
+    for cell in cells:
+        condition |= Q(**{f'{field}__gte': cell, f'{field}__lt': cell + '~'})
+    return condition
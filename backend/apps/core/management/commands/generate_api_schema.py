@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from config.schema import write_schema_file
+
+
+class Command(BaseCommand):
+    help = 'Generate the OpenAPI schema file served by the swagger and redoc pages'
+    
+    def handle(self, *args, **options):
+        start_time = timezone.now()
+        self.stdout.write(
+            self.style.SUCCESS(f'Starting API schema generation at {start_time}')
+        )
+        
+        try:
+            size = write_schema_file()
+            
+            end_time = timezone.now()
+            duration = end_time - start_time
+            
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f'Successfully wrote {size} bytes of schema in {duration.total_seconds():.2f} seconds'
+                )
+            )
+            
+        except Exception as e:
+            self.stdout.write(
+                self.style.ERROR(f'Error generating API schema: {str(e)}')
+            )
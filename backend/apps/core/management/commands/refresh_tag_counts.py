@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from apps.core.tagging import refresh_tag_usage
+
+
+class Command(BaseCommand):
+    help = 'Rebuild per-model tag usage counts from tagged items'
+    
+    def handle(self, *args, **options):
+        start_time = timezone.now()
+        self.stdout.write(
+            self.style.SUCCESS(f'Starting tag count refresh at {start_time}')
+        )
+        
+        try:
+            usage_count = refresh_tag_usage()
+            
+            end_time = timezone.now()
+            duration = end_time - start_time
+            
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f'Successfully rebuilt {usage_count} tag counts in {duration.total_seconds():.2f} seconds'
+                )
+            )
+            
+        except Exception as e:
+            self.stdout.write(
+                self.style.ERROR(f'Error refreshing tag counts: {str(e)}')
+            )
@@ -0,0 +1,47 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def populate_tag_usage(apps, schema_editor):
+    TaggedItem = apps.get_model('taggit', 'TaggedItem')
+    TagUsage = apps.get_model('core', 'TagUsage')
+    rows = (
+        TaggedItem.objects.order_by()
+        .values('content_type_id', 'tag_id')
+        .annotate(total=models.Count('id'))
+    )
+    TagUsage.objects.bulk_create(
+        [TagUsage(content_type_id=row['content_type_id'], tag_id=row['tag_id'], count=row['total']) for row in rows],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('taggit', '0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TagUsage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype')),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='usage_counts', to='taggit.tag')),
+            ],
+            options={
+                'verbose_name': 'Tag Usage',
+                'verbose_name_plural': 'Tag Usage',
+                'indexes': [models.Index(fields=['content_type', '-count'], name='core_tagusa_content_fcee53_idx')],
+                'unique_together': {('content_type', 'tag')},
+            },
+        ),
+        migrations.RunPython(populate_tag_usage, migrations.RunPython.noop),
+    ]
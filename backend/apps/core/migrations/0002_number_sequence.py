@@ -0,0 +1,30 @@
+# Generated by Django 4.2.7 on 2026-10-19 19:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NumberSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('prefix', models.CharField(help_text="Document prefix, e.g. 'INV' or 'TKT'", max_length=10)),
+                ('period', models.CharField(help_text='Month the numbers belong to, as YYYY-MM', max_length=7)),
+                ('last_value', models.PositiveIntegerField(default=0, help_text='Last number allocated in this period')),
+            ],
+            options={
+                'verbose_name': 'Number Sequence',
+                'verbose_name_plural': 'Number Sequences',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='numbersequence',
+            constraint=models.UniqueConstraint(fields=('prefix', 'period'), name='unique_number_sequence'),
+        ),
+    ]
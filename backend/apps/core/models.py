@@ -1,5 +1,7 @@
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from .geo import encode_geohash
 
 
 
@@ -23,10 +25,18 @@ class AddressModel(models.Model):
     country = models.CharField(max_length=100, default='India')
     latitude = models.DecimalField(max_digits=10, decimal_places=8, null=True, blank=True)
     longitude = models.DecimalField(max_digits=11, decimal_places=8, null=True, blank=True)
+    geohash = models.CharField(max_length=12, blank=True, db_index=True, editable=False, help_text="Geohash of latitude/longitude, used for nearby lookups")
 
     class Meta:
         abstract = True
 
+    def save(self, *args, **kwargs):
+        self.geohash = encode_geohash(self.latitude, self.longitude)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'latitude', 'longitude'} & set(update_fields):
+            kwargs['update_fields'] = set(update_fields) | {'geohash'}
+        super().save(*args, **kwargs)
+
 
 class SEOModel(models.Model):
     """Abstract base model for SEO fields."""
@@ -36,4 +46,48 @@ class SEOModel(models.Model):
     slug = models.SlugField(max_length=255, unique=True)
 
     class Meta:
-        abstract = True
\ No newline at end of file
+        abstract = True
+
+
+class TagUsage(models.Model):
+    """Number of objects of one model carrying one taggit tag.
+    
+    Maintained incrementally from ``TaggedItem`` saves and deletes (see
+    ``apps.core.tagging``); rebuild with ``refresh_tag_counts``.
+    """
+    tag = models.ForeignKey('taggit.Tag', on_delete=models.CASCADE, related_name='usage_counts')
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = 'Tag Usage'
+        verbose_name_plural = 'Tag Usage'
+        unique_together = ['content_type', 'tag']
+        indexes = [
+            models.Index(fields=['content_type', '-count']),
+        ]
+
+    def __str__(self):
+        return f"{self.tag} ({self.content_type}): {self.count}"
+
+
+class NumberSequence(models.Model):
+    """Counter behind one family of document numbers for one month.
+    
+    Numbers are handed out by ``apps.core.sequences``, which increments
+    ``last_value`` in the caller's transaction, so a rolled-back document
+    gives its number back and the series stays gap-free.
+    """
+    prefix = models.CharField(max_length=10, help_text="Document prefix, e.g. 'INV' or 'TKT'")
+    period = models.CharField(max_length=7, help_text="Month the numbers belong to, as YYYY-MM")
+    last_value = models.PositiveIntegerField(default=0, help_text="Last number allocated in this period")
+
+    class Meta:
+        verbose_name = 'Number Sequence'
+        verbose_name_plural = 'Number Sequences'
+        constraints = [
+            models.UniqueConstraint(fields=['prefix', 'period'], name='unique_number_sequence'),
+        ]
+
+    def __str__(self):
+        return f"{self.prefix}-{self.period}: {self.last_value}"
@@ -0,0 +1,109 @@
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def encode_cursor(value, pk):
+    """Encode a ``(timestamp or number, pk)`` position as an opaque URL-safe cursor."""
+    value = value.isoformat() if isinstance(value, datetime) else repr(float(value))
+    raw = f"{value}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Decode a cursor produced by ``encode_cursor``; raises ValueError if malformed."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        value, pk = base64.urlsafe_b64decode(padded.encode()).decode().split('|')
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            value = float(value)
+        return value, int(pk)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def keyset_page(queryset, cursor=None, limit=50, descending=True, field='created_at'):
+    """Return ``(items, next_cursor)`` for one page ordered by ``(field, pk)``.
+    
+    Rows strictly after the cursor position in the chosen direction are
+    returned, so the cost of a page depends only on ``limit`` and an index on
+    ``(..., field, id)``, not on how deep the client has scrolled.
+    ``next_cursor`` is None when there are no further rows.
+    """
+    lookup = 'lt' if descending else 'gt'
+    if cursor:
+        value, pk = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(**{f'{field}__{lookup}': value}) | Q(**{field: value, f'pk__{lookup}': pk})
+        )
+    prefix = '-' if descending else ''
+    items = list(queryset.order_by(f'{prefix}{field}', f'{prefix}pk')[:limit + 1])
+    
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        next_cursor = encode_cursor(getattr(last, field), last.pk)
+    return items, next_cursor
+
+
+class KeysetPagination(BasePagination):
+    """DRF pagination over ``keyset_page``.
+    
+    Views choose the ordering with ``cursor_field`` (a timestamp or numeric
+    column) and ``cursor_descending``; clients follow ``next`` (or send
+    ``?cursor=``) and may ask for up to ``max_page_size`` rows with ``?limit=``.
+    """
+    page_size = 20
+    max_page_size = 100
+    
+    def get_limit(self, request):
+        try:
+            limit = int(request.query_params.get('limit', self.page_size))
+        except ValueError:
+            limit = self.page_size
+        return max(1, min(limit, self.max_page_size))
+    
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        try:
+            items, self.next_cursor = keyset_page(
+                queryset,
+                cursor=request.query_params.get('cursor'),
+                limit=self.get_limit(request),
+                descending=getattr(view, 'cursor_descending', True),
+                field=getattr(view, 'cursor_field', 'created_at'),
+            )
+        except ValueError as e:
+            raise ValidationError({'cursor': str(e)})
+        return items
+    
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), 'cursor', self.next_cursor)
+    
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'next_cursor': self.next_cursor,
+            'results': data,
+        })
+    
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'next_cursor': {'type': 'string', 'nullable': True},
+                'results': schema,
+            },
+        }
@@ -0,0 +1,76 @@
+"""Weekly schedules as minute-of-week intervals.
+
+Models that store hours as per-weekday ``TimeField`` pairs (``monday_open`` /
+``monday_close`` and so on) are normalised into sorted, merged
+``(start, end)`` intervals measured in minutes from Monday 00:00 in
+``settings.TIME_ZONE``. A closing time at or before the opening time runs
+past midnight into the next day; an interval running past Sunday midnight
+wraps to Monday.
+
+Intervals are stored compactly as ``"540-1080,1980-2520"`` and split into
+per-hour slots so "open at T" becomes an equality-plus-range index lookup.
+"""
+from django.utils import timezone
+
+WEEKDAYS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+
+def weekly_intervals(obj, open_suffix='open', close_suffix='close'):
+    """Read the per-weekday time fields of ``obj`` into merged intervals."""
+    intervals = []
+    for day_index, day in enumerate(WEEKDAYS):
+        opens = getattr(obj, f'{day}_{open_suffix}')
+        closes = getattr(obj, f'{day}_{close_suffix}')
+        if opens is None or closes is None:
+            continue
+        start = day_index * MINUTES_PER_DAY + opens.hour * 60 + opens.minute
+        end = day_index * MINUTES_PER_DAY + closes.hour * 60 + closes.minute
+        if end <= start:
+            end += MINUTES_PER_DAY
+        if end > MINUTES_PER_WEEK:
+            intervals.append((start, MINUTES_PER_WEEK))
+            intervals.append((0, end - MINUTES_PER_WEEK))
+        else:
+            intervals.append((start, end))
+
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def encode_intervals(intervals):
+    return ','.join(f'{start}-{end}' for start, end in intervals)
+
+
+def decode_intervals(value):
+    if not value:
+        return []
+    return [tuple(int(part) for part in interval.split('-')) for interval in value.split(',')]
+
+
+def hour_slots(intervals):
+    """Split intervals into ``(hour_of_week, start, end)`` pieces, one per hour touched."""
+    for start, end in intervals:
+        minute = start
+        while minute < end:
+            hour = minute // 60
+            slot_end = min(end, (hour + 1) * 60)
+            yield hour, minute, slot_end
+            minute = slot_end
+
+
+def minute_of_week(moment=None):
+    """Minute offset from Monday 00:00 local time for ``moment`` (default: now)."""
+    moment = timezone.localtime(moment) if moment is not None else timezone.localtime()
+    return moment.weekday() * MINUTES_PER_DAY + moment.hour * 60 + moment.minute
+
+
+def is_open_at(intervals, moment=None):
+    minute = minute_of_week(moment)
+    return any(start <= minute < end for start, end in intervals)
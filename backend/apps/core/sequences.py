@@ -0,0 +1,76 @@
+"""Gap-free document numbers of the form ``<PREFIX>-<YYYY>-<MM>-<NNNNNN>``.
+
+Each ``(prefix, month)`` pair has one ``NumberSequence`` row. ``allocate``
+reserves a block of numbers by incrementing that row in a single UPDATE
+(``UPDATE ... RETURNING`` on PostgreSQL; elsewhere the UPDATE's row lock is
+held while the new value is read back), so concurrent callers queue on the
+row instead of colliding on the documents' unique constraint and never need
+to retry.
+
+The increment joins the caller's transaction: when the document insert
+fails and rolls back, so does the counter, and no number is skipped. The
+flip side is that the row stays locked until the caller commits, so bulk
+work should reserve its numbers in one ``allocate`` / ``assign_numbers``
+call rather than one per document.
+"""
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import NumberSequence
+
+DIGITS = 6
+
+
+def period_for(date=None):
+    """``YYYY-MM`` of ``date`` (default: today, local time)."""
+    return (date or timezone.localdate()).strftime('%Y-%m')
+
+
+def format_number(prefix, period, value):
+    return f"{prefix}-{period}-{value:0{DIGITS}d}"
+
+
+def _increment(prefix, period, count):
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'UPDATE {NumberSequence._meta.db_table} SET last_value = last_value + %s '
+                'WHERE prefix = %s AND period = %s RETURNING last_value',
+                [count, prefix, period],
+            )
+            return cursor.fetchone()[0]
+    sequence = NumberSequence.objects.filter(prefix=prefix, period=period)
+    sequence.update(last_value=F('last_value') + count)
+    return sequence.values_list('last_value', flat=True).get()
+
+
+def allocate(prefix, count=1, date=None):
+    """Reserve ``count`` consecutive numbers; returns them as a ``range``."""
+    if count < 1:
+        return range(0)
+    period = period_for(date)
+    NumberSequence.objects.bulk_create([NumberSequence(prefix=prefix, period=period)], ignore_conflicts=True)
+    with transaction.atomic():
+        last = _increment(prefix, period, count)
+    return range(last - count + 1, last + 1)
+
+
+def next_number(prefix, date=None):
+    """Allocate and format one number."""
+    value, = allocate(prefix, 1, date)
+    return format_number(prefix, period_for(date), value)
+
+
+def assign_numbers(instances, field, prefix, date=None):
+    """Fill ``field`` on the instances that lack a number, reserving one block.
+
+    Meant for ``bulk_create``, which skips ``save()``: call it inside the
+    same transaction as the insert so a failed insert releases the block.
+    """
+    pending = [instance for instance in instances if not getattr(instance, field)]
+    period = period_for(date)
+    for instance, value in zip(pending, allocate(prefix, len(pending), date)):
+        setattr(instance, field, format_number(prefix, period, value))
+    return instances
+
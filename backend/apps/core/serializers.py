@@ -0,0 +1,16 @@
+class SparseFieldsetMixin:
+    """Serializer mixin honouring ``?fields=name,slug`` on the request.
+
+    Unknown names are ignored; with no ``fields`` parameter every declared
+    field is returned. Works for ``many=True`` since the child serializer
+    receives the same context.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        requested = request.query_params.get('fields') if request is not None else None
+        if requested:
+            wanted = {name.strip() for name in requested.split(',') if name.strip()}
+            for name in set(self.fields) - wanted:
+                self.fields.pop(name)
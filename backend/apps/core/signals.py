@@ -0,0 +1,19 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from taggit.models import TaggedItem
+from .tagging import adjust_tag_usage, touch_tagged_object
+
+
+@receiver(post_save, sender=TaggedItem)
+def count_tag_added(sender, instance, created, **kwargs):
+    """Count a new tag assignment."""
+    if created:
+        adjust_tag_usage(instance.content_type_id, instance.tag_id, 1)
+        touch_tagged_object(instance.content_type_id, instance.object_id)
+
+
+@receiver(post_delete, sender=TaggedItem)
+def count_tag_removed(sender, instance, **kwargs):
+    """Uncount a removed tag assignment, including cascades from deleted objects."""
+    adjust_tag_usage(instance.content_type_id, instance.tag_id, -1)
+    touch_tagged_object(instance.content_type_id, instance.object_id)
@@ -0,0 +1,112 @@
+"""Tag statistics for taggit-tagged models.
+
+``TagUsage`` keeps a per-model, per-tag object count, adjusted from
+``TaggedItem`` row saves and deletes (which also covers tagged objects being
+deleted, where taggit sends no m2m signal). Tag clouds are read from those
+counts and cached per model until a count for that model changes. The same
+row signals touch the tagged object's ``updated_at``, since its serialized
+tag list changed.
+"""
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Value
+from django.db.models.functions import Greatest
+from taggit.models import Tag, TaggedItem
+
+from .freshness import touch
+from .models import TagUsage
+
+TAG_CLOUD_CACHE_TIMEOUT = 60 * 10
+TAG_CLOUD_MAX_SIZE = 100
+
+
+def _cloud_cache_key(content_type_id):
+    return f'tag_cloud:{content_type_id}'
+
+
+def adjust_tag_usage(content_type_id, tag_id, delta):
+    """Add ``delta`` to one model/tag count, creating the row on first use."""
+    updated = TagUsage.objects.filter(content_type_id=content_type_id, tag_id=tag_id).update(
+        count=Greatest(F('count') + delta, Value(0))
+    )
+    if not updated and delta > 0:
+        try:
+            with transaction.atomic():
+                TagUsage.objects.create(content_type_id=content_type_id, tag_id=tag_id, count=delta)
+        except IntegrityError:
+            # Created concurrently; apply the delta to that row instead
+            TagUsage.objects.filter(content_type_id=content_type_id, tag_id=tag_id).update(count=F('count') + delta)
+    cache.delete(_cloud_cache_key(content_type_id))
+
+
+def touch_tagged_object(content_type_id, object_id):
+    """Bump ``updated_at`` on the object a tag was added to or removed from."""
+    model = ContentType.objects.get_for_id(content_type_id).model_class()
+    if model is not None and any(field.name == 'updated_at' for field in model._meta.concrete_fields):
+        touch(model._default_manager.filter(pk=object_id))
+
+
+def refresh_tag_usage():
+    """Rebuild every count from ``TaggedItem`` in one grouped query."""
+    rows = (
+        TaggedItem.objects.order_by()
+        .values('content_type_id', 'tag_id')
+        .annotate(total=Count('id'))
+    )
+    usages = [
+        TagUsage(content_type_id=row['content_type_id'], tag_id=row['tag_id'], count=row['total'])
+        for row in rows
+    ]
+    content_type_ids = {usage.content_type_id for usage in usages}
+    with transaction.atomic():
+        content_type_ids.update(TagUsage.objects.values_list('content_type_id', flat=True).distinct())
+        TagUsage.objects.all().delete()
+        TagUsage.objects.bulk_create(usages, batch_size=1000)
+    cache.delete_many([_cloud_cache_key(content_type_id) for content_type_id in content_type_ids])
+    return len(usages)
+
+
+def tag_cloud(model, limit=30):
+    """Most used tags for ``model`` as ``[{'id', 'name', 'slug', 'count'}]``."""
+    content_type_id = ContentType.objects.get_for_model(model).id
+    key = _cloud_cache_key(content_type_id)
+    cloud = cache.get(key)
+    if cloud is None:
+        rows = (
+            TagUsage.objects.filter(content_type_id=content_type_id, count__gt=0)
+            .order_by('-count', 'tag__name')
+            .values_list('tag_id', 'tag__name', 'tag__slug', 'count')[:TAG_CLOUD_MAX_SIZE]
+        )
+        cloud = [
+            {'id': tag_id, 'name': name, 'slug': slug, 'count': count}
+            for tag_id, name, slug, count in rows
+        ]
+        cache.set(key, cloud, TAG_CLOUD_CACHE_TIMEOUT)
+    return cloud[:limit]
+
+
+def tag_count(model, tag):
+    """Number of ``model`` objects carrying ``tag`` (a ``Tag`` or its name)."""
+    lookup = {'tag': tag} if isinstance(tag, Tag) else {'tag__name': tag}
+    return TagUsage.objects.filter(
+        content_type_id=ContentType.objects.get_for_model(model).id, **lookup
+    ).values_list('count', flat=True).first() or 0
+
+
+def tagged_with(queryset, tag):
+    """Filter ``queryset`` to objects carrying ``tag`` (a ``Tag``, slug or name).
+
+    Resolves the tag first, then filters on ``TaggedItem`` by ``tag_id`` and
+    the cached content type id, so neither the tag nor the content type
+    table is joined.
+    """
+    if not isinstance(tag, Tag):
+        tag = Tag.objects.filter(slug=tag).first() or Tag.objects.filter(name=tag).first()
+        if tag is None:
+            return queryset.none()
+    object_ids = TaggedItem.objects.filter(
+        tag_id=tag.pk,
+        content_type_id=ContentType.objects.get_for_model(queryset.model).id,
+    ).values('object_id')
+    return queryset.filter(pk__in=object_ids)
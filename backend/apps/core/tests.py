@@ -0,0 +1,116 @@
+from datetime import date
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.test import TestCase
+from taggit.models import Tag
+
+from .autocomplete import SOURCES, PrefixIndex
+from .models import NumberSequence
+from .sequences import allocate, assign_numbers, next_number
+
+
+class Numbered:
+    def __init__(self, number=''):
+        self.number = number
+
+
+class SequenceTests(TestCase):
+    day = date(2026, 10, 19)
+
+    def test_allocate_reserves_consecutive_blocks(self):
+        self.assertEqual(allocate('TST', 3, self.day), range(1, 4))
+        self.assertEqual(allocate('TST', 2, self.day), range(4, 6))
+        self.assertEqual(allocate('TST', 0, self.day), range(0))
+        self.assertEqual(
+            NumberSequence.objects.get(prefix='TST', period='2026-10').last_value, 5
+        )
+
+    def test_blocks_are_per_prefix_and_month(self):
+        allocate('TST', 4, self.day)
+        self.assertEqual(allocate('TST', 1, date(2026, 11, 1)), range(1, 2))
+        self.assertEqual(allocate('OTH', 1, self.day), range(1, 2))
+        self.assertEqual(next_number('TST', self.day), 'TST-2026-10-000005')
+
+    def test_rolled_back_block_is_released(self):
+        allocate('TST', 2, self.day)
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                allocate('TST', 5, self.day)
+                raise RuntimeError
+        self.assertEqual(allocate('TST', 1, self.day), range(3, 4))
+
+    def test_assign_numbers_fills_only_missing_numbers_from_one_block(self):
+        instances = [Numbered(), Numbered('TST-2026-10-000099'), Numbered(), Numbered()]
+        allocate('TST', 1, self.day)
+
+        assign_numbers(instances, 'number', 'TST', self.day)
+
+        self.assertEqual(
+            [instance.number for instance in instances],
+            ['TST-2026-10-000002', 'TST-2026-10-000099', 'TST-2026-10-000003', 'TST-2026-10-000004'],
+        )
+        self.assertEqual(NumberSequence.objects.get(prefix='TST', period='2026-10').last_value, 4)
+
+
+class PrefixIndexTests(TestCase):
+
+    def test_word_starts_and_hidden_rows(self):
+        index = PrefixIndex(SOURCES['tags'])
+        pizza = Tag.objects.create(name='Wood Fired Pizza', slug='wood-fired-pizza')
+        pasta = Tag.objects.create(name='Pasta', slug='pasta')
+
+        self.assertEqual(index.search('piz'), [(pizza.pk, 'Wood Fired Pizza')])
+        self.assertEqual([object_id for object_id, _ in index.search('p')], [pasta.pk, pizza.pk])
+        self.assertEqual(index.search('  '), [])
+
+    def test_sync_picks_up_writes_made_without_signals(self):
+        User = get_user_model()
+        user = User.objects.create_user(username='ann', email='ann@example.com', password='x')
+        index = PrefixIndex(SOURCES['users'])
+        self.assertEqual(index.search('ann'), [(user.pk, 'ann@example.com')])
+
+        User.objects.filter(pk=user.pk).update(email='anna@example.com')
+        self.assertEqual(index.sync(), 1)
+        self.assertEqual(index.search('ann'), [(user.pk, 'anna@example.com')])
+
+    def test_sync_adds_new_rows_of_sources_without_updated_at(self):
+        index = PrefixIndex(SOURCES['tags'])
+        Tag.objects.create(name='Pizza', slug='pizza')
+        index.search('piz')
+
+        Tag.objects.bulk_create([Tag(name='Pizzeria', slug='pizzeria')])
+        self.assertEqual(index.sync(), 1)
+        self.assertEqual([label for _, label in index.search('piz')], ['Pizza', 'Pizzeria'])
+
+    def test_stale_index_answers_before_syncing_in_the_background(self):
+        index = PrefixIndex(SOURCES['tags'])
+        Tag.objects.create(name='Pizza', slug='pizza')
+        index.search('piz')
+        index._checked_at = 0.0
+
+        with mock.patch.object(PrefixIndex, 'start_sync') as start_sync, \
+                mock.patch.object(PrefixIndex, 'sync') as sync:
+            self.assertEqual([label for _, label in index.search('piz')], ['Pizza'])
+        start_sync.assert_called_once_with()
+        sync.assert_not_called()
+
+    def test_writes_during_a_rebuild_are_reapplied(self):
+        index = PrefixIndex(SOURCES['tags'])
+        tag = Tag.objects.create(name='Pizza', slug='pizza')
+        index.search('piz')
+        rows = SOURCES['tags'].rows
+
+        def rows_then_delete(*args):
+            result = list(rows(*args))
+            if not args:
+                # What the post_delete signal does for the process-wide index
+                tag_id = tag.pk
+                tag.delete()
+                index.remove(tag_id)
+            return result
+
+        with mock.patch.object(SOURCES['tags'], 'rows', side_effect=rows_then_delete):
+            index.rebuild()
+        self.assertEqual(index.search('piz'), [])
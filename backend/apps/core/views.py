@@ -0,0 +1,144 @@
+import hashlib
+
+from django.core.cache import cache
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+from rest_framework import permissions, status, viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .autocomplete import SOURCES, get_autocomplete_index
+from .pagination import KeysetPagination, keyset_page
+
+
+class AutocompleteView(APIView):
+    """Prefix suggestions: ``?q=piz&types=businesses,categories&limit=10``.
+    
+    ``users`` (emails) is only served to staff; inactive businesses and
+    categories are left out.
+    """
+    permission_classes = [permissions.AllowAny]
+    default_limit = 10
+    max_limit = 50
+    
+    def get_types(self):
+        allowed = [
+            name for name, source in SOURCES.items()
+            if source.public or self.request.user.is_staff
+        ]
+        requested = self.request.query_params.get('types')
+        if not requested:
+            return [name for name in allowed if SOURCES[name].public]
+        return [name for name in requested.split(',') if name in allowed]
+    
+    def get_limit(self):
+        try:
+            limit = int(self.request.query_params.get('limit', self.default_limit))
+        except ValueError:
+            limit = self.default_limit
+        return max(1, min(limit, self.max_limit))
+    
+    def get(self, request):
+        query = request.query_params.get('q', '')
+        limit = self.get_limit()
+        results = {}
+        for name in self.get_types():
+            results[name] = [
+                {'id': object_id, 'label': label}
+                for object_id, label in get_autocomplete_index(name).search(query, limit=limit)
+            ]
+        return Response({'query': query, 'results': results})
+
+
+class CachedReadOnlyViewSet(viewsets.ReadOnlyModelViewSet):
+    """Public read-only endpoint with conditional GET and a response cache.
+    
+    The validator for a list covers only the requested page: the ids and
+    ``Max(updated_at)`` of its rows plus whether a next page exists, read
+    with the same keyset query the page itself uses (so its cost does not
+    grow with the table); for a detail it is the object's own
+    ``updated_at``. Together with the full request path it forms the ETag,
+    so a matching ``If-None-Match`` (or a fresh ``If-Modified-Since``) is
+    answered with 304 before anything is serialized, and serialized data is
+    cached under the ETag for ``cache_timeout`` seconds. Any save bumps
+    ``updated_at`` and therefore the ETag, so stale entries are never read;
+    bulk ``update()`` calls must set ``updated_at`` themselves, and values
+    rendered from related rows (tags, category and author names) touch the
+    rows that show them (see ``apps.core.freshness``).
+    """
+    permission_classes = [permissions.AllowAny]
+    pagination_class = KeysetPagination
+    cursor_field = 'created_at'
+    cursor_descending = True
+    last_modified_field = 'updated_at'
+    cache_timeout = 60
+    
+    def get_etag_parts(self):
+        """Extra validator values for output that does not follow ``updated_at``."""
+        return ()
+    
+    def get_etag(self, last_modified, *parts):
+        raw = '|'.join(
+            [self.basename, self.action, self.request.accepted_renderer.format,
+             self.request.build_absolute_uri(), last_modified.isoformat() if last_modified else '']
+            + [str(part) for part in parts + tuple(self.get_etag_parts())]
+        )
+        return quote_etag(hashlib.md5(raw.encode()).hexdigest())
+    
+    def is_not_modified(self, etag, last_modified):
+        if_none_match = self.request.headers.get('If-None-Match')
+        if if_none_match:
+            return etag in [tag.strip() for tag in if_none_match.split(',')] or if_none_match.strip() == '*'
+        if_modified_since = parse_http_date_safe(self.request.headers.get('If-Modified-Since', ''))
+        return (
+            last_modified is not None and if_modified_since is not None
+            and int(last_modified.timestamp()) <= if_modified_since
+        )
+    
+    def conditional_response(self, last_modified, etag, build_response):
+        if self.is_not_modified(etag, last_modified):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            cache_key = f'api:{self.basename}:{etag}'
+            data = cache.get(cache_key)
+            if data is None:
+                data = build_response().data
+                cache.set(cache_key, data, self.cache_timeout)
+            response = Response(data)
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+        response['Cache-Control'] = 'public, max-age=0, must-revalidate'
+        return response
+    
+    def get_page_validator(self, queryset):
+        """``(last modified, ids, next cursor)`` of the rows the requested page will show."""
+        fields = {'pk', self.cursor_field, self.last_modified_field}
+        try:
+            rows, next_cursor = keyset_page(
+                queryset.select_related(None).prefetch_related(None).only(*fields),
+                cursor=self.request.query_params.get('cursor'),
+                limit=self.paginator.get_limit(self.request),
+                descending=self.cursor_descending,
+                field=self.cursor_field,
+            )
+        except ValueError as e:
+            raise ValidationError({'cursor': str(e)})
+        last_modified = max((getattr(row, self.last_modified_field) for row in rows), default=None)
+        return last_modified, ','.join(str(row.pk) for row in rows), next_cursor
+    
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        last_modified, ids, next_cursor = self.get_page_validator(queryset)
+        etag = self.get_etag(last_modified, ids, next_cursor)
+        return self.conditional_response(
+            last_modified, etag, lambda: super(CachedReadOnlyViewSet, self).list(request, *args, **kwargs)
+        )
+    
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        last_modified = getattr(instance, self.last_modified_field)
+        etag = self.get_etag(last_modified, instance.pk)
+        return self.conditional_response(
+            last_modified, etag, lambda: Response(self.get_serializer(instance).data)
+        )
@@ -4,6 +4,7 @@ from django.urls import reverse
 from django.db.models import Count, Avg, Sum, Q
 from django.utils import timezone
 from import_export.admin import ImportExportModelAdmin
+from apps.core.admin import AnnotatedCountAdminMixin
 from .models import (
     Lead, CRMContact, CRMDeal, CRMActivity, CRMTask, CRMNote,
     DealProduct, CRMPipeline, CRMPipelineStage, CRMReport
@@ -667,16 +668,20 @@ class DealProductAdmin(ImportExportModelAdmin, admin.ModelAdmin):
 
 
 @admin.register(CRMPipeline)
-class CRMPipelineAdmin(admin.ModelAdmin):
+class CRMPipelineAdmin(AnnotatedCountAdminMixin, admin.ModelAdmin):
     list_display = ('name', 'account', 'is_default', 'is_active', 'stage_count', 'created_at')
     list_filter = ('is_default', 'is_active', 'account', 'created_at')
     search_fields = ('name', 'description', 'account__name')
     readonly_fields = ('created_at', 'updated_at', 'stage_count')
     autocomplete_fields = ['account']
+    count_annotations = {
+        'stage_count': Count('stages', distinct=True),
+    }
     
     def stage_count(self, obj):
-        return obj.stages.count()
+        return self.annotated_count(obj, 'stage_count')
     stage_count.short_description = 'Stages'
+    stage_count.admin_order_field = '_stage_count'
 
 
 @admin.register(CRMPipelineStage)
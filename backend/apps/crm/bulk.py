@@ -0,0 +1,104 @@
+"""Set-based ingestion of leads, contacts and activities.
+
+``bulk_create`` does not send model signals, so the side effects the CRM
+signals apply to single saves are applied here once per batch instead of
+once per row:
+
+- new leads are scored before the insert (they have no activities yet);
+- new contacts get their "New Contact Added" activity in one more insert;
+- new activities stamp ``last_contacted`` on their contacts, deals and leads
+  with one UPDATE per table, deals get their stage probability, and the
+  touched leads are re-scored from one grouped activity count.
+"""
+from django.db import transaction
+from django.db.models import Case, Count, F, IntegerField, Value, When
+from django.utils import timezone
+
+from .models import CRMActivity, CRMContact, CRMDeal, CRMSettings, Lead
+
+MAX_BATCH_SIZE = 1000
+INSERT_BATCH_SIZE = 500
+
+
+def create_leads(leads):
+    """Insert unsaved ``Lead`` instances in one transaction."""
+    for lead in leads:
+        lead.calculate_lead_score(activity_count=0)
+    with transaction.atomic():
+        return Lead.objects.bulk_create(leads, batch_size=INSERT_BATCH_SIZE)
+
+
+def create_contacts(contacts):
+    """Insert unsaved ``CRMContact`` instances with their welcome activities."""
+    settings = CRMSettings.objects.first()
+    now = timezone.now()
+    with transaction.atomic():
+        contacts = CRMContact.objects.bulk_create(contacts, batch_size=INSERT_BATCH_SIZE)
+        CRMActivity.objects.bulk_create([
+            CRMActivity(
+                account_id=contact.account_id,
+                contact=contact,
+                activity_type='note',
+                subject='New Contact Added',
+                description=f'Contact {contact.full_name} was added to the CRM system.',
+                status='completed',
+                scheduled_at=now,
+                completed_at=now,
+                assigned_to_id=contact.owner_id,
+            )
+            for contact in contacts
+        ], batch_size=INSERT_BATCH_SIZE)
+        if settings and settings.auto_update_last_contacted:
+            CRMContact.objects.filter(pk__in=[contact.pk for contact in contacts]).update(last_contacted=now)
+            for contact in contacts:
+                contact.last_contacted = now
+    return contacts
+
+
+def create_activities(activities):
+    """Insert unsaved ``CRMActivity`` instances and update what they touch."""
+    settings = CRMSettings.objects.first()
+    with transaction.atomic():
+        activities = CRMActivity.objects.bulk_create(activities, batch_size=INSERT_BATCH_SIZE)
+        if settings and settings.auto_update_last_contacted:
+            mark_contacted(activities, settings)
+    return activities
+
+
+def mark_contacted(activities, settings):
+    now = timezone.now()
+    contact_ids = {activity.contact_id for activity in activities if activity.contact_id}
+    deal_ids = {activity.deal_id for activity in activities if activity.deal_id}
+    lead_ids = {activity.lead_id for activity in activities if activity.lead_id}
+
+    if contact_ids:
+        CRMContact.objects.filter(pk__in=contact_ids).update(last_contacted=now, updated_at=now)
+    if deal_ids:
+        deal_updates = {'last_contacted': now, 'updated_at': now}
+        if settings.notify_on_deal_stage_change:
+            deal_updates['probability'] = Case(
+                *[When(stage=stage, then=Value(probability)) for stage, probability in CRMDeal.STAGE_PROBABILITIES.items()],
+                default=F('probability'), output_field=IntegerField()
+            )
+        CRMDeal.objects.filter(pk__in=deal_ids).update(**deal_updates)
+    if lead_ids:
+        rescore_leads(lead_ids, last_contacted=now, settings=settings)
+
+
+def rescore_leads(lead_ids, last_contacted=None, settings=None):
+    """Recalculate ``lead_score`` for ``lead_ids`` with one grouped activity count."""
+    now = timezone.now()
+    leads = list(Lead.objects.filter(pk__in=lead_ids).annotate(activity_total=Count('activities')))
+    for lead in leads:
+        if last_contacted is not None:
+            lead.last_contacted = last_contacted
+        lead.updated_at = now
+        lead.calculate_lead_score(activity_count=lead.activity_total)
+    Lead.objects.bulk_update(leads, ['last_contacted', 'lead_score', 'updated_at'], batch_size=INSERT_BATCH_SIZE)
+
+    # Conversion is rare and creates related rows; leave it to the signal
+    if settings and settings.auto_convert_leads:
+        for lead in leads:
+            if lead.status == 'converted' and not lead.converted_to_contact_id:
+                lead.save()
+    return leads
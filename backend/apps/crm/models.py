@@ -145,8 +145,12 @@ class Lead(TimeStampedModel):
     def full_name(self):
         return f"{self.first_name} {self.last_name}".strip()
     
-    def calculate_lead_score(self):
-        """Calculate lead score based on various factors."""
+    def calculate_lead_score(self, activity_count=None):
+        """Calculate lead score based on various factors.
+        
+        Pass ``activity_count`` when it is already known (e.g. annotated) to
+        skip the count query; unsaved leads have no activities.
+        """
         score = 0
         
         # Company information (20 points)
@@ -164,7 +168,8 @@ class Lead(TimeStampedModel):
             score += 5
         
         # Engagement (30 points)
-        activity_count = self.activities.count()
+        if activity_count is None:
+            activity_count = self.activities.count() if self.pk else 0
         if activity_count >= 5:
             score += 20
         elif activity_count >= 3:
@@ -294,6 +299,17 @@ class CRMDeal(TimeStampedModel):
         ('urgent', 'Urgent'),
     )
     
+    # Closing probability implied by each stage, applied on save
+    STAGE_PROBABILITIES = {
+        'prospecting': 10,
+        'qualification': 25,
+        'needs_analysis': 40,
+        'proposal': 60,
+        'negotiation': 80,
+        'closed_won': 100,
+        'closed_lost': 0,
+    }
+    
     account = models.ForeignKey(Business, on_delete=models.CASCADE, related_name='crm_deals')
     contact = models.ForeignKey(CRMContact, on_delete=models.CASCADE, related_name='deals')
     
@@ -564,6 +580,10 @@ class CRMPipeline(TimeStampedModel):
     
     def __str__(self):
         return f"{self.account.name} - {self.name}"
+    
+    @property
+    def stage_count(self):
+        return self.stages.count()
 
 
 class CRMPipelineStage(TimeStampedModel):
@@ -0,0 +1,53 @@
+from rest_framework import serializers
+
+from .models import CRMActivity, CRMContact, Lead
+
+
+class BulkItemSerializer(serializers.ModelSerializer):
+    """Validates one item of a bulk insert.
+    
+    Foreign keys are plain ids (``business``, ``owner`` ...) checked for the
+    whole batch at once by the view rather than one query per item.
+    """
+    
+    def build_relational_field(self, field_name, relation_info):
+        model_field = relation_info.model_field
+        kwargs = {'source': model_field.attname}
+        if model_field.null:
+            kwargs.update(required=False, allow_null=True)
+        return serializers.IntegerField, kwargs
+
+
+class LeadBulkSerializer(BulkItemSerializer):
+    
+    class Meta:
+        model = Lead
+        fields = (
+            'business', 'first_name', 'last_name', 'email', 'phone_number', 'company',
+            'designation', 'status', 'lead_source', 'priority', 'qualification_notes',
+            'owner', 'assigned_to', 'campaign_name', 'utm_source', 'utm_medium',
+            'utm_campaign', 'website', 'address', 'city', 'state', 'country',
+            'next_follow_up', 'notes'
+        )
+
+
+class CRMContactBulkSerializer(BulkItemSerializer):
+    
+    class Meta:
+        model = CRMContact
+        fields = (
+            'account', 'first_name', 'last_name', 'email', 'phone_number', 'company',
+            'designation', 'contact_type', 'lead_source', 'owner', 'address_line_1',
+            'address_line_2', 'city', 'state', 'pincode', 'country', 'notes', 'is_active'
+        )
+
+
+class CRMActivityBulkSerializer(BulkItemSerializer):
+    
+    class Meta:
+        model = CRMActivity
+        fields = (
+            'account', 'contact', 'deal', 'lead', 'activity_type', 'subject', 'description',
+            'status', 'activity_date', 'scheduled_at', 'completed_at', 'duration_minutes',
+            'assigned_to', 'outcome', 'follow_up_required', 'next_follow_up_date'
+        )
@@ -127,18 +127,8 @@ def handle_deal_stage_change(sender, instance, created, **kwargs):
             if settings and settings.notify_on_deal_stage_change:
                 # Here you would implement notification logic
                 # For now, we'll just update the probability based on stage
-                stage_probabilities = {
-                    'prospecting': 10,
-                    'qualification': 25,
-                    'needs_analysis': 40,
-                    'proposal': 60,
-                    'negotiation': 80,
-                    'closed_won': 100,
-                    'closed_lost': 0
-                }
-                
-                if instance.stage in stage_probabilities:
-                    instance.probability = stage_probabilities[instance.stage]
+                if instance.stage in CRMDeal.STAGE_PROBABILITIES:
+                    instance.probability = CRMDeal.STAGE_PROBABILITIES[instance.stage]
                     # Use update to avoid triggering signals again
                     CRMDeal.objects.filter(pk=instance.pk).update(probability=instance.probability)
         except Exception as e:
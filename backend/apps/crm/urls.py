@@ -0,0 +1,10 @@
+from django.urls import path
+from .views import CRMActivityBulkCreateView, CRMContactBulkCreateView, LeadBulkCreateView
+
+app_name = 'crm'
+
+urlpatterns = [
+    path('crm/leads/bulk/', LeadBulkCreateView.as_view(), name='lead-bulk-create'),
+    path('crm/contacts/bulk/', CRMContactBulkCreateView.as_view(), name='contact-bulk-create'),
+    path('crm/activities/bulk/', CRMActivityBulkCreateView.as_view(), name='activity-bulk-create'),
+]
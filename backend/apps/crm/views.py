@@ -0,0 +1,138 @@
+from abc import ABC, abstractmethod
+
+from django.contrib.auth import get_user_model
+from rest_framework import permissions, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.businesses.models import Business
+from .bulk import MAX_BATCH_SIZE, create_activities, create_contacts, create_leads
+from .models import CRMContact, CRMDeal, Lead
+from .serializers import CRMActivityBulkSerializer, CRMContactBulkSerializer, LeadBulkSerializer
+
+User = get_user_model()
+
+
+class BulkCreateView(ABC, APIView):
+    """POST a JSON array of up to ``MAX_BATCH_SIZE`` items.
+    
+    The batch is all or nothing. Items are validated field by field, then
+    their foreign keys are checked with one query per referenced table; if
+    anything fails the response is 400 with ``errors`` holding
+    ``{'index', 'errors'}`` for each bad item. Otherwise every item is
+    inserted in one transaction and the response is 201 with the new ids.
+    Non-staff users may only write to businesses they own.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = None
+    account_field = None
+    # (attname, model, attname of the model's business foreign key or None)
+    references = ()
+    
+    def get_accounts(self):
+        businesses = Business.objects.all()
+        if not self.request.user.is_staff:
+            businesses = businesses.filter(owner=self.request.user)
+        return businesses
+    
+    def check_references(self, items, errors):
+        account_ids = set(self.get_accounts().filter(
+            pk__in={item[self.account_field] for _, item in items}
+        ).values_list('pk', flat=True))
+        known = {}
+        for attname, model, owner_attname in self.references:
+            ids = {item[attname] for _, item in items if item.get(attname) is not None}
+            known[attname] = dict(
+                model._default_manager.filter(pk__in=ids).values_list('pk', owner_attname or 'pk')
+            ) if ids else {}
+        
+        for index, item in items:
+            item_errors = {}
+            account_id = item[self.account_field]
+            if account_id not in account_ids:
+                item_errors[self.account_field[:-3]] = [f'Invalid pk "{account_id}" - unknown business or not yours.']
+            for attname, model, owner_attname in self.references:
+                value = item.get(attname)
+                if value is None:
+                    continue
+                if value not in known[attname]:
+                    item_errors[attname[:-3]] = [f'Invalid pk "{value}" - object does not exist.']
+                elif owner_attname and known[attname][value] != account_id:
+                    item_errors[attname[:-3]] = [f'Invalid pk "{value}" - belongs to another business.']
+            if item_errors:
+                errors[index] = item_errors
+    
+    @abstractmethod
+    def perform_create(self, objects):
+        """Insert the validated, unsaved ``objects`` and return them with their pks."""
+    
+    def post(self, request):
+        rows = request.data
+        if not isinstance(rows, list) or not rows:
+            return Response({'detail': 'Expected a non-empty JSON array.'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(rows) > MAX_BATCH_SIZE:
+            return Response(
+                {'detail': f'At most {MAX_BATCH_SIZE} items per request.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        serializer = self.serializer_class(context={'request': request, 'view': self})
+        items = []
+        errors = {}
+        for index, row in enumerate(rows):
+            try:
+                items.append((index, serializer.run_validation(row)))
+            except ValidationError as e:
+                errors[index] = e.detail
+        if items:
+            self.check_references(items, errors)
+        if errors:
+            return Response({
+                'created': 0,
+                'errors': [{'index': index, 'errors': errors[index]} for index in sorted(errors)],
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        model = self.serializer_class.Meta.model
+        objects = self.perform_create([model(**item) for _, item in items])
+        return Response(
+            {'created': len(objects), 'ids': [obj.pk for obj in objects]},
+            status=status.HTTP_201_CREATED
+        )
+
+
+class LeadBulkCreateView(BulkCreateView):
+    serializer_class = LeadBulkSerializer
+    account_field = 'business_id'
+    references = (
+        ('owner_id', User, None),
+        ('assigned_to_id', User, None),
+    )
+    
+    def perform_create(self, objects):
+        return create_leads(objects)
+
+
+class CRMContactBulkCreateView(BulkCreateView):
+    serializer_class = CRMContactBulkSerializer
+    account_field = 'account_id'
+    references = (
+        ('owner_id', User, None),
+    )
+    
+    def perform_create(self, objects):
+        return create_contacts(objects)
+
+
+class CRMActivityBulkCreateView(BulkCreateView):
+    serializer_class = CRMActivityBulkSerializer
+    account_field = 'account_id'
+    references = (
+        ('contact_id', CRMContact, 'account_id'),
+        ('deal_id', CRMDeal, 'account_id'),
+        ('lead_id', Lead, 'business_id'),
+        ('assigned_to_id', User, None),
+    )
+    
+    def perform_create(self, objects):
+        return create_activities(objects)
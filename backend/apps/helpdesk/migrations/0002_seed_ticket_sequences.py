@@ -0,0 +1,36 @@
+# Generated by Django 4.2.7 on 2026-10-19 19:10
+
+import re
+
+from django.db import migrations
+
+NUMBER_RE = re.compile(r'TKT-(\d{4}-\d{2})-(\d+)')
+
+
+def seed_ticket_sequences(apps, schema_editor):
+    # Start each month's counter after the highest ticket number already issued
+    SupportTicket = apps.get_model('helpdesk', 'SupportTicket')
+    NumberSequence = apps.get_model('core', 'NumberSequence')
+    highest = {}
+    for number in SupportTicket.objects.values_list('ticket_number', flat=True).iterator():
+        match = NUMBER_RE.fullmatch(number or '')
+        if match is not None:
+            period, value = match.group(1), int(match.group(2))
+            highest[period] = max(value, highest.get(period, 0))
+    for period, value in highest.items():
+        sequence, created = NumberSequence.objects.get_or_create(prefix='TKT', period=period)
+        if sequence.last_value < value:
+            sequence.last_value = value
+            sequence.save(update_fields=['last_value'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_number_sequence'),
+        ('helpdesk', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_ticket_sequences, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,7 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
 from apps.core.models import TimeStampedModel
+from apps.core.sequences import next_number
 from apps.businesses.models import Business
 
 User = get_user_model()
@@ -41,6 +42,8 @@ class SupportTicket(TimeStampedModel):
         ('closed', 'Closed'),
     )
     
+    NUMBER_PREFIX = 'TKT'
+    
     # Ticket Information
     ticket_number = models.CharField(max_length=20, unique=True, help_text="Auto-generated unique ticket number")
     subject = models.CharField(max_length=200, help_text="Brief description of the issue")
@@ -75,12 +78,15 @@ class SupportTicket(TimeStampedModel):
         return f"{self.ticket_number} - {self.subject}"
     
     def save(self, *args, **kwargs):
-        if not self.ticket_number:
-            # Generate ticket number
-            from django.utils import timezone
-            now = timezone.now()
-            self.ticket_number = f"TKT-{now.year}-{now.month:02d}-{self.id or 1:06d}"
-        super().save(*args, **kwargs)
+        if self.ticket_number:
+            return super().save(*args, **kwargs)
+        try:
+            with transaction.atomic():
+                self.ticket_number = next_number(self.NUMBER_PREFIX)
+                super().save(*args, **kwargs)
+        except Exception:
+            self.ticket_number = ''
+            raise
 
 
 class TicketReply(TimeStampedModel):
@@ -46,10 +46,12 @@ class ConversationAdmin(admin.ModelAdmin):
     def unread_count_for_user(self, obj):
         return obj.unread_count_for_user
     unread_count_for_user.short_description = 'User Unread'
+    unread_count_for_user.admin_order_field = 'user_unread_count'
     
     def unread_count_for_business(self, obj):
         return obj.unread_count_for_business
     unread_count_for_business.short_description = 'Business Unread'
+    unread_count_for_business.admin_order_field = 'business_unread_count'
 
 
 @admin.register(Message)
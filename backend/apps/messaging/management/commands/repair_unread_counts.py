@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from apps.messaging.models import Conversation
+
+
+class Command(BaseCommand):
+    help = 'Rebuild stored unread message counters for conversations'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--business-id',
+            type=int,
+            help='Repair conversations for specific business only'
+        )
+    
+    def handle(self, *args, **options):
+        start_time = timezone.now()
+        self.stdout.write(
+            self.style.SUCCESS(f'Starting unread counter repair at {start_time}')
+        )
+        
+        try:
+            conversations = Conversation.objects.all()
+            
+            if options['business_id']:
+                conversations = conversations.filter(business_id=options['business_id'])
+            
+            Conversation.recalculate_unread_counts(conversations)
+            
+            end_time = timezone.now()
+            duration = end_time - start_time
+            
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f'Successfully repaired {conversations.count()} conversations in {duration.total_seconds():.2f} seconds'
+                )
+            )
+            
+        except Exception as e:
+            self.stdout.write(
+                self.style.ERROR(f'Error repairing unread counters: {str(e)}')
+            )
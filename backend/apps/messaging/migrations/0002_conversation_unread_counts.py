@@ -0,0 +1,53 @@
+# Generated by Django 4.2.7 on 2026-10-19 10:00
+
+from django.db import migrations, models
+
+
+def populate_unread_counts(apps, schema_editor):
+    Conversation = apps.get_model('messaging', 'Conversation')
+    Message = apps.get_model('messaging', 'Message')
+    
+    for conversation in Conversation.objects.iterator():
+        from_business = Message.objects.filter(conversation=conversation, sender_id=conversation.business_user_id)
+        from_user = Message.objects.filter(conversation=conversation, sender_id=conversation.user_id)
+        if conversation.user_last_read:
+            from_business = from_business.filter(created_at__gt=conversation.user_last_read)
+        if conversation.business_user_last_read:
+            from_user = from_user.filter(created_at__gt=conversation.business_user_last_read)
+        Conversation.objects.filter(pk=conversation.pk).update(
+            user_unread_count=from_business.count(),
+            business_unread_count=from_user.count(),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='conversation',
+            name='business_unread_count',
+            field=models.PositiveIntegerField(default=0, help_text='Messages from the user not yet read by the business'),
+        ),
+        migrations.AddField(
+            model_name='conversation',
+            name='user_unread_count',
+            field=models.PositiveIntegerField(default=0, help_text='Messages from the business not yet read by the user'),
+        ),
+        migrations.AddIndex(
+            model_name='conversation',
+            index=models.Index(fields=['user', '-last_message_at'], name='messaging_c_user_id_d4a23c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='conversation',
+            index=models.Index(fields=['business_user', '-last_message_at'], name='messaging_c_busines_78caec_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='conversation',
+            index=models.Index(fields=['business', '-last_message_at'], name='messaging_c_busines_28440d_idx'),
+        ),
+        migrations.RunPython(populate_unread_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-19 10:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0002_conversation_unread_counts'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['conversation', 'created_at', 'id'], name='messaging_m_convers_1f1ac3_idx'),
+        ),
+    ]
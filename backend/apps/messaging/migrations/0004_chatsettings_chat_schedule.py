@@ -0,0 +1,88 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:00
+
+from django.db import migrations, models
+
+WEEKDAYS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+
+# The schedule helpers below are copied from apps.core.schedule as they were
+# when this migration was written, so later edits there cannot change it.
+
+def weekly_intervals(obj, open_suffix, close_suffix):
+    intervals = []
+    for day_index, day in enumerate(WEEKDAYS):
+        opens = getattr(obj, f'{day}_{open_suffix}')
+        closes = getattr(obj, f'{day}_{close_suffix}')
+        if opens is None or closes is None:
+            continue
+        start = day_index * MINUTES_PER_DAY + opens.hour * 60 + opens.minute
+        end = day_index * MINUTES_PER_DAY + closes.hour * 60 + closes.minute
+        if end <= start:
+            end += MINUTES_PER_DAY
+        if end > MINUTES_PER_WEEK:
+            intervals.append((start, MINUTES_PER_WEEK))
+            intervals.append((0, end - MINUTES_PER_WEEK))
+        else:
+            intervals.append((start, end))
+    
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def encode_intervals(intervals):
+    return ','.join(f'{start}-{end}' for start, end in intervals)
+
+
+def hour_slots(intervals):
+    for start, end in intervals:
+        minute = start
+        while minute < end:
+            hour = minute // 60
+            slot_end = min(end, (hour + 1) * 60)
+            yield hour, minute, slot_end
+            minute = slot_end
+
+
+def populate_chat_schedules(apps, schema_editor):
+    ChatSettings = apps.get_model('messaging', 'ChatSettings')
+    BusinessScheduleSlot = apps.get_model('businesses', 'BusinessScheduleSlot')
+    
+    settings_rows = []
+    slots = []
+    for chat_settings in ChatSettings.objects.iterator(chunk_size=500):
+        intervals = weekly_intervals(chat_settings, 'start', 'end')
+        if not intervals:
+            continue
+        chat_settings.chat_schedule = encode_intervals(intervals)
+        settings_rows.append(chat_settings)
+        slots.extend(
+            BusinessScheduleSlot(business_id=chat_settings.business_id, kind='chat', hour_of_week=hour, start_minute=start, end_minute=end)
+            for hour, start, end in hour_slots(intervals)
+        )
+    
+    ChatSettings.objects.bulk_update(settings_rows, ['chat_schedule'], batch_size=500)
+    BusinessScheduleSlot.objects.bulk_create(slots, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0003_message_history_index'),
+        ('businesses', '0006_business_schedule_slots'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chatsettings',
+            name='chat_schedule',
+            field=models.CharField(blank=True, editable=False, help_text='Chat hours as minute-of-week intervals, derived from the weekday fields', max_length=255),
+        ),
+        migrations.RunPython(populate_chat_schedules, migrations.RunPython.noop),
+    ]
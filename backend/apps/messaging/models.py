@@ -1,7 +1,11 @@
 from django.db import models
+from django.db.models import Case, F, OuterRef, Q, Value, When
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 from apps.core.models import TimeStampedModel
-from apps.businesses.models import Business
+from apps.businesses.models import Business, BusinessScheduleSlot
+from apps.core.expressions import SubqueryCount
+from apps.core.schedule import weekly_intervals, encode_intervals, decode_intervals, is_open_at
 
 User = get_user_model()
 
@@ -32,11 +36,20 @@ class Conversation(TimeStampedModel):
     user_last_read = models.DateTimeField(null=True, blank=True, help_text="Last time the user read messages")
     business_user_last_read = models.DateTimeField(null=True, blank=True, help_text="Last time the business user read messages")
     
+    # Unread counters (incremented on message insert, reset by the mark_read_* methods)
+    user_unread_count = models.PositiveIntegerField(default=0, help_text="Messages from the business not yet read by the user")
+    business_unread_count = models.PositiveIntegerField(default=0, help_text="Messages from the user not yet read by the business")
+    
     class Meta:
         verbose_name = 'Conversation'
         verbose_name_plural = 'Conversations'
         ordering = ['-last_message_at', '-created_at']
         unique_together = ['user', 'business']
+        indexes = [
+            models.Index(fields=['user', '-last_message_at']),
+            models.Index(fields=['business_user', '-last_message_at']),
+            models.Index(fields=['business', '-last_message_at']),
+        ]
     
     def __str__(self):
         return f"{self.user.email} - {self.business.name}"
@@ -44,16 +57,99 @@ class Conversation(TimeStampedModel):
     @property
     def unread_count_for_user(self):
         """Unread messages count for the user."""
-        if not self.user_last_read:
-            return self.messages.count()
-        return self.messages.filter(created_at__gt=self.user_last_read, sender=self.business_user).count()
+        return self.user_unread_count
     
     @property
     def unread_count_for_business(self):
         """Unread messages count for the business user."""
-        if not self.business_user_last_read:
-            return self.messages.count()
-        return self.messages.filter(created_at__gt=self.business_user_last_read, sender=self.user).count()
+        return self.business_unread_count
+    
+    def mark_read_by_user(self, read_at=None):
+        """Record that the user has read the conversation and clear their counter."""
+        self.user_last_read = read_at or timezone.now()
+        self.user_unread_count = 0
+        Conversation.objects.filter(pk=self.pk).update(
+            user_last_read=self.user_last_read, user_unread_count=0
+        )
+    
+    def mark_read_by_business(self, read_at=None):
+        """Record that the business user has read the conversation and clear their counter."""
+        self.business_user_last_read = read_at or timezone.now()
+        self.business_unread_count = 0
+        Conversation.objects.filter(pk=self.pk).update(
+            business_user_last_read=self.business_user_last_read, business_unread_count=0
+        )
+    
+    @classmethod
+    def record_new_messages(cls, conversation_id, sender_counts, last_message_at, last_message_by_id):
+        """Apply newly inserted messages to a conversation in a single UPDATE.
+        
+        ``sender_counts`` maps sender id to the number of new messages. Each
+        participant's unread counter grows by the messages the other side
+        sent, and the tail only moves forward, so a slower concurrent sender
+        never overwrites a newer ``last_message_at``.
+        """
+        def unread_delta(other_party):
+            return Case(
+                *[When(**{f'{other_party}_id': sender_id}, then=Value(count))
+                  for sender_id, count in sender_counts.items()],
+                default=Value(0),
+                output_field=models.PositiveIntegerField(),
+            )
+        
+        is_newer = Q(last_message_at__isnull=True) | Q(last_message_at__lt=last_message_at)
+        return cls.objects.filter(pk=conversation_id).update(
+            user_unread_count=F('user_unread_count') + unread_delta('business_user'),
+            business_unread_count=F('business_unread_count') + unread_delta('user'),
+            last_message_by=Case(
+                When(is_newer, then=Value(last_message_by_id)),
+                default=F('last_message_by'),
+                output_field=models.BigIntegerField(),
+            ),
+            last_message_at=Case(
+                When(is_newer, then=Value(last_message_at)),
+                default=F('last_message_at'),
+            ),
+            updated_at=timezone.now(),
+        )
+    
+    @classmethod
+    def recalculate_unread_counts(cls, queryset=None):
+        """Rebuild both unread counters from the messages table."""
+        queryset = cls.objects.all() if queryset is None else queryset
+        sides = (
+            ('user_unread_count', 'user_last_read', 'business_user'),
+            ('business_unread_count', 'business_user_last_read', 'user'),
+        )
+        for counter, last_read, other_party in sides:
+            unread = Message.objects.filter(conversation=OuterRef('pk'), sender=OuterRef(other_party))
+            queryset.filter(**{f'{last_read}__isnull': True}).update(
+                **{counter: SubqueryCount(unread.values('pk'))}
+            )
+            queryset.filter(**{f'{last_read}__isnull': False}).update(
+                **{counter: SubqueryCount(unread.filter(created_at__gt=OuterRef(last_read)).values('pk'))}
+            )
+
+
+class MessageQuerySet(models.QuerySet):
+    
+    def bulk_create(self, objs, *args, **kwargs):
+        """Insert messages, then update each affected conversation tail once."""
+        objs = super().bulk_create(objs, *args, **kwargs)
+        
+        batches = {}
+        for message in objs:
+            batch = batches.setdefault(message.conversation_id, {'senders': {}, 'last': message})
+            batch['senders'][message.sender_id] = batch['senders'].get(message.sender_id, 0) + 1
+            if message.created_at >= batch['last'].created_at:
+                batch['last'] = message
+        
+        for conversation_id, batch in batches.items():
+            last = batch['last']
+            Conversation.record_new_messages(
+                conversation_id, batch['senders'], last.created_at, last.sender_id
+            )
+        return objs
 
 
 class Message(TimeStampedModel):
@@ -82,20 +178,27 @@ class Message(TimeStampedModel):
     read_at = models.DateTimeField(null=True, blank=True)
     is_deleted = models.BooleanField(default=False)
     
+    objects = MessageQuerySet.as_manager()
+    
     class Meta:
         verbose_name = 'Message'
         verbose_name_plural = 'Messages'
         ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['conversation', 'created_at', 'id']),
+        ]
     
     def __str__(self):
         return f"{self.sender.email}: {self.content[:50]}"
     
     def save(self, *args, **kwargs):
+        is_new = self._state.adding
         super().save(*args, **kwargs)
-        # Update conversation's last message info
-        self.conversation.last_message_at = self.created_at
-        self.conversation.last_message_by = self.sender
-        self.conversation.save()
+        if is_new:
+            # Update conversation's last message info and unread counters
+            Conversation.record_new_messages(
+                self.conversation_id, {self.sender_id: 1}, self.created_at, self.sender_id
+            )
 
 
 class MessageReport(TimeStampedModel):
@@ -147,6 +250,19 @@ class MessageTemplate(TimeStampedModel):
         return f"{self.business.name} - {self.name}"
 
 
+class ChatSettingsQuerySet(models.QuerySet):
+    
+    def available_at(self, moment):
+        """Settings with chat enabled and chat hours covering ``moment``."""
+        return self.filter(
+            is_chat_enabled=True,
+            business_id__in=BusinessScheduleSlot.open_business_ids('chat', moment)
+        )
+    
+    def available_now(self):
+        return self.available_at(None)
+
+
 class ChatSettings(TimeStampedModel):
     """Chat settings for businesses."""
     
@@ -172,16 +288,36 @@ class ChatSettings(TimeStampedModel):
     saturday_end = models.TimeField(null=True, blank=True)
     sunday_start = models.TimeField(null=True, blank=True)
     sunday_end = models.TimeField(null=True, blank=True)
+    chat_schedule = models.CharField(max_length=255, blank=True, editable=False, help_text="Chat hours as minute-of-week intervals, derived from the weekday fields")
     
     # Offline message
     offline_message = models.TextField(blank=True, default="We're currently offline. Please leave a message and we'll get back to you.")
     
+    objects = ChatSettingsQuerySet.as_manager()
+    
     class Meta:
         verbose_name = 'Chat Settings'
         verbose_name_plural = 'Chat Settings'
     
     def __str__(self):
         return f"Chat Settings for {self.business.name}"
+    
+    @property
+    def is_available_now(self):
+        return self.is_chat_enabled and is_open_at(decode_intervals(self.chat_schedule))
+    
+    def save(self, *args, **kwargs):
+        intervals = weekly_intervals(self, 'start', 'end')
+        schedule = encode_intervals(intervals)
+        schedule_changed = schedule != self.chat_schedule
+        self.chat_schedule = schedule
+        if schedule_changed and kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = set(kwargs['update_fields']) | {'chat_schedule'}
+        
+        super().save(*args, **kwargs)
+        
+        if schedule_changed:
+            BusinessScheduleSlot.sync(self.business_id, 'chat', intervals)
 
 
 class BlockedUser(TimeStampedModel):
@@ -0,0 +1,15 @@
+from rest_framework import serializers
+from .models import Message
+
+
+class MessageSerializer(serializers.ModelSerializer):
+    sender_email = serializers.EmailField(source='sender.email', read_only=True)
+    
+    class Meta:
+        model = Message
+        fields = (
+            'id', 'conversation', 'sender', 'sender_email', 'message_type',
+            'content', 'attachment', 'attachment_name', 'is_read', 'read_at',
+            'created_at'
+        )
+        read_only_fields = fields
@@ -0,0 +1,83 @@
+import threading
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.businesses.models import Business
+from apps.categories.models import Category
+from .models import Conversation, Message
+from .views import MessagesSinceView
+
+User = get_user_model()
+
+
+class MessageEndpointTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='customer', email='customer@example.com', password='x')
+        self.owner = User.objects.create_user(username='owner', email='owner@example.com', password='x')
+        category = Category.objects.create(name='Food', slug='food')
+        business = Business.objects.create(
+            name='Pizza Place', slug='pizza-place', description='Pizza', business_type='service',
+            category=category, owner=self.owner, phone_number='+919876543210', email='pizza@example.com',
+            address_line_1='1 Main Road', city='Pune', state='MH', pincode='411001',
+        )
+        self.conversation = Conversation.objects.create(user=self.user, business=business, business_user=self.owner)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.history_url = reverse('messaging:message-history', args=[self.conversation.pk])
+        self.since_url = reverse('messaging:messages-since', args=[self.conversation.pk])
+
+    def send(self, content, age=None):
+        message = Message.objects.create(conversation=self.conversation, sender=self.owner, content=content)
+        if age is not None:
+            Message.objects.filter(pk=message.pk).update(created_at=timezone.now() - age)
+        return message
+
+    def test_history_pages_newest_first(self):
+        for i in range(5):
+            self.send(f'M{i}', age=timedelta(minutes=10 - i))
+
+        first = self.client.get(self.history_url, {'limit': 3}).json()
+        second = self.client.get(self.history_url, {'limit': 3, 'cursor': first['next_cursor']}).json()
+
+        self.assertEqual([item['content'] for item in first['results']], ['M4', 'M3', 'M2'])
+        self.assertEqual([item['content'] for item in second['results']], ['M1', 'M0'])
+        self.assertIsNone(second['next_cursor'])
+        self.assertEqual(self.client.get(self.history_url, {'cursor': 'bad'}).status_code, 400)
+
+    def test_since_returns_each_new_message_once(self):
+        self.send('old', age=timedelta(minutes=5))
+        cursor = self.client.get(self.since_url).json()['cursor']
+
+        self.send('new')
+        data = self.client.get(self.since_url, {'cursor': cursor}).json()
+        self.assertEqual([item['content'] for item in data['results']], ['new'])
+
+        data = self.client.get(self.since_url, {'cursor': data['cursor']}).json()
+        self.assertEqual(data['results'], [])
+
+    def test_other_users_cannot_poll(self):
+        stranger = User.objects.create_user(username='stranger', email='stranger@example.com', password='x')
+        self.client.force_authenticate(stranger)
+        self.assertEqual(self.client.get(self.since_url).status_code, 404)
+
+    def test_full_waiting_slots_answer_429(self):
+        cursor = self.client.get(self.since_url).json()['cursor']
+        waiting = threading.BoundedSemaphore(1)
+        waiting.acquire()
+
+        with mock.patch.object(MessagesSinceView, '_waiting', waiting):
+            response = self.client.get(self.since_url, {'cursor': cursor, 'timeout': 5})
+            self.assertEqual(response.status_code, 429)
+            self.assertEqual(response['Retry-After'], str(MessagesSinceView.retry_after))
+
+            self.send('new')
+            response = self.client.get(self.since_url, {'cursor': cursor, 'timeout': 5})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual([item['content'] for item in response.json()['results']], ['new'])
@@ -0,0 +1,9 @@
+from django.urls import path
+from .views import MessageHistoryView, MessagesSinceView
+
+app_name = 'messaging'
+
+urlpatterns = [
+    path('conversations/<int:conversation_id>/messages/', MessageHistoryView.as_view(), name='message-history'),
+    path('conversations/<int:conversation_id>/messages/since/', MessagesSinceView.as_view(), name='messages-since'),
+]
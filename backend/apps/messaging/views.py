@@ -0,0 +1,160 @@
+import base64
+import threading
+import time
+from datetime import timedelta
+
+from django.db.models import Q
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from rest_framework import permissions, status
+from rest_framework.exceptions import Throttled
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.core.pagination import keyset_page
+from .models import Conversation, Message
+from .serializers import MessageSerializer
+
+
+class ConversationMessagesMixin:
+    """Shared lookup for endpoints scoped to one conversation's messages."""
+    permission_classes = [permissions.IsAuthenticated]
+    default_limit = 50
+    max_limit = 200
+    
+    def get_conversation(self):
+        conversations = Conversation.objects.all()
+        user = self.request.user
+        if not user.is_staff:
+            conversations = conversations.filter(Q(user=user) | Q(business_user=user))
+        return get_object_or_404(conversations, pk=self.kwargs['conversation_id'])
+    
+    def get_limit(self):
+        try:
+            limit = int(self.request.query_params.get('limit', self.default_limit))
+        except ValueError:
+            limit = self.default_limit
+        return max(1, min(limit, self.max_limit))
+    
+    def get_messages(self, conversation):
+        return Message.objects.filter(
+            conversation=conversation, is_deleted=False
+        ).select_related('sender')
+
+
+class MessageHistoryView(ConversationMessagesMixin, APIView):
+    """Newest-first message history, paged backwards with ``?cursor=``."""
+    
+    def get(self, request, conversation_id):
+        conversation = self.get_conversation()
+        try:
+            messages, next_cursor = keyset_page(
+                self.get_messages(conversation),
+                cursor=request.query_params.get('cursor'),
+                limit=self.get_limit(),
+                descending=True,
+            )
+        except ValueError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            'results': MessageSerializer(messages, many=True).data,
+            'next_cursor': next_cursor,
+        })
+
+
+class MessagesSinceView(ConversationMessagesMixin, APIView):
+    """Long-poll for messages newer than ``?cursor=``.
+    
+    Holds the request open for up to ``?timeout=`` seconds until a message
+    arrives. The response carries the cursor to send on the next poll.
+    
+    Messages are tailed by primary key. A message whose transaction commits
+    after one with a higher id would fall behind a plain ``id`` cursor, so
+    the cursor only advances past messages older than ``settle_window`` and
+    also lists the ids already returned above that point; those are skipped
+    on the next poll, the rest of the window is read again.
+    
+    A waiting request occupies its worker thread for up to ``max_timeout``
+    seconds, so each process lets at most ``max_waiting`` requests wait at
+    once; keep it below the process's worker thread count. The cap is per
+    process, not per deployment. A poll that would wait while the cap is
+    reached gets 429 with a ``Retry-After`` header of ``retry_after``
+    seconds, which clients must honor before polling again.
+    """
+    max_timeout = 20
+    poll_interval = 1.0
+    settle_window = timedelta(seconds=10)
+    max_waiting = 8
+    retry_after = 5
+    _waiting = threading.BoundedSemaphore(max_waiting)
+    
+    @staticmethod
+    def encode_position(settled_id, seen_ids):
+        raw = f"{settled_id}|{','.join(str(pk) for pk in sorted(seen_ids))}".encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+    
+    @staticmethod
+    def decode_position(cursor):
+        """Return ``(settled_id, seen_ids)``; raises ValueError if malformed."""
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            settled_id, seen = base64.urlsafe_b64decode(padded.encode()).decode().split('|')
+            return int(settled_id), {int(pk) for pk in seen.split(',') if pk}
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    
+    def get_unseen(self, conversation, settled_id, seen_ids):
+        messages = self.get_messages(conversation).filter(pk__gt=settled_id)
+        if seen_ids:
+            messages = messages.exclude(pk__in=seen_ids)
+        return list(messages.order_by('pk')[:self.get_limit()])
+    
+    def get(self, request, conversation_id):
+        conversation = self.get_conversation()
+        cursor = request.query_params.get('cursor')
+        if cursor:
+            try:
+                settled_id, seen_ids = self.decode_position(cursor)
+            except ValueError as e:
+                return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            # First poll: everything that exists now counts as seen
+            seen_ids = set(
+                self.get_messages(conversation)
+                .filter(created_at__gte=timezone.now() - self.settle_window).values_list('pk', flat=True)
+            )
+            settled_id = self.get_messages(conversation).exclude(pk__in=seen_ids).order_by('-pk').values_list('pk', flat=True).first() or 0
+        try:
+            timeout = float(request.query_params.get('timeout', 0))
+        except ValueError:
+            timeout = 0
+        timeout = max(0, min(timeout, self.max_timeout))
+        
+        messages = self.get_unseen(conversation, settled_id, seen_ids)
+        if not messages and timeout:
+            if not self._waiting.acquire(blocking=False):
+                raise Throttled(wait=self.retry_after, detail='Too many open long-polls; retry later.')
+            try:
+                deadline = time.monotonic() + timeout
+                while not messages and time.monotonic() < deadline:
+                    time.sleep(self.poll_interval)
+                    messages = self.get_unseen(conversation, settled_id, seen_ids)
+            finally:
+                self._waiting.release()
+        
+        # Advance past settled messages in id order; keep the rest as seen ids
+        settled_before = timezone.now() - self.settle_window
+        seen_ids |= {message.pk for message in messages}
+        recent = self.get_messages(conversation).filter(pk__gt=settled_id, created_at__gte=settled_before)
+        oldest_recent = recent.order_by('pk').values_list('pk', flat=True).first()
+        if oldest_recent is None:
+            settled_id = max(seen_ids | {settled_id})
+        else:
+            settled_id = max([pk for pk in seen_ids if pk < oldest_recent] + [settled_id])
+        seen_ids = {pk for pk in seen_ids if pk > settled_id}
+        
+        return Response({
+            'results': MessageSerializer(messages, many=True).data,
+            'cursor': self.encode_position(settled_id, seen_ids),
+        })
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import NotificationTemplate, Notification, EmailLog, SMSLog, NotificationPreference
+from .models import NotificationTemplate, Notification, EmailLog, SMSLog, DeliveryRun, NotificationPreference
 
 
 @admin.register(NotificationTemplate)
@@ -28,14 +28,14 @@ class NotificationAdmin(admin.ModelAdmin):
     list_display = ('recipient', 'subject', 'status', 'sent_at', 'created_at')
     list_filter = ('status', 'template__notification_type', 'template__event_type', 'created_at')
     search_fields = ('recipient__email', 'subject', 'content')
-    readonly_fields = ('created_at', 'updated_at', 'sent_at', 'delivered_at', 'read_at')
+    readonly_fields = ('created_at', 'updated_at', 'sent_at', 'delivered_at', 'read_at', 'attempts')
     
     fieldsets = (
         ('Notification Details', {
             'fields': ('recipient', 'template', 'subject', 'content', 'status')
         }),
         ('Delivery Information', {
-            'fields': ('sent_at', 'delivered_at', 'read_at', 'failed_reason')
+            'fields': ('sent_at', 'delivered_at', 'read_at', 'failed_reason', 'attempts', 'next_attempt_at')
         }),
         ('Additional Data', {
             'fields': ('data',),
@@ -50,9 +50,8 @@ class NotificationAdmin(admin.ModelAdmin):
     actions = ['mark_as_read']
     
     def mark_as_read(self, request, queryset):
-        for notification in queryset:
-            notification.mark_as_read()
-        self.message_user(request, f"{queryset.count()} notifications marked as read.")
+        updated = Notification.mark_read(queryset)
+        self.message_user(request, f"{updated} notifications marked as read.")
     mark_as_read.short_description = "Mark selected notifications as read"
 
 
@@ -88,6 +87,19 @@ class SMSLogAdmin(admin.ModelAdmin):
         return False
 
 
+@admin.register(DeliveryRun)
+class DeliveryRunAdmin(admin.ModelAdmin):
+    list_display = ('created_at', 'sent', 'retried', 'failed', 'batches', 'seconds')
+    list_filter = ('created_at',)
+    readonly_fields = ('created_at', 'updated_at')
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(NotificationPreference)
 class NotificationPreferenceAdmin(admin.ModelAdmin):
     list_display = ('user', 'email_leads', 'sms_leads', 'push_leads', 'created_at')
@@ -0,0 +1,203 @@
+"""Outbox delivery of pending notifications.
+
+Notifications are written as ``pending`` rows in the same transaction as the
+event that caused them; this worker delivers them afterwards, in batches:
+
+1. claim: lock up to ``batch_size`` due rows (``SKIP LOCKED`` where the
+   database supports it, so concurrent workers never share rows) and push
+   their ``next_attempt_at`` forward by ``LEASE``, so the batch of a worker
+   that dies mid-send becomes due again later;
+2. send: e-mail over one connection for the whole batch, SMS through the
+   configured provider; in-app and push notifications need no transport
+   here and are marked sent;
+3. record: one UPDATE for the sent rows, one per distinct (outcome, error,
+   next attempt) for retries and failures, and ``EmailLog``/``SMSLog`` rows
+   with ``bulk_create``. Every UPDATE is conditional on the row still being
+   ``pending``, so a notification read meanwhile keeps its ``read`` status.
+
+Each run that delivered anything stores a ``DeliveryRun`` row, so
+``delivery_stats`` reports the same totals from every worker process.
+
+A failed send is retried after ``RETRY_BASE * 2 ** (attempts - 1)`` (capped
+at ``RETRY_MAX``) until ``MAX_ATTEMPTS``, after which it is marked failed.
+"""
+import time
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from .models import DeliveryRun, EmailLog, Notification, SMSLog
+from .providers import get_sms_provider
+
+BATCH_SIZE = 200
+MAX_ATTEMPTS = 5
+LEASE = timedelta(minutes=5)
+RETRY_BASE = timedelta(minutes=1)
+RETRY_MAX = timedelta(hours=6)
+
+
+def retry_delay(attempts):
+    return min(RETRY_BASE * 2 ** max(attempts - 1, 0), RETRY_MAX)
+
+
+def claim_batch(batch_size=BATCH_SIZE):
+    """Lease up to ``batch_size`` due pending notifications to this worker."""
+    now = timezone.now()
+    lease_until = now + LEASE
+    with transaction.atomic():
+        due = Notification.objects.filter(status='pending', next_attempt_at__lte=now)
+        if connection.features.has_select_for_update_skip_locked:
+            due = due.select_for_update(skip_locked=True)
+        ids = list(due.order_by('next_attempt_at', 'id').values_list('id', flat=True)[:batch_size])
+        if not ids:
+            return []
+        # Still conditional on being due, for databases without row locks
+        Notification.objects.filter(pk__in=ids, status='pending', next_attempt_at__lte=now).update(
+            next_attempt_at=lease_until, attempts=F('attempts') + 1
+        )
+    return list(
+        Notification.objects.filter(pk__in=ids, next_attempt_at=lease_until)
+        .select_related('recipient', 'template').order_by('id')
+    )
+
+
+def _send_emails(notifications, sent, errors, logs):
+    if not notifications:
+        return
+    email_connection = get_connection()
+    try:
+        email_connection.open()
+    except Exception as e:
+        for notification in notifications:
+            errors[notification] = f'Email connection failed: {e}'
+        return
+    try:
+        for notification in notifications:
+            address = notification.recipient.email
+            if not address:
+                errors[notification] = 'Recipient has no email address'
+                continue
+            message = EmailMessage(notification.subject, notification.content, settings.DEFAULT_FROM_EMAIL, [address])
+            try:
+                email_connection.send_messages([message])
+            except Exception as e:
+                errors[notification] = str(e)
+                logs.append(EmailLog(
+                    recipient_email=address, subject=notification.subject, content=notification.content,
+                    status='failed', error_message=str(e)
+                ))
+            else:
+                sent.append(notification)
+                logs.append(EmailLog(
+                    recipient_email=address, subject=notification.subject, content=notification.content,
+                    status='sent'
+                ))
+    finally:
+        email_connection.close()
+
+
+def _send_sms(notifications, sent, errors, logs):
+    if not notifications:
+        return
+    provider = get_sms_provider()
+    for notification in notifications:
+        phone = notification.recipient.phone_number
+        if not phone:
+            errors[notification] = 'Recipient has no phone number'
+            continue
+        try:
+            response = provider.send(str(phone), notification.content)
+        except Exception as e:
+            errors[notification] = str(e)
+            logs.append(SMSLog(recipient_phone=str(phone), content=notification.content, status='failed', error_message=str(e)))
+        else:
+            sent.append(notification)
+            logs.append(SMSLog(recipient_phone=str(phone), content=notification.content, status='sent', provider_response=response))
+
+
+def deliver_batch(notifications):
+    """Send claimed notifications and record the outcome; returns counts."""
+    by_channel = {'email': [], 'sms': []}
+    sent = []
+    for notification in notifications:
+        channel = by_channel.get(notification.template.notification_type)
+        if channel is None:
+            sent.append(notification)
+        else:
+            channel.append(notification)
+
+    errors = {}
+    email_logs = []
+    sms_logs = []
+    _send_emails(by_channel['email'], sent, errors, email_logs)
+    _send_sms(by_channel['sms'], sent, errors, sms_logs)
+
+    now = timezone.now()
+    failed = 0
+    outcomes = defaultdict(list)
+    for notification, error in errors.items():
+        if notification.attempts >= MAX_ATTEMPTS:
+            outcome = ('failed', error, now)
+            failed += 1
+        else:
+            outcome = ('pending', error, now + retry_delay(notification.attempts))
+        outcomes[outcome].append(notification.pk)
+    with transaction.atomic():
+        if sent:
+            # Rows read in the meantime keep their ``read`` status
+            Notification.objects.filter(pk__in=[notification.pk for notification in sent], status='pending').update(
+                status='sent', sent_at=now, failed_reason='', next_attempt_at=now, updated_at=now
+            )
+        for (status, error, next_attempt_at), ids in outcomes.items():
+            Notification.objects.filter(pk__in=ids, status='pending').update(
+                status=status, failed_reason=error, next_attempt_at=next_attempt_at, updated_at=now
+            )
+        EmailLog.objects.bulk_create(email_logs, batch_size=500)
+        SMSLog.objects.bulk_create(sms_logs, batch_size=500)
+    return {'sent': len(sent), 'retried': len(errors) - failed, 'failed': failed}
+
+
+def record_stats(counts, seconds):
+    """Store a run's counts; returns the updated ``delivery_stats``."""
+    DeliveryRun.objects.create(
+        sent=counts['sent'], retried=counts['retried'], failed=counts['failed'],
+        batches=counts['batches'], seconds=seconds,
+    )
+    return delivery_stats()
+
+
+def delivery_stats():
+    """Totals over every recorded run plus the last run's throughput."""
+    stats = DeliveryRun.objects.aggregate(sent=Sum('sent'), retried=Sum('retried'), failed=Sum('failed'))
+    stats = {key: value or 0 for key, value in stats.items()}
+    last_run = DeliveryRun.objects.order_by('-created_at', '-pk').first()
+    if last_run is not None:
+        stats.update(
+            last_run_at=last_run.created_at.isoformat(),
+            last_run_processed=last_run.processed,
+            last_run_per_second=round(last_run.processed / last_run.seconds, 1) if last_run.seconds else 0.0,
+        )
+    return stats
+
+
+def run_delivery(batch_size=BATCH_SIZE, max_batches=None):
+    """Deliver batches until nothing is due (or ``max_batches``); returns this run's counts."""
+    started = time.monotonic()
+    counts = {'sent': 0, 'retried': 0, 'failed': 0, 'batches': 0}
+    while max_batches is None or counts['batches'] < max_batches:
+        notifications = claim_batch(batch_size)
+        if not notifications:
+            break
+        for key, value in deliver_batch(notifications).items():
+            counts[key] += value
+        counts['batches'] += 1
+    seconds = time.monotonic() - started
+    if counts['batches']:
+        record_stats(counts, seconds)
+    counts['seconds'] = seconds
+    return counts
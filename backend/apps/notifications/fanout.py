@@ -0,0 +1,168 @@
+"""Preference-aware fan-out of one event to many users.
+
+``opted_in`` narrows a user queryset to those whose ``NotificationPreference``
+allows the channel for the event, as a single filter on the preference
+column (users without a preference row get the column's default).
+``fan_out`` then walks the recipients in primary-key order, renders the
+template for each chunk with ``render_many`` and writes the chunk with one
+``bulk_create`` (plus one UPDATE of the recipients' unread counters). The
+rows are created ``pending``, which queues them for
+``apps.notifications.delivery``.
+
+``notify_each`` is the per-recipient variant for batches of events that
+each carry their own context (e.g. a moderation run approving reviews for
+many users): one preference query, one render pass and one insert.
+"""
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Q
+
+from apps.businesses.models import Business
+from apps.categories.utils import subtree_q
+from .models import Notification, NotificationInbox, NotificationPreference
+from .rendering import get_template
+
+User = get_user_model()
+
+CHUNK_SIZE = 2000
+
+# Preference column consulted per channel and event; events not listed use
+# the channel's ``None`` entry, and channels without one are not optional
+PREFERENCE_FIELDS = {
+    'email': {
+        'review_submitted': 'email_reviews',
+        'review_approved': 'email_reviews',
+        'lead_received': 'email_leads',
+        'message_received': 'email_messages',
+        'marketing': 'email_marketing',
+        None: 'email_system',
+    },
+    'sms': {
+        'lead_received': 'sms_leads',
+        'marketing': 'sms_marketing',
+        None: 'sms_urgent',
+    },
+    'push': {
+        'review_submitted': 'push_reviews',
+        'review_approved': 'push_reviews',
+        'lead_received': 'push_leads',
+        'message_received': 'push_messages',
+        'marketing': 'push_marketing',
+    },
+    'in_app': {},
+}
+
+
+def preference_field(channel, event_type):
+    fields = PREFERENCE_FIELDS[channel]
+    return fields.get(event_type, fields.get(None))
+
+
+def opted_in(users, channel, event_type):
+    """Filter ``users`` to those who accept ``channel`` notifications for ``event_type``."""
+    users = users.filter(is_active=True)
+    field = preference_field(channel, event_type)
+    if field is None:
+        return users
+    allowed = Q(**{f'notification_preferences__{field}': True})
+    if NotificationPreference._meta.get_field(field).default:
+        allowed |= Q(notification_preferences__isnull=True)
+    return users.filter(allowed)
+
+
+def category_owners(category):
+    """Owners of active businesses in ``category`` or its subcategories."""
+    return User.objects.filter(
+        pk__in=Business.objects.filter(subtree_q(category), is_active=True).values('owner_id')
+    )
+
+
+def user_context(first_name, last_name, email):
+    return {
+        'user_name': f'{first_name} {last_name}'.strip() or email,
+        'first_name': first_name,
+        'email': email,
+    }
+
+
+def create_notifications(template, recipient_ids, contexts, data):
+    """Render and insert one notification per recipient; ``data`` may be one dict or one per row."""
+    datas = data if isinstance(data, list) else [data] * len(recipient_ids)
+    with transaction.atomic():
+        Notification.objects.bulk_create([
+            Notification(
+                recipient_id=recipient_id, template_id=template.template.pk,
+                subject=subject, content=content, data=row_data,
+            )
+            for recipient_id, (subject, content), row_data in zip(recipient_ids, template.render_many(contexts), datas)
+        ], batch_size=500)
+        NotificationInbox.adjust(Counter(recipient_ids))
+
+
+def fan_out(event_type, channel, users=None, context=None, extra_context=None, data=None, chunk_size=CHUNK_SIZE):
+    """Create a pending notification for every opted-in user; returns how many.
+
+    ``users`` defaults to all users. ``context`` is shared by every
+    recipient and gains ``user_name``, ``first_name`` and ``email`` per
+    user; ``extra_context(user_ids)`` may return ``{user_id: dict}`` with
+    further per-recipient values for one chunk. Raises ``ValueError`` when
+    there is no active template for the channel and event.
+    """
+    template = get_template(channel, event_type)
+    if template is None:
+        raise ValueError(f'No active {channel} template for {event_type!r}')
+    recipients = opted_in(users if users is not None else User.objects.all(), channel, event_type)
+    context = context or {}
+    data = data or {}
+
+    created = 0
+    last_id = 0
+    while True:
+        rows = list(
+            recipients.filter(pk__gt=last_id).order_by('pk')
+            .values_list('pk', 'first_name', 'last_name', 'email')[:chunk_size]
+        )
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        extra = extra_context([row[0] for row in rows]) if extra_context else {}
+        contexts = [
+            {**context, **user_context(first_name, last_name, email), **extra.get(user_id, {})}
+            for user_id, first_name, last_name, email in rows
+        ]
+        create_notifications(template, [row[0] for row in rows], contexts, data)
+        created += len(rows)
+    return created
+
+
+def notify_category_owners(category, event_type, channel, context=None, **kwargs):
+    """Fan an event out to every owner with an active business under ``category``."""
+    return fan_out(event_type, channel, users=category_owners(category), context=context, **kwargs)
+
+
+def notify_each(event_type, channel, items):
+    """Notify several recipients, each with its own context; returns how many were created.
+
+    ``items`` is a list of ``(user_id, context, data)``; a user may appear
+    more than once. Users who opted out of the channel are skipped, and
+    nothing is sent when there is no active template.
+    """
+    template = get_template(channel, event_type)
+    if template is None or not items:
+        return 0
+    users = {
+        row[0]: user_context(*row[1:])
+        for row in opted_in(User.objects.filter(pk__in={item[0] for item in items}), channel, event_type)
+        .values_list('pk', 'first_name', 'last_name', 'email')
+    }
+    items = [item for item in items if item[0] in users]
+    if items:
+        create_notifications(
+            template,
+            [user_id for user_id, context, data in items],
+            [{**context, **users[user_id]} for user_id, context, data in items],
+            [data for user_id, context, data in items],
+        )
+    return len(items)
@@ -0,0 +1,72 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from apps.notifications.delivery import BATCH_SIZE, delivery_stats, run_delivery
+
+
+class Command(BaseCommand):
+    help = 'Deliver pending notifications (email, SMS, in-app) in batches'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help='Number of notifications claimed per batch'
+        )
+        parser.add_argument(
+            '--max-batches',
+            type=int,
+            help='Stop after this many batches'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running, polling for due notifications'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5.0,
+            help='Seconds to wait between polls when idle (with --loop)'
+        )
+    
+    def handle(self, *args, **options):
+        start_time = timezone.now()
+        self.stdout.write(
+            self.style.SUCCESS(f'Starting notification delivery at {start_time}')
+        )
+        
+        try:
+            while True:
+                counts = run_delivery(options['batch_size'], options['max_batches'])
+                if counts['batches']:
+                    processed = counts['sent'] + counts['retried'] + counts['failed']
+                    rate = processed / counts['seconds'] if counts['seconds'] else 0
+                    self.stdout.write(
+                        self.style.SUCCESS(
+                            f"Delivered {counts['sent']}, retrying {counts['retried']}, failed {counts['failed']} "
+                            f"in {counts['seconds']:.2f} seconds ({rate:.1f}/s)"
+                        )
+                    )
+                if not options['loop']:
+                    break
+                if not counts['batches']:
+                    time.sleep(options['interval'])
+            
+            end_time = timezone.now()
+            duration = end_time - start_time
+            stats = delivery_stats()
+            
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Finished in {duration.total_seconds():.2f} seconds; totals: {stats['sent']} sent, "
+                    f"{stats['retried']} retried, {stats['failed']} failed"
+                )
+            )
+            
+        except Exception as e:
+            self.stdout.write(
+                self.style.ERROR(f'Error delivering notifications: {str(e)}')
+            )
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from apps.notifications.models import NotificationInbox
+
+
+class Command(BaseCommand):
+    help = 'Rebuild stored unread notification counters'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user-id',
+            type=int,
+            help='Repair the counter of a specific user only'
+        )
+    
+    def handle(self, *args, **options):
+        start_time = timezone.now()
+        self.stdout.write(
+            self.style.SUCCESS(f'Starting notification counter repair at {start_time}')
+        )
+        
+        try:
+            user_ids = [options['user_id']] if options['user_id'] else None
+            repaired = NotificationInbox.recalculate(user_ids)
+            
+            end_time = timezone.now()
+            duration = end_time - start_time
+            
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f'Successfully repaired {repaired} inboxes in {duration.total_seconds():.2f} seconds'
+                )
+            )
+            
+        except Exception as e:
+            self.stdout.write(
+                self.style.ERROR(f'Error repairing notification counters: {str(e)}')
+            )
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 16:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0002_notification_delivery_state'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notificationtemplate',
+            name='event_type',
+            field=models.CharField(choices=[('user_registration', 'User Registration'), ('business_registration', 'Business Registration'), ('business_verification', 'Business Verification'), ('review_submitted', 'Review Submitted'), ('review_approved', 'Review Approved'), ('lead_received', 'Lead Received'), ('payment_received', 'Payment Received'), ('subscription_expiry', 'Subscription Expiry'), ('ticket_created', 'Support Ticket Created'), ('ticket_replied', 'Support Ticket Replied'), ('message_received', 'Message Received'), ('marketing', 'Marketing'), ('other', 'Other')], help_text='Event that triggers this notification', max_length=30),
+        ),
+    ]
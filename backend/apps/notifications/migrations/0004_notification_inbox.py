@@ -0,0 +1,48 @@
+# Generated by Django 4.2.7 on 2026-10-19 16:30
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def populate_unread_counts(apps, schema_editor):
+    Notification = apps.get_model('notifications', 'Notification')
+    NotificationInbox = apps.get_model('notifications', 'NotificationInbox')
+    
+    unread = (
+        Notification.objects.exclude(status='read')
+        .order_by()
+        .values_list('recipient_id')
+        .annotate(total=models.Count('id'))
+    )
+    NotificationInbox.objects.bulk_create(
+        [NotificationInbox(user_id=user_id, unread_count=total) for user_id, total in unread],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('notifications', '0003_notificationtemplate_marketing_event'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationInbox',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='notification_inbox', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('unread_count', models.PositiveIntegerField(default=0, help_text='Notifications not yet read by the user')),
+            ],
+            options={
+                'verbose_name': 'Notification Inbox',
+                'verbose_name_plural': 'Notification Inboxes',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['recipient', 'status', 'created_at'], name='notificatio_recipie_3f77fb_idx'),
+        ),
+        migrations.RunPython(populate_unread_counts, migrations.RunPython.noop),
+    ]
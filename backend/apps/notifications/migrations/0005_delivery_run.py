@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-10-19 21:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0004_notification_inbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeliveryRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('sent', models.PositiveIntegerField(default=0, help_text='Notifications delivered in this run')),
+                ('retried', models.PositiveIntegerField(default=0, help_text='Notifications scheduled for another attempt')),
+                ('failed', models.PositiveIntegerField(default=0, help_text='Notifications that ran out of attempts')),
+                ('batches', models.PositiveIntegerField(default=0, help_text='Batches claimed in this run')),
+                ('seconds', models.FloatField(default=0, help_text='Wall-clock duration of the run')),
+            ],
+            options={
+                'verbose_name': 'Delivery Run',
+                'verbose_name_plural': 'Delivery Runs',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
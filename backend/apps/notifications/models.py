@@ -1,5 +1,11 @@
-from django.db import models
+from collections import defaultdict
+
+from django.db import models, transaction
+from django.db.models import F, OuterRef, Value
+from django.db.models.functions import Greatest
 from django.contrib.auth import get_user_model
+from django.utils import timezone
+from apps.core.expressions import SubqueryCount
 from apps.core.models import TimeStampedModel
 
 User = get_user_model()
@@ -27,6 +33,7 @@ class NotificationTemplate(TimeStampedModel):
         ('ticket_created', 'Support Ticket Created'),
         ('ticket_replied', 'Support Ticket Replied'),
         ('message_received', 'Message Received'),
+        ('marketing', 'Marketing'),
         ('other', 'Other'),
     )
     
@@ -68,6 +75,8 @@ class Notification(TimeStampedModel):
     delivered_at = models.DateTimeField(null=True, blank=True, help_text="When the notification was delivered")
     read_at = models.DateTimeField(null=True, blank=True, help_text="When the notification was read by user")
     failed_reason = models.TextField(blank=True, help_text="Reason for delivery failure (if any)")
+    attempts = models.PositiveSmallIntegerField(default=0, help_text="Delivery attempts made so far")
+    next_attempt_at = models.DateTimeField(default=timezone.now, help_text="Earliest time the delivery worker may (re)try this notification")
     
     # Additional data
     data = models.JSONField(default=dict, blank=True, help_text="Additional data used for generating the notification")
@@ -76,6 +85,10 @@ class Notification(TimeStampedModel):
         verbose_name = 'Notification'
         verbose_name_plural = 'Notifications'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+            models.Index(fields=['recipient', 'status', 'created_at']),
+        ]
     
     def __str__(self):
         return f"{self.recipient.email} - {self.subject}"
@@ -83,9 +96,95 @@ class Notification(TimeStampedModel):
     def mark_as_read(self):
         """Mark notification as read."""
         if self.status != 'read':
+            self.read_at = timezone.now()
+            with transaction.atomic():
+                updated = Notification.objects.filter(pk=self.pk).exclude(status='read').update(
+                    status='read', read_at=self.read_at, updated_at=self.read_at
+                )
+                if updated:
+                    NotificationInbox.adjust({self.recipient_id: -1})
             self.status = 'read'
-            self.read_at = models.timezone.now()
-            self.save()
+    
+    @classmethod
+    def mark_all_read(cls, user, up_to_id=None):
+        """Mark ``user``'s unread notifications (with ``pk <= up_to_id``) read in one UPDATE."""
+        now = timezone.now()
+        unread = cls.objects.filter(recipient=user).exclude(status='read')
+        if up_to_id is not None:
+            unread = unread.filter(pk__lte=up_to_id)
+        with transaction.atomic():
+            updated = unread.update(status='read', read_at=now, updated_at=now)
+            if updated:
+                NotificationInbox.adjust({user.pk: -updated})
+        return updated
+    
+    @classmethod
+    def mark_read(cls, queryset):
+        """Mark any set of notifications read, adjusting each recipient's counter.
+        
+        One UPDATE per recipient, each still excluding read rows, so the
+        counter moves by exactly the rows that call changed even when
+        another request marks some of them read at the same time.
+        """
+        now = timezone.now()
+        by_recipient = defaultdict(list)
+        for pk, recipient_id in queryset.exclude(status='read').order_by().values_list('pk', 'recipient_id'):
+            by_recipient[recipient_id].append(pk)
+        updated = 0
+        with transaction.atomic():
+            deltas = {}
+            for recipient_id, ids in by_recipient.items():
+                changed = cls.objects.filter(pk__in=ids).exclude(status='read').update(
+                    status='read', read_at=now, updated_at=now
+                )
+                deltas[recipient_id] = -changed
+                updated += changed
+            NotificationInbox.adjust(deltas)
+        return updated
+
+
+class NotificationInbox(models.Model):
+    """Stored unread notification count per user, read for badge counts."""
+    
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='notification_inbox')
+    unread_count = models.PositiveIntegerField(default=0, help_text="Notifications not yet read by the user")
+    
+    class Meta:
+        verbose_name = 'Notification Inbox'
+        verbose_name_plural = 'Notification Inboxes'
+    
+    def __str__(self):
+        return f"{self.user_id}: {self.unread_count} unread"
+    
+    @classmethod
+    def unread_count_for(cls, user):
+        return cls.objects.filter(user=user).values_list('unread_count', flat=True).first() or 0
+    
+    @classmethod
+    def adjust(cls, deltas):
+        """Apply ``{user_id: delta}`` with one UPDATE per distinct delta."""
+        by_delta = defaultdict(list)
+        for user_id, delta in deltas.items():
+            if delta:
+                by_delta[delta].append(user_id)
+        new_user_ids = [user_id for delta, user_ids in by_delta.items() if delta > 0 for user_id in user_ids]
+        if new_user_ids:
+            cls.objects.bulk_create([cls(user_id=user_id) for user_id in new_user_ids], ignore_conflicts=True, batch_size=1000)
+        for delta, user_ids in by_delta.items():
+            cls.objects.filter(user_id__in=user_ids).update(
+                unread_count=Greatest(F('unread_count') + delta, Value(0))
+            )
+    
+    @classmethod
+    def recalculate(cls, user_ids=None):
+        """Rebuild counters from the notifications table."""
+        users = User.objects.filter(notifications__isnull=False).distinct()
+        if user_ids is not None:
+            users = users.filter(pk__in=user_ids)
+        cls.objects.bulk_create([cls(user_id=user_id) for user_id in users.values_list('pk', flat=True)], ignore_conflicts=True, batch_size=1000)
+        inboxes = cls.objects.all() if user_ids is None else cls.objects.filter(user_id__in=user_ids)
+        unread = Notification.objects.filter(recipient=OuterRef('user_id')).exclude(status='read')
+        return inboxes.update(unread_count=SubqueryCount(unread.values('pk')))
 
 
 class EmailLog(TimeStampedModel):
@@ -132,6 +231,28 @@ class SMSLog(TimeStampedModel):
         return f"{self.recipient_phone} - {self.content[:50]}"
 
 
+class DeliveryRun(TimeStampedModel):
+    """Outcome of one ``run_delivery`` call, summed for delivery statistics."""
+    
+    sent = models.PositiveIntegerField(default=0, help_text="Notifications delivered in this run")
+    retried = models.PositiveIntegerField(default=0, help_text="Notifications scheduled for another attempt")
+    failed = models.PositiveIntegerField(default=0, help_text="Notifications that ran out of attempts")
+    batches = models.PositiveIntegerField(default=0, help_text="Batches claimed in this run")
+    seconds = models.FloatField(default=0, help_text="Wall-clock duration of the run")
+    
+    class Meta:
+        verbose_name = 'Delivery Run'
+        verbose_name_plural = 'Delivery Runs'
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"{self.created_at:%Y-%m-%d %H:%M} - {self.processed} processed"
+    
+    @property
+    def processed(self):
+        return self.sent + self.retried + self.failed
+
+
 class NotificationPreference(TimeStampedModel):
     """User preferences for notifications."""
     
@@ -0,0 +1,32 @@
+"""SMS providers used by the delivery worker.
+
+A provider is any class with ``send(phone, content)`` returning a JSON-able
+response dict (stored on ``SMSLog.provider_response``) and raising
+``SMSDeliveryError`` when the message is not accepted. The class is chosen
+with ``settings.SMS_PROVIDER``.
+"""
+import sys
+import uuid
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class SMSDeliveryError(Exception):
+    """The provider did not accept the message."""
+
+
+class ConsoleSMSProvider:
+    """Writes messages to ``stream`` (stdout by default) instead of sending them."""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+
+    def send(self, phone, content):
+        self.stream.write(f'SMS to {phone}: {content}\n')
+        self.stream.flush()
+        return {'status': 'sent', 'message_id': uuid.uuid4().hex}
+
+
+def get_sms_provider():
+    return import_string(settings.SMS_PROVIDER)()
@@ -0,0 +1,150 @@
+"""Rendering of ``NotificationTemplate`` subjects and bodies.
+
+Templates use ``{{variable}}`` placeholders (``{{business.name}}`` walks
+dict keys or attributes); unknown variables render as an empty string, and
+so do attribute names starting with ``_``, which templates cannot reach.
+Each template is compiled once into a ``str.format`` pattern plus the list
+of variables it needs, so rendering is a lookup per variable and one
+``format`` call, with no parsing or regex work per recipient.
+
+Active templates are kept in a per-process cache keyed by
+``(notification_type, event_type)``. Every ``SYNC_INTERVAL`` seconds a
+lookup compares ``Max(updated_at)`` and the row count of the template table
+with the values the cache was filled under and drops the compiled copies
+when they differ, so an edit made in another process is picked up within
+that interval without relying on a shared cache backend. Saves and deletes
+in this process drop them at once.
+"""
+import re
+import threading
+import time
+
+from django.db.models import Count, Max
+
+from .models import NotificationTemplate
+
+PLACEHOLDER_RE = re.compile(r'\{\{\s*([\w.]+)\s*\}\}')
+SYNC_INTERVAL = 30
+
+_MISSING = object()
+
+
+class CompiledText:
+    """One template string compiled into a substitution plan."""
+    __slots__ = ('source', 'names', '_paths', '_pattern')
+
+    def __init__(self, source):
+        self.source = source or ''
+        chunks = PLACEHOLDER_RE.split(self.source)
+        literals, placeholders = chunks[0::2], chunks[1::2]
+        self.names = tuple(dict.fromkeys(placeholders))
+        self._paths = tuple(name.split('.') for name in self.names)
+        positions = {name: index for index, name in enumerate(self.names)}
+        pattern = []
+        for index, literal in enumerate(literals):
+            pattern.append(literal.replace('{', '{{').replace('}', '}}'))
+            if index < len(placeholders):
+                pattern.append(f'{{{positions[placeholders[index]]}}}')
+        self._pattern = ''.join(pattern)
+
+    def render(self, context):
+        if not self.names:
+            return self.source
+        return self._pattern.format(*[_resolve(context, path) for path in self._paths])
+
+
+def _resolve(context, path):
+    value = context.get(path[0], _MISSING)
+    for part in path[1:]:
+        if value is _MISSING or value is None:
+            break
+        if isinstance(value, dict):
+            value = value.get(part, _MISSING)
+        elif part.startswith('_'):
+            value = _MISSING
+        else:
+            value = getattr(value, part, _MISSING)
+    return '' if value is _MISSING or value is None else value
+
+
+class CompiledTemplate:
+    """Compiled subject and content of one ``NotificationTemplate``."""
+    __slots__ = ('template', 'subject', 'content')
+
+    def __init__(self, template):
+        self.template = template
+        self.subject = CompiledText(template.subject)
+        self.content = CompiledText(template.content)
+
+    @property
+    def variables(self):
+        return tuple(dict.fromkeys(self.subject.names + self.content.names))
+
+    def render(self, context):
+        """Return ``(subject, content)`` for one context dict."""
+        return self.subject.render(context), self.content.render(context)
+
+    def render_many(self, contexts):
+        subject, content = self.subject.render, self.content.render
+        return [(subject(context), content(context)) for context in contexts]
+
+
+_lock = threading.Lock()
+_compiled = {}
+_version = [None]
+_checked_at = [0.0]
+
+
+def _current_version():
+    """``(Max(updated_at), count)`` of the template table, read at most every ``SYNC_INTERVAL`` seconds."""
+    if _version[0] is not None and time.monotonic() - _checked_at[0] < SYNC_INTERVAL:
+        return _version[0]
+    validator = NotificationTemplate.objects.aggregate(last_modified=Max('updated_at'), count=Count('pk'))
+    _checked_at[0] = time.monotonic()
+    return validator['last_modified'], validator['count']
+
+
+def invalidate_templates():
+    """Drop this process's compiled templates (called on template save/delete)."""
+    with _lock:
+        _compiled.clear()
+        _version[0] = None
+
+
+def get_template(notification_type, event_type):
+    """Return the compiled active template for the pair, or None if there is none."""
+    key = (notification_type, event_type)
+    version = _current_version()
+    with _lock:
+        if _version[0] != version:
+            _compiled.clear()
+            _version[0] = version
+        if key in _compiled:
+            return _compiled[key]
+    template = NotificationTemplate.objects.filter(
+        notification_type=notification_type, event_type=event_type, is_active=True
+    ).first()
+    compiled = CompiledTemplate(template) if template is not None else None
+    with _lock:
+        _compiled.setdefault(key, compiled)
+        return _compiled[key]
+
+
+def compile_template(template):
+    """Accept a ``NotificationTemplate`` or an already compiled one."""
+    if isinstance(template, CompiledTemplate):
+        return template
+    compiled = get_template(template.notification_type, template.event_type)
+    if compiled is not None and compiled.template.pk == template.pk and compiled.template.updated_at == template.updated_at:
+        return compiled
+    return CompiledTemplate(template)
+
+
+def render(template, context):
+    """Render one ``(subject, content)`` pair."""
+    return compile_template(template).render(context)
+
+
+def render_many(template, contexts):
+    """Render ``(subject, content)`` for each context, compiling the template once."""
+    return compile_template(template).render_many(contexts)
@@ -0,0 +1,24 @@
+from rest_framework import serializers
+from .models import Notification
+
+
+class NotificationSerializer(serializers.ModelSerializer):
+    event_type = serializers.CharField(source='template.event_type', read_only=True)
+    
+    class Meta:
+        model = Notification
+        fields = (
+            'id', 'event_type', 'subject', 'content', 'status', 'data',
+            'sent_at', 'read_at', 'created_at'
+        )
+        read_only_fields = fields
+
+
+class MarkReadSerializer(serializers.Serializer):
+    up_to_id = serializers.IntegerField(required=False, min_value=1)
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False, max_length=1000)
+    
+    def validate(self, attrs):
+        if ('up_to_id' in attrs) == ('ids' in attrs):
+            raise serializers.ValidationError("Send exactly one of 'up_to_id' or 'ids'.")
+        return attrs
@@ -1,7 +1,8 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
-from .models import NotificationPreference
+from .models import Notification, NotificationInbox, NotificationPreference, NotificationTemplate
+from .rendering import invalidate_templates
 
 User = get_user_model()
 
@@ -10,4 +11,35 @@ User = get_user_model()
 def create_notification_preferences(sender, instance, created, **kwargs):
     """Create notification preferences when user is created."""
     if created:
-        NotificationPreference.objects.create(user=instance)
\ No newline at end of file
+        NotificationPreference.objects.create(user=instance)
+
+
+@receiver(post_save, sender=NotificationTemplate)
+@receiver(post_delete, sender=NotificationTemplate)
+def invalidate_compiled_templates(sender, instance, **kwargs):
+    """Drop compiled copies of templates once one changes."""
+    invalidate_templates()
+
+
+
+@receiver(pre_save, sender=Notification)
+def remember_notification_status(sender, instance, **kwargs):
+    """Keep the stored status so a save that changes read state can adjust the counter."""
+    instance._stored_status = None
+    if instance.pk and not instance._state.adding:
+        instance._stored_status = Notification.objects.filter(pk=instance.pk).values_list('status', flat=True).first()
+
+
+@receiver(post_save, sender=Notification)
+def count_unread_on_save(sender, instance, created, **kwargs):
+    """Keep the recipient's unread counter in step with single saves."""
+    was_unread = not created and instance._stored_status not in (None, 'read')
+    is_unread = instance.status != 'read'
+    if is_unread != was_unread:
+        NotificationInbox.adjust({instance.recipient_id: 1 if is_unread else -1})
+
+
+@receiver(post_delete, sender=Notification)
+def count_unread_on_delete(sender, instance, **kwargs):
+    if instance.status != 'read':
+        NotificationInbox.adjust({instance.recipient_id: -1})
@@ -0,0 +1,235 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.test import TestCase
+from django.utils import timezone
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from . import delivery
+from .models import DeliveryRun, EmailLog, Notification, NotificationInbox, NotificationTemplate, SMSLog
+from .providers import SMSDeliveryError
+
+User = get_user_model()
+
+
+class RecordingSMSProvider:
+    """Keeps sent messages in ``outbox``; numbers in ``fail_numbers`` are rejected."""
+
+    def __init__(self, fail_numbers=()):
+        self.outbox = []
+        self.fail_numbers = set(fail_numbers)
+
+    def send(self, phone, content):
+        if phone in self.fail_numbers:
+            raise SMSDeliveryError(f'Rejected number {phone}')
+        self.outbox.append((phone, content))
+        return {'status': 'sent'}
+
+
+class NotificationInboxTests(TestCase):
+    """Stored unread counters must match a recount from the notifications table."""
+
+    def setUp(self):
+        self.template = NotificationTemplate.objects.create(
+            name='Welcome', notification_type='in_app', event_type='welcome', subject='Hi', content='Hello'
+        )
+        self.user = User.objects.create_user(username='reader', email='reader@example.com', password='x')
+        self.other = User.objects.create_user(username='other', email='other@example.com', password='x')
+
+    def notify(self, user, count):
+        return [
+            Notification.objects.create(recipient=user, template=self.template, subject='Hi', content='Hello')
+            for _ in range(count)
+        ]
+
+    def assertUnread(self, user, expected):
+        self.assertEqual(NotificationInbox.unread_count_for(user), expected)
+        NotificationInbox.recalculate([user.pk])
+        self.assertEqual(NotificationInbox.unread_count_for(user), expected)
+
+    def test_new_notifications_are_counted(self):
+        self.notify(self.user, 3)
+        self.assertUnread(self.user, 3)
+
+    def test_mark_all_read(self):
+        notifications = self.notify(self.user, 3)
+        self.notify(self.other, 2)
+        notifications[0].status = 'read'
+        notifications[0].save()
+
+        self.assertEqual(Notification.mark_all_read(self.user), 2)
+
+        self.assertUnread(self.user, 0)
+        self.assertUnread(self.other, 2)
+        self.assertEqual(Notification.mark_all_read(self.user), 0)
+        self.assertUnread(self.user, 0)
+
+    def test_mark_all_read_up_to_an_id(self):
+        notifications = self.notify(self.user, 4)
+
+        self.assertEqual(Notification.mark_all_read(self.user, up_to_id=notifications[1].pk), 2)
+
+        self.assertUnread(self.user, 2)
+
+    def test_mark_read_and_delete(self):
+        notifications = self.notify(self.user, 3)
+        self.notify(self.other, 1)
+
+        Notification.mark_read(Notification.objects.filter(pk__in=[notifications[0].pk, notifications[1].pk]))
+        self.assertUnread(self.user, 1)
+
+        notifications[2].delete()
+        notifications[0].delete()
+        self.assertUnread(self.user, 0)
+        self.assertUnread(self.other, 1)
+
+    def test_mark_read_skips_rows_read_meanwhile(self):
+        notifications = self.notify(self.user, 3)
+        selection = Notification.objects.filter(pk__in=[notification.pk for notification in notifications])
+        notifications[0].mark_as_read()
+
+        self.assertEqual(Notification.mark_read(selection), 2)
+        self.assertEqual(Notification.mark_read(selection), 0)
+        self.assertUnread(self.user, 0)
+
+
+class NotificationListViewTests(TestCase):
+
+    def setUp(self):
+        template = NotificationTemplate.objects.create(
+            name='Welcome', notification_type='in_app', event_type='welcome', subject='Hi', content='Hello'
+        )
+        self.user = User.objects.create_user(username='reader', email='reader@example.com', password='x')
+        self.notifications = [
+            Notification.objects.create(recipient=self.user, template=template, subject=f'N{i}', content='Hello')
+            for i in range(5)
+        ]
+        self.notifications[3].mark_as_read()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse('notifications:notification-list')
+
+    def test_pages_newest_first_with_the_stored_count(self):
+        first = self.client.get(self.url, {'limit': 3}).json()
+        second = self.client.get(self.url, {'limit': 3, 'cursor': first['next_cursor']}).json()
+
+        self.assertEqual(first['unread_count'], 4)
+        self.assertEqual([item['subject'] for item in first['results']], ['N4', 'N3', 'N2'])
+        self.assertEqual([item['subject'] for item in second['results']], ['N1', 'N0'])
+        self.assertIsNone(second['next_cursor'])
+
+    def test_unread_filter(self):
+        data = self.client.get(self.url, {'unread': 'true'}).json()
+        self.assertEqual([item['subject'] for item in data['results']], ['N4', 'N2', 'N1', 'N0'])
+
+    def test_bad_cursor_is_a_validation_error(self):
+        response = self.client.get(self.url, {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('cursor', response.json())
+
+
+class DeliveryTests(TestCase):
+
+    def setUp(self):
+        self.templates = {
+            channel: NotificationTemplate.objects.create(
+                name=channel, notification_type=channel, event_type='other', subject='Hi', content='Hello'
+            )
+            for channel in ('email', 'sms', 'in_app')
+        }
+        self.user = User.objects.create_user(
+            username='recipient', email='recipient@example.com', password='x', phone_number='+919876543210'
+        )
+        self.sms = RecordingSMSProvider()
+        patcher = mock.patch.object(delivery, 'get_sms_provider', return_value=self.sms)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def notify(self, channel, **kwargs):
+        return Notification.objects.create(
+            recipient=self.user, template=self.templates[channel], subject='Hi', content='Hello', **kwargs
+        )
+
+    def test_claim_leases_due_rows_once(self):
+        due = self.notify('email')
+        self.notify('email', next_attempt_at=timezone.now() + timedelta(hours=1))
+
+        claimed = delivery.claim_batch()
+
+        self.assertEqual([notification.pk for notification in claimed], [due.pk])
+        due.refresh_from_db()
+        self.assertEqual(due.attempts, 1)
+        self.assertGreater(due.next_attempt_at, timezone.now() + delivery.LEASE - timedelta(minutes=1))
+        self.assertEqual(delivery.claim_batch(), [])
+
+    def test_deliver_batch_sends_each_channel(self):
+        notifications = [self.notify('email'), self.notify('sms'), self.notify('in_app')]
+
+        counts = delivery.deliver_batch(delivery.claim_batch())
+
+        self.assertEqual(counts, {'sent': 3, 'retried': 0, 'failed': 0})
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(self.sms.outbox, [('+919876543210', 'Hello')])
+        self.assertEqual(
+            set(Notification.objects.filter(pk__in=[n.pk for n in notifications]).values_list('status', flat=True)),
+            {'sent'},
+        )
+        self.assertEqual(EmailLog.objects.filter(status='sent').count(), 1)
+        self.assertEqual(SMSLog.objects.filter(status='sent').count(), 1)
+
+    def test_failed_send_is_retried_with_backoff_then_failed(self):
+        self.sms.fail_numbers.add('+919876543210')
+        notification = self.notify('sms')
+
+        counts = delivery.deliver_batch(delivery.claim_batch())
+
+        self.assertEqual(counts, {'sent': 0, 'retried': 1, 'failed': 0})
+        notification.refresh_from_db()
+        self.assertEqual(notification.status, 'pending')
+        self.assertIn('Rejected number', notification.failed_reason)
+        self.assertAlmostEqual(
+            (notification.next_attempt_at - notification.updated_at).total_seconds(),
+            delivery.retry_delay(1).total_seconds(), delta=1,
+        )
+
+        Notification.objects.filter(pk=notification.pk).update(
+            attempts=delivery.MAX_ATTEMPTS - 1, next_attempt_at=timezone.now()
+        )
+        counts = delivery.deliver_batch(delivery.claim_batch())
+
+        self.assertEqual(counts, {'sent': 0, 'retried': 0, 'failed': 1})
+        notification.refresh_from_db()
+        self.assertEqual(notification.status, 'failed')
+        self.assertEqual(SMSLog.objects.filter(status='failed').count(), 2)
+
+    def test_notification_read_during_send_stays_read(self):
+        sent = self.notify('email')
+        self.sms.fail_numbers.add('+919876543210')
+        failing = self.notify('sms')
+        claimed = delivery.claim_batch()
+        Notification.mark_read(Notification.objects.filter(pk__in=[sent.pk, failing.pk]))
+
+        delivery.deliver_batch(claimed)
+
+        self.assertEqual(
+            set(Notification.objects.filter(pk__in=[sent.pk, failing.pk]).values_list('status', flat=True)),
+            {'read'},
+        )
+        self.assertEqual(NotificationInbox.unread_count_for(self.user), 0)
+
+    def test_run_delivery_records_the_run(self):
+        for _ in range(3):
+            self.notify('in_app')
+
+        counts = delivery.run_delivery(batch_size=2)
+
+        self.assertEqual((counts['sent'], counts['batches']), (3, 2))
+        self.assertEqual(DeliveryRun.objects.count(), 1)
+        stats = delivery.delivery_stats()
+        self.assertEqual((stats['sent'], stats['retried'], stats['failed']), (3, 0, 0))
+        self.assertEqual(stats['last_run_processed'], 3)
+        self.assertEqual(delivery.run_delivery()['batches'], 0)
+        self.assertEqual(DeliveryRun.objects.count(), 1)
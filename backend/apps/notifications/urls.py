@@ -0,0 +1,10 @@
+from django.urls import path
+from .views import MarkReadView, NotificationListView, UnreadCountView
+
+app_name = 'notifications'
+
+urlpatterns = [
+    path('notifications/', NotificationListView.as_view(), name='notification-list'),
+    path('notifications/unread-count/', UnreadCountView.as_view(), name='unread-count'),
+    path('notifications/mark-read/', MarkReadView.as_view(), name='mark-read'),
+]
@@ -0,0 +1,65 @@
+from rest_framework import generics, permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.core.pagination import KeysetPagination
+from .models import Notification, NotificationInbox
+from .serializers import MarkReadSerializer, NotificationSerializer
+
+
+class NotificationListView(generics.ListAPIView):
+    """The user's notifications, newest first, paged with ``?cursor=``.
+    
+    ``?status=`` narrows the list with an equality on the
+    ``(recipient, status, created_at)`` index, so a page is read straight
+    off it. ``?unread=true`` is ``status != 'read'``: it uses the index
+    prefix for the user and then sorts their unread rows, so its cost
+    grows with the user's unread count rather than the page size.
+    ``unread_count`` comes from the stored counter.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = NotificationSerializer
+    pagination_class = KeysetPagination
+    
+    def get_queryset(self):
+        if getattr(self, 'swagger_fake_view', False):
+            return Notification.objects.none()
+        notifications = Notification.objects.filter(recipient=self.request.user).select_related('template')
+        status_filter = self.request.query_params.get('status')
+        if status_filter:
+            notifications = notifications.filter(status=status_filter)
+        elif self.request.query_params.get('unread') in ('1', 'true'):
+            notifications = notifications.exclude(status='read')
+        return notifications
+    
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        response.data['unread_count'] = NotificationInbox.unread_count_for(request.user)
+        return response
+
+
+class UnreadCountView(APIView):
+    """Badge count: one primary-key lookup on the stored counter."""
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request):
+        return Response({'unread_count': NotificationInbox.unread_count_for(request.user)})
+
+
+class MarkReadView(APIView):
+    """Mark notifications read: everything up to ``up_to_id``, or the listed ``ids``."""
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def post(self, request):
+        serializer = MarkReadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        if 'up_to_id' in serializer.validated_data:
+            updated = Notification.mark_all_read(request.user, up_to_id=serializer.validated_data['up_to_id'])
+        else:
+            updated = Notification.mark_read(
+                Notification.objects.filter(recipient=request.user, pk__in=serializer.validated_data['ids'])
+            )
+        return Response({
+            'updated': updated,
+            'unread_count': NotificationInbox.unread_count_for(request.user),
+        })
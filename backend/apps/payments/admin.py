@@ -1,6 +1,9 @@
 from django.contrib import admin
+from django.utils import timezone
 from django.utils.html import format_html
-from .models import SubscriptionPlan, Subscription, Payment, Invoice, Refund
+from .models import SubscriptionPlan, Subscription, Payment, Invoice, Refund, PaymentRollup
+from .renewals import renew_paid
+from .rollup import payment_dates, rebuild_dates
 
 
 @admin.register(SubscriptionPlan)
@@ -47,6 +50,7 @@ class SubscriptionAdmin(admin.ModelAdmin):
     )
     list_filter = ('status', 'plan', 'auto_renew', 'start_date', 'end_date')
     search_fields = ('user__email', 'business__name', 'plan__name')
+    list_select_related = ('user', 'business', 'plan')
     readonly_fields = ('created_at', 'updated_at', 'is_active', 'remaining_lead_credits')
     date_hierarchy = 'start_date'
     
@@ -58,7 +62,7 @@ class SubscriptionAdmin(admin.ModelAdmin):
             'fields': ('start_date', 'end_date', 'auto_renew')
         }),
         ('Usage', {
-            'fields': ('used_lead_credits', 'remaining_lead_credits')
+            'fields': ('used_lead_credits', 'credits_reset_at', 'remaining_lead_credits')
         }),
         ('Status', {
             'fields': ('is_active',)
@@ -104,14 +108,30 @@ class PaymentAdmin(admin.ModelAdmin):
     
     actions = ['mark_as_completed', 'mark_as_failed']
     
+    def update_payments(self, queryset, **changes):
+        """Bulk update that keeps the payment rollup in step (``update()`` sends no signals)."""
+        payments = Payment.objects.filter(pk__in=list(queryset.values_list('pk', flat=True)))
+        dates = payment_dates(payments)
+        updated = payments.update(updated_at=timezone.now(), **changes)
+        rebuild_dates(dates | payment_dates(payments))
+        return updated
+    
     def mark_as_completed(self, request, queryset):
-        queryset.update(status='completed')
-        self.message_user(request, f"{queryset.count()} payments marked as completed.")
+        now = timezone.now()
+        updated = self.update_payments(queryset.filter(paid_at__isnull=True), status='completed', paid_at=now)
+        updated += self.update_payments(queryset.filter(paid_at__isnull=False), status='completed')
+        subscription_ids = set(
+            queryset.filter(payment_type='subscription', subscription__isnull=False)
+            .values_list('subscription_id', flat=True)
+        )
+        if subscription_ids:
+            renew_paid(now, subscription_ids=subscription_ids)
+        self.message_user(request, f"{updated} payments marked as completed.")
     mark_as_completed.short_description = "Mark selected payments as completed"
     
     def mark_as_failed(self, request, queryset):
-        queryset.update(status='failed')
-        self.message_user(request, f"{queryset.count()} payments marked as failed.")
+        updated = self.update_payments(queryset, status='failed')
+        self.message_user(request, f"{updated} payments marked as failed.")
     mark_as_failed.short_description = "Mark selected payments as failed"
 
 
@@ -164,12 +184,40 @@ class RefundAdmin(admin.ModelAdmin):
     
     actions = ['approve_refunds', 'reject_refunds']
     
+    def update_refunds(self, request, queryset, status):
+        refunds = Refund.objects.filter(pk__in=list(queryset.values_list('pk', flat=True)))
+        now = timezone.now()
+        updated = refunds.update(status=status, processed_by=request.user, processed_at=now, updated_at=now)
+        rebuild_dates(payment_dates(Payment.objects.filter(pk__in=refunds.values('payment_id'))))
+        return updated
+    
     def approve_refunds(self, request, queryset):
-        queryset.update(status='completed', processed_by=request.user)
-        self.message_user(request, f"{queryset.count()} refunds approved.")
+        updated = self.update_refunds(request, queryset, 'completed')
+        self.message_user(request, f"{updated} refunds approved.")
     approve_refunds.short_description = "Approve selected refunds"
     
     def reject_refunds(self, request, queryset):
-        queryset.update(status='rejected', processed_by=request.user)
-        self.message_user(request, f"{queryset.count()} refunds rejected.")
-    reject_refunds.short_description = "Reject selected refunds"
\ No newline at end of file
+        updated = self.update_refunds(request, queryset, 'rejected')
+        self.message_user(request, f"{updated} refunds rejected.")
+    reject_refunds.short_description = "Reject selected refunds"
+
+
+@admin.register(PaymentRollup)
+class PaymentRollupAdmin(admin.ModelAdmin):
+    list_display = (
+        'date', 'payment_type', 'payment_method', 'plan', 'status',
+        'payment_count', 'gross_amount', 'refund_amount', 'net_amount'
+    )
+    list_filter = ('payment_type', 'payment_method', 'plan', 'status', 'date')
+    date_hierarchy = 'date'
+    readonly_fields = (
+        'date', 'payment_type', 'payment_method', 'plan', 'status',
+        'payment_count', 'gross_amount', 'refund_amount'
+    )
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def net_amount(self, obj):
+        return obj.net_amount
+    net_amount.short_description = 'Net Amount'
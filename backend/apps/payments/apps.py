@@ -4,4 +4,7 @@ from django.apps import AppConfig
 class PaymentsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.payments'
-    verbose_name = 'Payments'
\ No newline at end of file
+    verbose_name = 'Payments'
+    
+    def ready(self):
+        import apps.payments.signals
\ No newline at end of file
@@ -0,0 +1,200 @@
+"""Batch rendering of ``Invoice.invoice_file``.
+
+``render_invoices`` walks invoices in primary-key order, one batch at a
+time:
+
+1. load the batch with its payment, user, business and plan in one query
+   and turn each invoice into a plain context dict;
+2. render the batch in a process pool: each worker fills
+   ``invoices/invoice.html``, converts it with ``settings.INVOICE_RENDERER``
+   and stores the result as ``invoices/<sha256>.<ext>``, so identical
+   output maps to the same file and a rerun does not write it twice;
+3. record the file names with one ``bulk_update``. An invoice whose
+   rendering raised is left unchanged and reported instead of aborting the
+   batch; when a rerender changes an invoice's file name, the previous file
+   is deleted unless another invoice still points at it.
+
+Each batch is committed before the next is loaded, and by default only
+invoices without a file are selected, so an interrupted run resumes where
+it stopped when started again.
+
+A renderer is a function ``renderer(html)`` returning ``(content,
+extension)``. ``html_document`` (the default) stores the HTML itself;
+``weasyprint_pdf`` produces PDFs and needs the optional ``weasyprint``
+package.
+"""
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections, transaction
+from django.db.models import Q
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Invoice
+
+BATCH_SIZE = 200
+TEMPLATE_NAME = 'invoices/invoice.html'
+UPLOAD_DIR = 'invoices'
+
+
+def html_document(html):
+    return html.encode('utf-8'), 'html'
+
+
+def weasyprint_pdf(html):
+    from weasyprint import HTML
+    return HTML(string=html, base_url=str(settings.MEDIA_ROOT)).write_pdf(), 'pdf'
+
+
+def get_renderer():
+    return import_string(settings.INVOICE_RENDERER)
+
+
+def without_file(queryset=None):
+    queryset = Invoice.objects.all() if queryset is None else queryset
+    return queryset.filter(Q(invoice_file='') | Q(invoice_file__isnull=True))
+
+
+def invoice_context(invoice):
+    """Everything the template needs, as picklable values."""
+    payment = invoice.payment
+    user = payment.user
+    subscription = payment.subscription
+    return {
+        'invoice_id': invoice.pk,
+        'invoice_number': invoice.invoice_number,
+        'issued_on': timezone.localdate(invoice.created_at),
+        'billing': {
+            'name': invoice.billing_name,
+            'email': invoice.billing_email,
+            'address': invoice.billing_address,
+            'city': invoice.billing_city,
+            'state': invoice.billing_state,
+            'pincode': invoice.billing_pincode,
+            'country': invoice.billing_country,
+            'gst_number': invoice.gst_number,
+        },
+        'customer_name': user.get_full_name() or user.email,
+        'customer_email': user.email,
+        'business_name': payment.business.name if payment.business else '',
+        'description': (
+            f'{subscription.plan.name} subscription' if subscription else payment.get_payment_type_display()
+        ),
+        'payment_method': payment.get_payment_method_display(),
+        'transaction_id': payment.gateway_transaction_id,
+        'paid_on': timezone.localdate(payment.paid_at) if payment.paid_at else None,
+        'currency': payment.currency,
+        'subtotal': payment.amount - invoice.tax_amount,
+        'tax_amount': invoice.tax_amount,
+        'total': payment.amount,
+    }
+
+
+def render_invoice(context):
+    """Render and store one invoice; returns ``(invoice_id, file name, error)``. Runs in a worker.
+
+    Exceptions are caught here, so one bad invoice does not abort the
+    batch: the result then carries no file name and the error message.
+    """
+    try:
+        content, extension = get_renderer()(render_to_string(TEMPLATE_NAME, context))
+        name = f'{UPLOAD_DIR}/{hashlib.sha256(content).hexdigest()}.{extension}'
+        if not default_storage.exists(name):
+            name = default_storage.save(name, ContentFile(content))
+    except Exception as e:
+        return context['invoice_id'], None, f'{type(e).__name__}: {e}'
+    return context['invoice_id'], name, None
+
+
+def delete_unreferenced_files(names):
+    """Delete stored invoice files that no invoice points at any more."""
+    names = set(filter(None, names))
+    if not names:
+        return 0
+    names -= set(Invoice.objects.filter(invoice_file__in=names).values_list('invoice_file', flat=True))
+    for name in names:
+        default_storage.delete(name)
+    return len(names)
+
+
+def render_batch(invoices, executor=None, chunksize=1):
+    """Render a loaded batch (in ``executor`` when given) and save the file names.
+
+    Returns ``(rendered, failures)`` where ``failures`` maps invoice ids to
+    error messages; failed invoices keep their current file.
+    """
+    contexts = [invoice_context(invoice) for invoice in invoices]
+    if executor is None:
+        results = map(render_invoice, contexts)
+    else:
+        results = executor.map(render_invoice, contexts, chunksize=chunksize)
+    names = {}
+    failures = {}
+    for invoice_id, name, error in results:
+        if error is None:
+            names[invoice_id] = name
+        else:
+            failures[invoice_id] = error
+    now = timezone.now()
+    rendered = []
+    replaced = []
+    for invoice in invoices:
+        if invoice.pk not in names:
+            continue
+        if invoice.invoice_file and invoice.invoice_file.name != names[invoice.pk]:
+            replaced.append(invoice.invoice_file.name)
+        invoice.invoice_file = names[invoice.pk]
+        invoice.updated_at = now
+        rendered.append(invoice)
+    with transaction.atomic():
+        Invoice.objects.bulk_update(rendered, ['invoice_file', 'updated_at'], batch_size=500)
+    delete_unreferenced_files(replaced)
+    return len(rendered), failures
+
+
+def render_invoices(queryset=None, rerender=False, workers=None, batch_size=BATCH_SIZE, limit=None):
+    """Render invoice files; returns ``(rendered, failures)``.
+
+    ``queryset`` narrows the invoices considered; unless ``rerender`` is
+    set, those that already have a file are skipped. ``workers`` defaults
+    to the number of CPUs; ``workers=1`` renders in this process. ``limit``
+    caps the invoices attempted, failed ones included; ``failures`` maps
+    the ids of invoices that could not be rendered to the error.
+    """
+    invoices = Invoice.objects.all() if queryset is None else queryset
+    if not rerender:
+        invoices = without_file(invoices)
+    invoices = invoices.select_related('payment__user', 'payment__business', 'payment__subscription__plan').order_by('pk')
+    workers = workers or os.cpu_count() or 1
+
+    executor = None
+    if workers > 1:
+        # Workers only render and write files; they must not share our connections
+        connections.close_all()
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=django.setup)
+    rendered = 0
+    attempted = 0
+    failures = {}
+    last_id = 0
+    try:
+        while limit is None or attempted < limit:
+            size = batch_size if limit is None else min(batch_size, limit - attempted)
+            batch = list(invoices.filter(pk__gt=last_id)[:size])
+            if not batch:
+                break
+            last_id = batch[-1].pk
+            attempted += len(batch)
+            count, batch_failures = render_batch(batch, executor, chunksize=max(1, len(batch) // (4 * workers)))
+            rendered += count
+            failures.update(batch_failures)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return rendered, failures
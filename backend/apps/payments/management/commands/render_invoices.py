@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from apps.payments.invoicing import BATCH_SIZE, render_invoices, without_file
+
+
+class Command(BaseCommand):
+    help = 'Render invoice files for invoices that do not have one yet'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            help='Number of rendering processes (defaults to the number of CPUs)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help='Invoices loaded and saved per batch'
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            help='Stop after attempting this many invoices, failed ones included'
+        )
+        parser.add_argument(
+            '--rerender',
+            action='store_true',
+            help='Render every invoice again, including those that already have a file'
+        )
+    
+    def handle(self, *args, **options):
+        start_time = timezone.now()
+        self.stdout.write(
+            self.style.SUCCESS(f'Starting invoice rendering at {start_time}')
+        )
+        
+        try:
+            rendered, failures = render_invoices(
+                rerender=options['rerender'],
+                workers=options['workers'],
+                batch_size=options['batch_size'],
+                limit=options['limit'],
+            )
+            
+            end_time = timezone.now()
+            duration = end_time - start_time
+            
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f'Successfully rendered {rendered} invoices in {duration.total_seconds():.2f} seconds '
+                    f'({without_file().count()} still without a file)'
+                )
+            )
+            for invoice_id, error in failures.items():
+                self.stdout.write(
+                    self.style.ERROR(f'Could not render invoice {invoice_id}: {error}')
+                )
+            
+        except Exception as e:
+            self.stdout.write(
+                self.style.ERROR(f'Error rendering invoices: {str(e)}')
+            )
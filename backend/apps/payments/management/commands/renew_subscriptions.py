@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from apps.payments.renewals import BATCH_SIZE, run_renewals
+
+
+class Command(BaseCommand):
+    help = 'Renew paid subscriptions, bill due auto-renewing ones, expire lapsed ones and reset monthly lead credits'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help='Subscriptions renewed, billed or reset per batch'
+        )
+    
+    def handle(self, *args, **options):
+        start_time = timezone.now()
+        self.stdout.write(
+            self.style.SUCCESS(f'Starting subscription renewals at {start_time}')
+        )
+        
+        try:
+            counts = run_renewals(start_time, batch_size=options['batch_size'])
+            
+            end_time = timezone.now()
+            duration = end_time - start_time
+            
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Successfully renewed {counts['renewed']}, billed {counts['billed']}, expired {counts['expired']} "
+                    f"(and {counts['deactivated']} business subscriptions) and reset lead credits "
+                    f"of {counts['credits_reset']} subscriptions in {duration.total_seconds():.2f} seconds"
+                )
+            )
+            
+        except Exception as e:
+            self.stdout.write(
+                self.style.ERROR(f'Error renewing subscriptions: {str(e)}')
+            )
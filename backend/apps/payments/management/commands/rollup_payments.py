@@ -0,0 +1,68 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Max, Min
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from apps.payments.models import Payment
+from apps.payments.rollup import changed_dates, rebuild, rebuild_dates
+
+
+class Command(BaseCommand):
+    help = 'Rebuild daily payment rollups for recently changed days, a date range or all history'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hours',
+            type=int,
+            default=26,
+            help='Rebuild the days of payments and refunds changed in the last N hours'
+        )
+        parser.add_argument(
+            '--start',
+            type=date.fromisoformat,
+            help='Rebuild from this date (YYYY-MM-DD) instead of recent changes'
+        )
+        parser.add_argument(
+            '--end',
+            type=date.fromisoformat,
+            help='Last date to rebuild with --start (defaults to today)'
+        )
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Rebuild every day that has payments'
+        )
+    
+    def handle(self, *args, **options):
+        start_time = timezone.now()
+        self.stdout.write(
+            self.style.SUCCESS(f'Starting payment rollup at {start_time}')
+        )
+        
+        try:
+            if options['full']:
+                bounds = Payment.objects.aggregate(
+                    first=Min(Coalesce('paid_at', 'created_at')), last=Max(Coalesce('paid_at', 'created_at'))
+                )
+                written = 0
+                if bounds['first']:
+                    written = rebuild(timezone.localdate(bounds['first']), timezone.localdate(bounds['last']))
+            elif options['start']:
+                written = rebuild(options['start'], options['end'] or timezone.localdate())
+            else:
+                written = rebuild_dates(changed_dates(start_time - timedelta(hours=options['hours'])))
+            
+            end_time = timezone.now()
+            duration = end_time - start_time
+            
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f'Successfully wrote {written} rollup rows in {duration.total_seconds():.2f} seconds'
+                )
+            )
+            
+        except Exception as e:
+            self.stdout.write(
+                self.style.ERROR(f'Error rolling up payments: {str(e)}')
+            )
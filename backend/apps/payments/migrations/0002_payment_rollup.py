@@ -0,0 +1,90 @@
+# Generated by Django 4.2.7 on 2026-10-19 18:15
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce, TruncDate
+
+class SubquerySum(models.Subquery):
+    # Same expression as apps.core.expressions.SubquerySum, kept here so the
+    # migration does not depend on application code
+    template = '(SELECT COALESCE(SUM(_sum.%(column)s), 0) FROM (%(subquery)s) _sum)'
+    
+    def __init__(self, queryset, column, output_field=None, **extra):
+        super().__init__(queryset.values(column), output_field=output_field, column=column, **extra)
+
+
+def populate_rollups(apps, schema_editor):
+    Payment = apps.get_model('payments', 'Payment')
+    PaymentRollup = apps.get_model('payments', 'PaymentRollup')
+    Refund = apps.get_model('payments', 'Refund')
+    
+    key_fields = ('date', 'payment_type', 'payment_method', 'plan', 'status')
+    refunded = SubquerySum(
+        Refund.objects.filter(payment=models.OuterRef('pk'), status='completed'), 'amount'
+    )
+    rows = (
+        Payment.objects.order_by()
+        .annotate(
+            date=TruncDate(Coalesce('paid_at', 'created_at')),
+            plan=Coalesce('subscription__plan__plan_type', models.Value('')),
+        )
+        .values(*key_fields)
+        .annotate(payment_count=models.Count('id'), gross_amount=models.Sum('amount'), refund_amount=models.Sum(refunded))
+    )
+    PaymentRollup.objects.bulk_create([
+        PaymentRollup(
+            **{field: row[field] for field in key_fields},
+            payment_count=row['payment_count'], gross_amount=row['gross_amount'],
+            refund_amount=row['refund_amount'] or 0,
+        )
+        for row in rows
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PaymentRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('payment_type', models.CharField(choices=[('subscription', 'Subscription'), ('lead_purchase', 'Lead Purchase'), ('featured_listing', 'Featured Listing'), ('other', 'Other')], max_length=20)),
+                ('payment_method', models.CharField(choices=[('card', 'Credit/Debit Card'), ('upi', 'UPI'), ('netbanking', 'Net Banking'), ('wallet', 'Digital Wallet'), ('bank_transfer', 'Bank Transfer')], max_length=20)),
+                ('plan', models.CharField(blank=True, choices=[('free', 'Free'), ('silver', 'Silver'), ('gold', 'Gold'), ('platinum', 'Platinum'), ('enterprise', 'Enterprise')], max_length=20)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('completed', 'Completed'), ('failed', 'Failed'), ('refunded', 'Refunded'), ('cancelled', 'Cancelled')], max_length=20)),
+                ('payment_count', models.IntegerField(default=0, help_text='Number of payments')),
+                ('gross_amount', models.DecimalField(decimal_places=2, default=0, help_text='Sum of payment amounts', max_digits=14)),
+                ('refund_amount', models.DecimalField(decimal_places=2, default=0, help_text='Sum of completed refunds on these payments', max_digits=14)),
+            ],
+            options={
+                'verbose_name': 'Payment Rollup',
+                'verbose_name_plural': 'Payment Rollups',
+                'ordering': ['-date'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['paid_at'], name='payments_pa_paid_at_b40014_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['created_at'], name='payments_pa_created_b8a300_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['updated_at'], name='payments_pa_updated_e44ec3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='paymentrollup',
+            index=models.Index(fields=['payment_type', 'status', 'date'], name='payments_pa_payment_83db78_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='paymentrollup',
+            constraint=models.UniqueConstraint(fields=('date', 'payment_type', 'payment_method', 'plan', 'status'), name='unique_payment_rollup_key'),
+        ),
+        migrations.RunPython(populate_rollups, migrations.RunPython.noop),
+    ]
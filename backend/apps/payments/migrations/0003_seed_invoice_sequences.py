@@ -0,0 +1,36 @@
+# Generated by Django 4.2.7 on 2026-10-19 19:10
+
+import re
+
+from django.db import migrations
+
+NUMBER_RE = re.compile(r'INV-(\d{4}-\d{2})-(\d+)')
+
+
+def seed_invoice_sequences(apps, schema_editor):
+    # Start each month's counter after the highest invoice number already issued
+    Invoice = apps.get_model('payments', 'Invoice')
+    NumberSequence = apps.get_model('core', 'NumberSequence')
+    highest = {}
+    for number in Invoice.objects.values_list('invoice_number', flat=True).iterator():
+        match = NUMBER_RE.fullmatch(number or '')
+        if match is not None:
+            period, value = match.group(1), int(match.group(2))
+            highest[period] = max(value, highest.get(period, 0))
+    for period, value in highest.items():
+        sequence, created = NumberSequence.objects.get_or_create(prefix='INV', period=period)
+        if sequence.last_value < value:
+            sequence.last_value = value
+            sequence.save(update_fields=['last_value'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_number_sequence'),
+        ('payments', '0002_payment_rollup'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_invoice_sequences, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,10 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 from decimal import Decimal
 from apps.core.models import TimeStampedModel
+from apps.core.sequences import next_number
 from apps.businesses.models import Business
 
 User = get_user_model()
@@ -81,6 +84,7 @@ class Subscription(TimeStampedModel):
     
     # Usage tracking
     used_lead_credits = models.PositiveIntegerField(default=0)
+    credits_reset_at = models.DateTimeField(null=True, blank=True, help_text="Start of the current monthly lead-credit period")
     
     # Auto-renewal
     auto_renew = models.BooleanField(default=True)
@@ -89,10 +93,19 @@ class Subscription(TimeStampedModel):
         verbose_name = 'Subscription'
         verbose_name_plural = 'Subscriptions'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'end_date']),
+            models.Index(fields=['status', 'credits_reset_at']),
+        ]
     
     def __str__(self):
         return f"{self.user.email} - {self.plan.name} ({self.status})"
     
+    def save(self, *args, **kwargs):
+        if self.credits_reset_at is None:
+            self.credits_reset_at = self.start_date
+        super().save(*args, **kwargs)
+    
     @property
     def is_active(self):
         return self.status == 'active' and self.end_date > timezone.now()
@@ -153,6 +166,11 @@ class Payment(TimeStampedModel):
         verbose_name = 'Payment'
         verbose_name_plural = 'Payments'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['paid_at']),
+            models.Index(fields=['created_at']),
+            models.Index(fields=['updated_at']),
+        ]
     
     def __str__(self):
         return f"{self.user.email} - ₹{self.amount} ({self.status})"
@@ -161,6 +179,8 @@ class Payment(TimeStampedModel):
 class Invoice(TimeStampedModel):
     """Invoices for payments."""
     
+    NUMBER_PREFIX = 'INV'
+    
     payment = models.OneToOneField(Payment, on_delete=models.CASCADE, related_name='invoice')
     invoice_number = models.CharField(max_length=50, unique=True)
     
@@ -189,12 +209,17 @@ class Invoice(TimeStampedModel):
         return f"Invoice {self.invoice_number}"
     
     def save(self, *args, **kwargs):
-        if not self.invoice_number:
-            # Generate invoice number
-            from django.utils import timezone
-            now = timezone.now()
-            self.invoice_number = f"INV-{now.year}-{now.month:02d}-{self.id or 1:06d}"
-        super().save(*args, **kwargs)
+        if self.invoice_number:
+            return super().save(*args, **kwargs)
+        # Number and row are written in one transaction, so a failed insert
+        # hands the number back instead of leaving a gap
+        try:
+            with transaction.atomic():
+                self.invoice_number = next_number(self.NUMBER_PREFIX)
+                super().save(*args, **kwargs)
+        except Exception:
+            self.invoice_number = ''
+            raise
 
 
 class Refund(TimeStampedModel):
@@ -224,4 +249,66 @@ class Refund(TimeStampedModel):
         ordering = ['-created_at']
     
     def __str__(self):
-        return f"Refund ₹{self.amount} for {self.payment}"
\ No newline at end of file
+        return f"Refund ₹{self.amount} for {self.payment}"
+
+
+class PaymentRollup(models.Model):
+    """Daily payment totals per type, method, plan and status.
+    
+    ``date`` is the local date the payment was made (``paid_at``, or
+    ``created_at`` while unpaid) and ``plan`` the ``plan_type`` of the
+    subscription paid for (blank for other payments). ``refund_amount`` is
+    the completed refunds of the counted payments, so net revenue is
+    ``gross_amount - refund_amount``.
+    """
+    
+    date = models.DateField()
+    payment_type = models.CharField(max_length=20, choices=Payment.PAYMENT_TYPES)
+    payment_method = models.CharField(max_length=20, choices=Payment.PAYMENT_METHODS)
+    plan = models.CharField(max_length=20, choices=SubscriptionPlan.PLAN_TYPES, blank=True)
+    status = models.CharField(max_length=20, choices=Payment.STATUS_CHOICES)
+    
+    payment_count = models.IntegerField(default=0, help_text="Number of payments")
+    gross_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0, help_text="Sum of payment amounts")
+    refund_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0, help_text="Sum of completed refunds on these payments")
+    
+    class Meta:
+        verbose_name = 'Payment Rollup'
+        verbose_name_plural = 'Payment Rollups'
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['date', 'payment_type', 'payment_method', 'plan', 'status'],
+                name='unique_payment_rollup_key'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['payment_type', 'status', 'date']),
+        ]
+    
+    def __str__(self):
+        return f"{self.date} {self.payment_type}/{self.payment_method}/{self.plan or '-'} ({self.status})"
+    
+    @property
+    def net_amount(self):
+        return self.gross_amount - self.refund_amount
+    
+    @classmethod
+    def adjust(cls, deltas):
+        """Apply ``{key: (count, gross, refunded)}`` deltas, one UPDATE per key.
+        
+        ``key`` is ``(date, payment_type, payment_method, plan, status)``.
+        """
+        deltas = {key: delta for key, delta in deltas.items() if any(delta)}
+        if not deltas:
+            return
+        fields = ('date', 'payment_type', 'payment_method', 'plan', 'status')
+        cls.objects.bulk_create(
+            [cls(**dict(zip(fields, key))) for key in deltas], ignore_conflicts=True
+        )
+        for key, (count, gross, refunded) in deltas.items():
+            cls.objects.filter(**dict(zip(fields, key))).update(
+                payment_count=F('payment_count') + count,
+                gross_amount=F('gross_amount') + gross,
+                refund_amount=F('refund_amount') + refunded,
+            )
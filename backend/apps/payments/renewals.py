@@ -0,0 +1,283 @@
+"""Subscription renewal, expiry and monthly lead-credit resets.
+
+``run_renewals`` is the scheduler's single entry point; each step finds its
+rows with a range scan on an ``(active flag, date)`` index rather than
+evaluating ``is_active`` / ``is_expired`` per instance:
+
+1. ``renew_paid``: active subscriptions past their ``end_date`` whose
+   renewal payment (a ``subscription`` payment created since that
+   ``end_date``) has completed are extended by one billing cycle, in
+   batches, with one ``bulk_update`` each. The active, auto-renewing
+   ``BusinessSubscription`` of the same business and plan gets the new
+   ``end_date`` too. Marking payments completed in the admin runs this step
+   for their subscriptions straight away;
+2. ``bill_due``: active, auto-renewing subscriptions whose ``end_date`` has
+   passed and that have no renewal payment yet are charged with one
+   ``bulk_create`` of ``pending`` payments per locked batch (the daily
+   rollup for the day is rebuilt afterwards, since bulk inserts send no
+   signals). Nothing is extended until the payment completes;
+3. ``expire_due``: what is still active past its ``end_date`` is flipped to
+   ``expired`` with one UPDATE and its users are sent ``subscription_expiry``
+   notifications, except subscriptions whose renewal payment is still open
+   and that lapsed less than ``RENEWAL_GRACE`` ago; a failed or cancelled
+   renewal payment therefore expires the subscription on the next run.
+   Lapsed ``BusinessSubscription`` rows are deactivated the same way,
+   except auto-renewing ones still backed by an active auto-renewing
+   subscription on their plan;
+4. ``reset_lead_credits``: rows whose monthly credit period (counted from
+   ``credits_reset_at``) is over get ``used_lead_credits`` set back to 0 and
+   the period start moved forward, with one ``bulk_update`` per batch.
+
+Bulk writes send no signals, so the businesses whose ``BusinessSubscription``
+was extended or deactivated are re-indexed for search explicitly.
+"""
+import calendar
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef, Subquery
+from django.utils import timezone
+
+from apps.businesses.models import BusinessSubscription
+from apps.businesses.search import get_search_backend
+from apps.notifications.fanout import notify_each
+from .models import Payment, Subscription
+from .reports import CYCLE_MONTHS
+from .rollup import rebuild_dates
+
+BATCH_SIZE = 500
+NOTIFY_CHANNELS = ('email', 'in_app')
+DEFAULT_PAYMENT_METHOD = 'card'
+RENEWAL_GRACE = timedelta(days=3)
+OPEN_PAYMENT_STATUSES = ('pending', 'processing')
+
+
+def shift_months(moment, months):
+    """``moment`` moved by whole calendar months, clamping the day to the month's length."""
+    local = timezone.localtime(moment)
+    index = local.year * 12 + local.month - 1 + months
+    year, month = index // 12, index % 12 + 1
+    return local.replace(year=year, month=month, day=min(local.day, calendar.monthrange(year, month)[1]))
+
+
+def period_start(start, now, months=1):
+    """Start of the ``months``-long period, counted from ``start``, that contains ``now``."""
+    if start > now:
+        return start
+    local = timezone.localtime(now)
+    anchor = timezone.localtime(start)
+    elapsed = (local.year - anchor.year) * 12 + local.month - anchor.month
+    elapsed -= elapsed % months
+    current = shift_months(start, elapsed)
+    while current > now:
+        elapsed -= months
+        current = shift_months(start, elapsed)
+    return current
+
+
+def _locked(queryset):
+    if connection.features.has_select_for_update_skip_locked:
+        return queryset.select_for_update(skip_locked=True, of=('self',))
+    return queryset
+
+
+def renewal_payments(**filters):
+    """Payments charged for the period that starts at the outer subscription's ``end_date``."""
+    return Payment.objects.filter(
+        subscription=OuterRef('pk'), payment_type='subscription', created_at__gte=OuterRef('end_date'), **filters
+    )
+
+
+def due_for_renewal(now):
+    return Subscription.objects.filter(status='active', end_date__lte=now, auto_renew=True)
+
+
+def bill_batch(now, batch_size=BATCH_SIZE):
+    """Create pending renewal payments for up to ``batch_size`` due subscriptions; returns the payments."""
+    last_method = Payment.objects.filter(subscription=OuterRef('pk')).order_by('-created_at').values('payment_method')[:1]
+    with transaction.atomic():
+        subscriptions = list(
+            _locked(due_for_renewal(now)).select_related('plan')
+            .alias(billed=Exists(renewal_payments())).filter(billed=False)
+            .annotate(last_payment_method=Subquery(last_method))
+            .order_by('end_date', 'pk')[:batch_size]
+        )
+        payments = [
+            Payment(
+                user_id=subscription.user_id,
+                business_id=subscription.business_id,
+                subscription=subscription,
+                payment_type='subscription',
+                amount=subscription.plan.price,
+                payment_method=subscription.last_payment_method or DEFAULT_PAYMENT_METHOD,
+            )
+            for subscription in subscriptions
+        ]
+        return Payment.objects.bulk_create(payments, batch_size=batch_size)
+
+
+def bill_due(now=None, batch_size=BATCH_SIZE):
+    """Charge every due auto-renewing subscription once; returns how many payments were created."""
+    now = now or timezone.now()
+    billed = 0
+    while True:
+        payments = bill_batch(now, batch_size)
+        billed += len(payments)
+        if len(payments) < batch_size:
+            break
+    if billed:
+        rebuild_dates([timezone.localdate()])
+    return billed
+
+
+def renew_batch(now, batch_size=BATCH_SIZE, subscription_ids=None):
+    """Extend up to ``batch_size`` subscriptions whose renewal payment completed; returns them."""
+    paid = (
+        Subscription.objects.filter(status='active', end_date__lte=now)
+        .alias(paid=Exists(renewal_payments(status='completed'))).filter(paid=True)
+    )
+    if subscription_ids is not None:
+        paid = paid.filter(pk__in=subscription_ids)
+    with transaction.atomic():
+        subscriptions = list(_locked(paid).select_related('plan').order_by('end_date', 'pk')[:batch_size])
+        if not subscriptions:
+            return []
+        for subscription in subscriptions:
+            months = CYCLE_MONTHS.get(subscription.plan.billing_cycle, 1)
+            # A subscription left lapsed for longer than a cycle restarts today
+            start = subscription.end_date
+            if shift_months(start, months) <= now:
+                start = now
+            subscription.end_date = shift_months(start, months)
+            subscription.used_lead_credits = 0
+            subscription.credits_reset_at = start
+            subscription.updated_at = now
+        Subscription.objects.bulk_update(
+            subscriptions, ['end_date', 'used_lead_credits', 'credits_reset_at', 'updated_at'], batch_size=batch_size
+        )
+        sync_business_subscriptions(subscriptions, now)
+    return subscriptions
+
+
+def sync_business_subscriptions(subscriptions, now):
+    """Carry renewed periods over to the matching business plans; returns how many rows changed."""
+    renewed = {(subscription.business_id, subscription.plan_id): subscription for subscription in subscriptions}
+    rows = BusinessSubscription.objects.filter(
+        business_id__in={business_id for business_id, plan_id in renewed}, is_active=True, auto_renew=True
+    ).only('pk', 'business_id', 'plan_id', 'end_date')
+    changed = []
+    for row in rows:
+        subscription = renewed.get((row.business_id, row.plan_id))
+        if subscription is None or row.end_date >= subscription.end_date:
+            continue
+        row.end_date = subscription.end_date
+        row.used_lead_credits = 0
+        row.credits_reset_at = subscription.credits_reset_at
+        row.updated_at = now
+        changed.append(row)
+    BusinessSubscription.objects.bulk_update(
+        changed, ['end_date', 'used_lead_credits', 'credits_reset_at', 'updated_at'], batch_size=BATCH_SIZE
+    )
+    return len(changed)
+
+
+def renew_paid(now=None, batch_size=BATCH_SIZE, subscription_ids=None):
+    """Extend every subscription whose renewal payment completed; returns how many were renewed."""
+    now = now or timezone.now()
+    renewed = 0
+    business_ids = set()
+    while True:
+        batch = renew_batch(now, batch_size, subscription_ids)
+        if not batch:
+            break
+        renewed += len(batch)
+        business_ids.update(subscription.business_id for subscription in batch)
+    if renewed:
+        get_search_backend().index_businesses(sorted(business_ids))
+    return renewed
+
+
+def renewing_subscription():
+    """Whether the ``BusinessSubscription`` row is backed by an active auto-renewing subscription."""
+    return Exists(Subscription.objects.filter(
+        business_id=OuterRef('business_id'), plan_id=OuterRef('plan_id'), status='active', auto_renew=True
+    ))
+
+
+def expire_due(now=None):
+    """Expire subscriptions past their end date; returns ``(subscriptions, business subscriptions)``."""
+    now = now or timezone.now()
+    with transaction.atomic():
+        rows = list(
+            _locked(Subscription.objects.filter(status='active', end_date__lte=now))
+            .alias(awaiting_payment=Exists(renewal_payments(status__in=OPEN_PAYMENT_STATUSES)))
+            .exclude(awaiting_payment=True, end_date__gt=now - RENEWAL_GRACE)
+            .values_list('pk', 'user_id', 'business_id', 'business__name', 'plan__name', 'end_date')
+        )
+        if rows:
+            Subscription.objects.filter(pk__in=[row[0] for row in rows], status='active').update(
+                status='expired', updated_at=now
+            )
+            _notify_expired(rows)
+        lapsed = dict(
+            _locked(BusinessSubscription.objects.filter(is_active=True, end_date__lte=now))
+            .alias(has_renewing_subscription=renewing_subscription())
+            .exclude(auto_renew=True, has_renewing_subscription=True)
+            .values_list('pk', 'business_id')
+        )
+        if lapsed:
+            BusinessSubscription.objects.filter(pk__in=list(lapsed), is_active=True).update(
+                is_active=False, updated_at=now
+            )
+    if lapsed:
+        get_search_backend().index_businesses(sorted(set(lapsed.values())))
+    return len(rows), len(lapsed)
+
+
+def _notify_expired(rows):
+    items = [
+        (user_id, {'business_name': business_name, 'plan_name': plan_name, 'end_date': timezone.localdate(end_date)},
+         {'subscription_id': subscription_id, 'business_id': business_id})
+        for subscription_id, user_id, business_id, business_name, plan_name, end_date in rows
+    ]
+    for channel in NOTIFY_CHANNELS:
+        notify_each('subscription_expiry', channel, items)
+
+
+def reset_lead_credits(now=None, batch_size=BATCH_SIZE):
+    """Start a new monthly credit period where the current one is over; returns how many rows were reset."""
+    now = now or timezone.now()
+    cutoff = shift_months(now, -1)
+    reset = 0
+    for model, active in ((Subscription, {'status': 'active'}), (BusinessSubscription, {'is_active': True})):
+        last_id = 0
+        while True:
+            batch = list(
+                model.objects.filter(credits_reset_at__lte=cutoff, pk__gt=last_id, **active)
+                .only('pk', 'credits_reset_at').order_by('pk')[:batch_size]
+            )
+            if not batch:
+                break
+            last_id = batch[-1].pk
+            for row in batch:
+                row.credits_reset_at = period_start(row.credits_reset_at, now)
+                row.used_lead_credits = 0
+                row.updated_at = now
+            model.objects.bulk_update(batch, ['credits_reset_at', 'used_lead_credits', 'updated_at'])
+            reset += len(batch)
+    return reset
+
+
+def run_renewals(now=None, batch_size=BATCH_SIZE):
+    """Renew what was paid, bill what is due, expire, then reset credits; returns the counts of each step."""
+    now = now or timezone.now()
+    renewed = renew_paid(now, batch_size)
+    billed = bill_due(now, batch_size)
+    expired, deactivated = expire_due(now)
+    return {
+        'renewed': renewed,
+        'billed': billed,
+        'expired': expired,
+        'deactivated': deactivated,
+        'credits_reset': reset_lead_credits(now, batch_size),
+    }
@@ -0,0 +1,99 @@
+"""Revenue queries over ``PaymentRollup``.
+
+Revenue counts payments that were collected (``completed``, or
+``refunded`` afterwards) net of their completed refunds. Subscription
+revenue is spread over the plan's billing cycle for MRR: a yearly payment
+adds a twelfth of its net amount to each of the twelve months it covers.
+"""
+from datetime import date
+from decimal import Decimal
+
+from django.db.models import F, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .models import PaymentRollup, SubscriptionPlan
+
+REVENUE_STATUSES = ('completed', 'refunded')
+CYCLE_MONTHS = {'monthly': 1, 'quarterly': 3, 'yearly': 12}
+
+
+def add_months(month, months):
+    """First day of the month ``months`` after (or before) ``month``."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_start(day=None):
+    day = day or timezone.localdate()
+    return day.replace(day=1)
+
+
+def revenue(start=None, end=None, group_by=(), **filters):
+    """Collected revenue between two dates (inclusive), optionally grouped.
+    
+    ``group_by`` may name any rollup key field; ``filters`` are passed to
+    ``PaymentRollup.objects.filter``. Rows carry ``payments``, ``gross``,
+    ``refunds`` and ``net``.
+    """
+    rollups = PaymentRollup.objects.filter(status__in=REVENUE_STATUSES, **filters)
+    if start:
+        rollups = rollups.filter(date__gte=start)
+    if end:
+        rollups = rollups.filter(date__lte=end)
+    totals = dict(
+        payments=Sum('payment_count'),
+        gross=Sum('gross_amount'),
+        refunds=Sum('refund_amount'),
+        net=Sum(F('gross_amount') - F('refund_amount')),
+    )
+    if group_by:
+        return list(rollups.order_by(*group_by).values(*group_by).annotate(**totals))
+    return rollups.aggregate(**totals)
+
+
+def total_revenue():
+    """Net revenue collected to date."""
+    return revenue()['net'] or Decimal('0')
+
+
+def mrr(month=None):
+    """Monthly recurring revenue for the month containing ``month``."""
+    month = month_start(month)
+    cycles = dict(SubscriptionPlan.objects.values_list('plan_type', 'billing_cycle'))
+    rows = (
+        PaymentRollup.objects
+        .filter(
+            payment_type='subscription', status__in=REVENUE_STATUSES,
+            date__gte=add_months(month, -(max(CYCLE_MONTHS.values()) - 1)), date__lt=add_months(month, 1),
+        )
+        .annotate(month=TruncMonth('date'))
+        .order_by().values('plan', 'month')
+        .annotate(net=Sum(F('gross_amount') - F('refund_amount')))
+    )
+    total = Decimal('0')
+    for row in rows:
+        months = CYCLE_MONTHS.get(cycles.get(row['plan']), 1)
+        if row['month'] > add_months(month, -months):
+            total += row['net'] / months
+    return total.quantize(Decimal('0.01'))
+
+
+def arr(month=None):
+    """Annual run rate: MRR times twelve."""
+    return mrr(month) * 12
+
+
+def mrr_churn(month=None):
+    """Net MRR lost in ``month`` compared with the month before."""
+    month = month_start(month)
+    previous = mrr(add_months(month, -1))
+    current = mrr(month)
+    lost = max(previous - current, Decimal('0'))
+    return {
+        'month': month,
+        'previous_mrr': previous,
+        'mrr': current,
+        'lost_mrr': lost,
+        'rate': round(lost / previous * 100, 2) if previous else Decimal('0'),
+    }
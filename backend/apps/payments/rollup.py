@@ -0,0 +1,134 @@
+"""Maintenance of the daily ``PaymentRollup`` table.
+
+A payment contributes ``(1, amount, completed refunds)`` to the rollup row
+for its key ``(date, payment_type, payment_method, plan, status)``.
+
+- Single saves and deletes of payments and refunds move that contribution
+  with ``PaymentRollup.adjust`` (see ``signals.py``), so each status
+  transition costs a couple of primary-key updates.
+- ``rebuild(start, end)`` recomputes whole days from the payments table
+  with one grouped query; the ``rollup_payments`` command uses it for
+  backfills and to catch up on bulk ``update()`` calls, which send no
+  signals.
+"""
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, OuterRef, Q, Sum, Value
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from apps.core.expressions import SubquerySum
+from .models import Payment, PaymentRollup, Refund
+
+KEY_FIELDS = ('date', 'payment_type', 'payment_method', 'plan', 'status')
+
+
+def completed_refunds():
+    return SubquerySum(Refund.objects.filter(payment=OuterRef('pk'), status='completed'), 'amount')
+
+
+def payment_state(payment_id, with_refunds=True):
+    """Return ``(key, (1, amount, refunded))`` for a stored payment, or None."""
+    refunded = completed_refunds() if with_refunds else Value(0)
+    row = (
+        Payment.objects.filter(pk=payment_id)
+        .annotate(plan=Coalesce('subscription__plan__plan_type', Value('')), refunded=refunded)
+        .values('paid_at', 'created_at', 'payment_type', 'payment_method', 'plan', 'status', 'amount', 'refunded')
+        .first()
+    )
+    if row is None:
+        return None
+    key = (
+        timezone.localdate(row['paid_at'] or row['created_at']),
+        row['payment_type'], row['payment_method'], row['plan'], row['status'],
+    )
+    return key, (1, row['amount'], row['refunded'] or 0)
+
+
+def move(old, new):
+    """Replace contribution ``old`` with ``new`` (either may be None) in the rollup."""
+    deltas = {}
+    for state, sign in ((old, -1), (new, 1)):
+        if state is None:
+            continue
+        key, values = state
+        current = deltas.get(key, (0, 0, 0))
+        deltas[key] = tuple(total + sign * value for total, value in zip(current, values))
+    PaymentRollup.adjust(deltas)
+
+
+def day_bounds(start, end):
+    """Aware datetimes spanning the local dates ``start`` to ``end`` inclusive."""
+    tz = timezone.get_current_timezone()
+    return (
+        timezone.make_aware(datetime.combine(start, time.min), tz),
+        timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min), tz),
+    )
+
+
+def rebuild(start, end):
+    """Recompute rollup rows for local dates ``start``..``end``; returns how many rows were written."""
+    since, until = day_bounds(start, end)
+    payments = Payment.objects.filter(
+        Q(paid_at__gte=since, paid_at__lt=until)
+        | Q(paid_at__isnull=True, created_at__gte=since, created_at__lt=until)
+    )
+    rows = (
+        payments.order_by()
+        .annotate(
+            date=TruncDate(Coalesce('paid_at', 'created_at')),
+            plan=Coalesce('subscription__plan__plan_type', Value('')),
+        )
+        .values(*KEY_FIELDS)
+        .annotate(
+            payment_count=Count('pk'),
+            gross_amount=Sum('amount'),
+            refund_amount=Sum(completed_refunds()),
+        )
+    )
+    rollups = [
+        PaymentRollup(**{field: row[field] for field in KEY_FIELDS},
+                      payment_count=row['payment_count'], gross_amount=row['gross_amount'],
+                      refund_amount=row['refund_amount'] or 0)
+        for row in rows
+    ]
+    with transaction.atomic():
+        PaymentRollup.objects.filter(date__range=(start, end)).delete()
+        PaymentRollup.objects.bulk_create(rollups, batch_size=1000)
+    return len(rollups)
+
+
+def rebuild_dates(dates):
+    """Rebuild each run of consecutive dates in ``dates`` with one ``rebuild`` call."""
+    written = 0
+    dates = sorted(set(dates))
+    while dates:
+        start = end = dates.pop(0)
+        while dates and dates[0] == end + timedelta(days=1):
+            end = dates.pop(0)
+        written += rebuild(start, end)
+    return written
+
+
+def payment_dates(payments):
+    """Local dates the payments in a queryset may be counted under.
+    
+    Both the creation and the payment date are included, since a payment
+    moves from the first to the second when it is paid.
+    """
+    dates = set()
+    for paid_at, created_at in payments.values_list('paid_at', 'created_at'):
+        dates.add(timezone.localdate(created_at))
+        if paid_at:
+            dates.add(timezone.localdate(paid_at))
+    return dates
+
+
+def changed_dates(since):
+    """Rollup dates of payments and refunds modified since ``since``."""
+    refunded = Refund.objects.filter(updated_at__gte=since).values_list('payment_id', flat=True)
+    return (
+        payment_dates(Payment.objects.filter(updated_at__gte=since))
+        | payment_dates(Payment.objects.filter(pk__in=list(refunded)))
+    )
@@ -0,0 +1,65 @@
+from django.db.models.signals import post_save, post_delete, pre_save, pre_delete
+from django.dispatch import receiver
+from .models import Payment, Refund
+from .rollup import move, payment_state
+
+
+@receiver(pre_save, sender=Payment)
+def remember_payment_state(sender, instance, **kwargs):
+    """Keep the stored rollup contribution so a transition can move it."""
+    instance._rollup_state = None
+    if instance.pk and not instance._state.adding:
+        instance._rollup_state = payment_state(instance.pk)
+
+
+@receiver(post_save, sender=Payment)
+def rollup_payment_on_save(sender, instance, created, **kwargs):
+    move(None if created else instance._rollup_state, payment_state(instance.pk))
+
+
+@receiver(pre_delete, sender=Payment)
+def remember_deleted_payment(sender, instance, **kwargs):
+    # The payment's refunds are deleted first and take their amounts out
+    # of the rollup themselves, while the payment row still exists
+    instance._rollup_state = payment_state(instance.pk, with_refunds=False)
+
+
+@receiver(post_delete, sender=Payment)
+def rollup_payment_on_delete(sender, instance, **kwargs):
+    move(instance._rollup_state, None)
+
+
+def _completed_amount(status, amount):
+    return amount if status == 'completed' else 0
+
+
+@receiver(pre_save, sender=Refund)
+def remember_refund_state(sender, instance, **kwargs):
+    instance._stored_refund = None
+    if instance.pk and not instance._state.adding:
+        instance._stored_refund = Refund.objects.filter(pk=instance.pk).values_list('payment_id', 'status', 'amount').first()
+
+
+def _apply_refund(payment_id, refunded):
+    """Add ``refunded`` to the rollup row of the payment the refund belongs to."""
+    if not refunded:
+        return
+    state = payment_state(payment_id)
+    if state is not None:
+        key, _ = state
+        move(None, (key, (0, 0, refunded)))
+
+
+@receiver(post_save, sender=Refund)
+def rollup_refund_on_save(sender, instance, created, **kwargs):
+    stored = None if created else instance._stored_refund
+    if stored is not None and stored[0] != instance.payment_id:
+        _apply_refund(stored[0], -_completed_amount(stored[1], stored[2]))
+        stored = None
+    previous = _completed_amount(stored[1], stored[2]) if stored else 0
+    _apply_refund(instance.payment_id, _completed_amount(instance.status, instance.amount) - previous)
+
+
+@receiver(post_delete, sender=Refund)
+def rollup_refund_on_delete(sender, instance, **kwargs):
+    _apply_refund(instance.payment_id, -_completed_amount(instance.status, instance.amount))
@@ -0,0 +1,200 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.businesses.models import Business, BusinessSubscription
+from apps.categories.models import Category
+
+from .models import Payment, PaymentRollup, Refund, Subscription, SubscriptionPlan
+from .renewals import RENEWAL_GRACE, period_start, renew_paid, run_renewals, shift_months
+from .rollup import rebuild
+
+User = get_user_model()
+
+
+def local(*args):
+    return timezone.make_aware(datetime(*args))
+
+
+class PaymentRollupTests(TestCase):
+    """Signal-maintained rollup rows must match a rebuild from the payments table."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='payer', email='payer@example.com', password='x')
+
+    def create_payment(self, **kwargs):
+        values = dict(user=self.user, payment_type='other', amount=Decimal('500.00'), payment_method='upi')
+        values.update(kwargs)
+        return Payment.objects.create(**values)
+
+    def rollup_rows(self):
+        return sorted(
+            PaymentRollup.objects.exclude(payment_count=0, gross_amount=0, refund_amount=0)
+            .values_list('date', 'payment_type', 'payment_method', 'plan', 'status',
+                         'payment_count', 'gross_amount', 'refund_amount')
+        )
+
+    def assertMatchesRebuild(self):
+        incremental = self.rollup_rows()
+        today = timezone.localdate()
+        rebuild(today, today)
+        self.assertEqual(incremental, self.rollup_rows())
+        return incremental
+
+    def test_status_change_moves_the_payment(self):
+        payment = self.create_payment()
+        payment.status = 'completed'
+        payment.paid_at = timezone.now()
+        payment.save()
+
+        rows = self.assertMatchesRebuild()
+        self.assertEqual([row[4] for row in rows], ['completed'])
+        self.assertEqual(rows[0][5:], (1, Decimal('500.00'), Decimal('0.00')))
+
+    def test_refunds_follow_their_status(self):
+        payment = self.create_payment(status='completed', paid_at=timezone.now())
+        refund = Refund.objects.create(payment=payment, amount=Decimal('120.00'), reason='Duplicate')
+        self.assertEqual(self.assertMatchesRebuild()[0][7], Decimal('0.00'))
+
+        refund.status = 'completed'
+        refund.save()
+        self.assertEqual(self.assertMatchesRebuild()[0][7], Decimal('120.00'))
+
+        refund.delete()
+        self.assertEqual(self.assertMatchesRebuild()[0][7], Decimal('0.00'))
+
+    def test_cascading_delete_removes_payments_and_refunds(self):
+        payment = self.create_payment(status='completed', paid_at=timezone.now())
+        Refund.objects.create(payment=payment, amount=Decimal('50.00'), reason='Partial', status='completed')
+        self.create_payment(amount=Decimal('75.00'))
+        other = User.objects.create_user(username='other', email='other@example.com', password='x')
+        self.create_payment(user=other, amount=Decimal('20.00'))
+
+        self.user.delete()
+
+        rows = self.assertMatchesRebuild()
+        self.assertEqual([row[5:] for row in rows], [(1, Decimal('20.00'), Decimal('0.00'))])
+
+
+class PeriodStartTests(TestCase):
+
+    def test_shift_months_clamps_to_the_month_length(self):
+        self.assertEqual(shift_months(local(2026, 1, 31, 10), 1), local(2026, 2, 28, 10))
+        self.assertEqual(shift_months(local(2028, 1, 31, 10), 1), local(2028, 2, 29, 10))
+        self.assertEqual(shift_months(local(2026, 3, 31, 10), -1), local(2026, 2, 28, 10))
+        self.assertEqual(shift_months(local(2026, 12, 15, 10), 1), local(2027, 1, 15, 10))
+
+    def test_period_start_after_a_short_month(self):
+        start = local(2026, 1, 31, 10)
+        self.assertEqual(period_start(start, local(2026, 3, 15, 12)), local(2026, 2, 28, 10))
+        self.assertEqual(period_start(start, local(2026, 3, 31, 9)), local(2026, 2, 28, 10))
+        self.assertEqual(period_start(start, local(2026, 3, 31, 11)), local(2026, 3, 31, 10))
+
+    def test_period_start_before_the_anchor_day_in_the_month(self):
+        start = local(2026, 1, 20, 10)
+        self.assertEqual(period_start(start, local(2026, 4, 5)), local(2026, 3, 20, 10))
+        self.assertEqual(period_start(start, local(2026, 1, 25)), start)
+
+    def test_period_start_of_a_future_start(self):
+        start = local(2026, 6, 1)
+        self.assertEqual(period_start(start, local(2026, 5, 1)), start)
+
+    def test_longer_periods(self):
+        start = local(2025, 11, 30, 10)
+        self.assertEqual(period_start(start, local(2026, 3, 1), months=3), local(2026, 2, 28, 10))
+        self.assertEqual(period_start(start, local(2026, 2, 27), months=3), start)
+
+
+class RenewalTests(TestCase):
+    """Subscriptions are billed when due and extended only once the payment completes."""
+
+    def setUp(self):
+        self.now = timezone.now()
+        user = User.objects.create_user(username='owner', email='owner@example.com', password='x')
+        category = Category.objects.create(name='Food', slug='food')
+        business = Business.objects.create(
+            name='Pizza Place', slug='pizza-place', description='Pizza', business_type='service',
+            category=category, owner=user, phone_number='+919876543210', email='pizza@example.com',
+            address_line_1='1 Main Road', city='Pune', state='MH', pincode='411001',
+        )
+        plan = SubscriptionPlan.objects.create(
+            name='Gold', plan_type='gold', description='Gold', price=Decimal('999.00'), billing_cycle='monthly'
+        )
+        self.end_date = self.now - timedelta(hours=1)
+        self.subscription = Subscription.objects.create(
+            user=user, business=business, plan=plan, start_date=shift_months(self.end_date, -1),
+            end_date=self.end_date, used_lead_credits=4, credits_reset_at=self.now - timedelta(days=1),
+        )
+        self.business_subscription = BusinessSubscription.objects.create(
+            business=business, plan=plan, start_date=self.subscription.start_date, end_date=self.end_date,
+        )
+
+    def run_renewals(self):
+        return run_renewals(timezone.now())
+
+    def set_payment_status(self, status):
+        payment = Payment.objects.get(subscription=self.subscription)
+        payment.status = status
+        payment.save()
+
+    def assertNotExtended(self, status='active'):
+        self.subscription.refresh_from_db()
+        self.assertEqual(self.subscription.end_date, self.end_date)
+        self.assertEqual(self.subscription.used_lead_credits, 4)
+        self.assertEqual(self.subscription.status, status)
+
+    def test_due_subscription_is_billed_once_and_not_extended(self):
+        counts = self.run_renewals()
+
+        self.assertEqual((counts['renewed'], counts['billed'], counts['expired']), (0, 1, 0))
+        payment = Payment.objects.get(subscription=self.subscription)
+        self.assertEqual((payment.status, payment.amount), ('pending', Decimal('999.00')))
+        self.assertNotExtended()
+
+        counts = self.run_renewals()
+        self.assertEqual((counts['renewed'], counts['billed'], counts['expired']), (0, 0, 0))
+        self.assertEqual(Payment.objects.filter(subscription=self.subscription).count(), 1)
+
+    def test_completed_payment_extends_the_subscription(self):
+        self.run_renewals()
+        self.set_payment_status('completed')
+
+        counts = self.run_renewals()
+
+        self.assertEqual((counts['renewed'], counts['billed'], counts['expired']), (1, 0, 0))
+        self.subscription.refresh_from_db()
+        self.business_subscription.refresh_from_db()
+        self.assertEqual(self.subscription.end_date, shift_months(self.end_date, 1))
+        self.assertEqual(self.subscription.used_lead_credits, 0)
+        self.assertEqual(self.business_subscription.end_date, self.subscription.end_date)
+        self.assertEqual(self.run_renewals()['renewed'], 0)
+
+    def test_renew_paid_for_selected_subscriptions(self):
+        self.run_renewals()
+        self.set_payment_status('completed')
+
+        self.assertEqual(renew_paid(subscription_ids=[self.subscription.pk + 1]), 0)
+        self.assertEqual(renew_paid(subscription_ids=[self.subscription.pk]), 1)
+
+    def test_failed_payment_expires_the_subscription(self):
+        self.run_renewals()
+        self.set_payment_status('failed')
+
+        counts = self.run_renewals()
+
+        self.assertEqual((counts['renewed'], counts['billed'], counts['expired']), (0, 0, 1))
+        self.assertNotExtended(status='expired')
+
+    def test_unpaid_subscription_expires_after_the_grace_period(self):
+        self.run_renewals()
+        self.end_date = timezone.now() - RENEWAL_GRACE - timedelta(minutes=1)
+        Subscription.objects.filter(pk=self.subscription.pk).update(end_date=self.end_date)
+        Payment.objects.filter(subscription=self.subscription).update(created_at=self.end_date)
+
+        counts = self.run_renewals()
+
+        self.assertEqual((counts['renewed'], counts['billed'], counts['expired']), (0, 0, 1))
+        self.assertNotExtended(status='expired')
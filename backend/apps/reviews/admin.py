@@ -1,6 +1,10 @@
 from django.contrib import admin
+from django.utils import timezone
 from django.utils.html import format_html
+from apps.core.admin import AnnotatedCountAdminMixin
 from .models import Review, ReviewReply, ReviewImage, ReviewHelpful, ReviewReport
+from .moderation import approve_reviews, open_report_count, reject_reviews
+from .stats import attach_review_stats
 
 
 class ReviewImageInline(admin.TabularInline):
@@ -9,18 +13,43 @@ class ReviewImageInline(admin.TabularInline):
     fields = ('image', 'caption')
 
 
+class ModerationStatusFilter(admin.SimpleListFilter):
+    title = 'moderation status'
+    parameter_name = 'moderation'
+    
+    def lookups(self, request, model_admin):
+        return (
+            ('pending', 'Awaiting moderation'),
+            ('approved', 'Approved'),
+            ('rejected', 'Rejected'),
+        )
+    
+    def queryset(self, request, queryset):
+        if self.value() == 'pending':
+            return queryset.filter(is_approved=False, rejected_at__isnull=True)
+        if self.value() == 'approved':
+            return queryset.filter(is_approved=True)
+        if self.value() == 'rejected':
+            return queryset.filter(rejected_at__isnull=False)
+        return queryset
+
+
 @admin.register(Review)
-class ReviewAdmin(admin.ModelAdmin):
+class ReviewAdmin(AnnotatedCountAdminMixin, admin.ModelAdmin):
     list_display = (
-        'business', 'user', 'rating', 'is_approved', 'is_featured',
-        'is_verified_purchase', 'created_at'
+        'business', 'user', 'rating', 'business_rating', 'open_reports', 'helpful_count',
+        'not_helpful_count', 'is_approved', 'is_featured', 'is_verified_purchase', 'created_at'
     )
+    list_select_related = ('business', 'user')
     list_filter = (
-        'rating', 'is_approved', 'is_featured', 'is_verified_purchase',
+        ModerationStatusFilter, 'rating', 'is_approved', 'is_featured', 'is_verified_purchase',
         'created_at', 'business__category'
     )
+    count_annotations = {
+        'open_reports': open_report_count(),
+    }
     search_fields = ('business__name', 'user__email', 'title', 'comment')
-    readonly_fields = ('created_at', 'updated_at')
+    readonly_fields = ('helpful_count', 'not_helpful_count', 'helpful_rank', 'created_at', 'updated_at')
     inlines = [ReviewImageInline]
     
     fieldsets = (
@@ -32,7 +61,14 @@ class ReviewAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
         ('Status', {
-            'fields': ('is_approved', 'is_featured', 'is_verified_purchase', 'approved_at', 'approved_by')
+            'fields': (
+                'is_approved', 'is_featured', 'is_verified_purchase', 'approved_at', 'approved_by',
+                'rejected_at', 'rejection_reason'
+            )
+        }),
+        ('Helpful Votes', {
+            'fields': ('helpful_count', 'not_helpful_count', 'helpful_rank'),
+            'classes': ('collapse',)
         }),
         ('Timestamps', {
             'fields': ('created_at', 'updated_at'),
@@ -42,19 +78,34 @@ class ReviewAdmin(admin.ModelAdmin):
     
     actions = ['approve_reviews', 'disapprove_reviews', 'feature_reviews']
     
+    def get_changelist_instance(self, request):
+        changelist = super().get_changelist_instance(request)
+        attach_review_stats([review.business for review in changelist.result_list])
+        return changelist
+    
+    def open_reports(self, obj):
+        return getattr(obj, '_open_reports', None)
+    open_reports.short_description = 'Open Reports'
+    open_reports.admin_order_field = '_open_reports'
+    
+    def business_rating(self, obj):
+        stats = obj.business.review_stats
+        return f"{stats['average_rating']:.1f} ({stats['review_count']})"
+    business_rating.short_description = 'Business Rating'
+    
     def approve_reviews(self, request, queryset):
-        queryset.update(is_approved=True, approved_by=request.user)
-        self.message_user(request, f"{queryset.count()} reviews approved.")
+        approved = approve_reviews(queryset, request.user)
+        self.message_user(request, f"{approved} reviews approved.")
     approve_reviews.short_description = "Approve selected reviews"
     
     def disapprove_reviews(self, request, queryset):
-        queryset.update(is_approved=False)
-        self.message_user(request, f"{queryset.count()} reviews disapproved.")
-    disapprove_reviews.short_description = "Disapprove selected reviews"
+        rejected = reject_reviews(queryset, request.user)
+        self.message_user(request, f"{rejected} reviews rejected.")
+    disapprove_reviews.short_description = "Reject selected reviews"
     
     def feature_reviews(self, request, queryset):
-        queryset.update(is_featured=True)
-        self.message_user(request, f"{queryset.count()} reviews featured.")
+        featured = queryset.update(is_featured=True, updated_at=timezone.now())
+        self.message_user(request, f"{featured} reviews featured.")
     feature_reviews.short_description = "Feature selected reviews"
 
 
@@ -90,6 +141,9 @@ class ReviewReportAdmin(admin.ModelAdmin):
     actions = ['resolve_reports']
     
     def resolve_reports(self, request, queryset):
-        queryset.update(is_resolved=True, resolved_by=request.user)
-        self.message_user(request, f"{queryset.count()} reports resolved.")
+        now = timezone.now()
+        resolved = queryset.filter(is_resolved=False).update(
+            is_resolved=True, resolved_by=request.user, resolved_at=now, updated_at=now
+        )
+        self.message_user(request, f"{resolved} reports resolved.")
     resolve_reports.short_description = "Resolve selected reports"
\ No newline at end of file
@@ -4,4 +4,7 @@ from django.apps import AppConfig
 class ReviewsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.reviews'
-    verbose_name = 'Reviews'
\ No newline at end of file
+    verbose_name = 'Reviews'
+    
+    def ready(self):
+        import apps.reviews.signals
\ No newline at end of file
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['business', 'is_approved', 'created_at', 'id'], name='reviews_rev_busines_74ae91_idx'),
+        ),
+    ]
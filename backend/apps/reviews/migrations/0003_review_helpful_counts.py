@@ -0,0 +1,61 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:05
+
+import math
+
+from django.db import migrations, models
+
+
+def populate_helpful_counts(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    ReviewHelpful = apps.get_model('reviews', 'ReviewHelpful')
+    
+    counts = {}
+    votes = (
+        ReviewHelpful.objects.order_by()
+        .values_list('review_id', 'is_helpful')
+        .annotate(total=models.Count('id'))
+    )
+    for review_id, is_helpful, total in votes:
+        counts.setdefault(review_id, [0, 0])[0 if is_helpful else 1] = total
+    
+    z = 1.96
+    reviews = list(Review.objects.filter(pk__in=list(counts)).only('id'))
+    for review in reviews:
+        positive, negative = counts[review.pk]
+        total = positive + negative
+        review.helpful_count = positive
+        review.not_helpful_count = negative
+        review.helpful_rank = (
+            positive + z * z / 2 - z * math.sqrt(positive * negative / total + z * z / 4)
+        ) / (total + z * z)
+    Review.objects.bulk_update(reviews, ['helpful_count', 'not_helpful_count', 'helpful_rank'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0002_review_listing_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='helpful_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of helpful votes'),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='not_helpful_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of not helpful votes'),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='helpful_rank',
+            field=models.FloatField(default=0, help_text='Wilson score lower bound of the helpful votes, used for ranking'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['business', 'is_approved', 'helpful_rank', 'id'], name='reviews_rev_busines_6f2f68_idx'),
+        ),
+        migrations.RunPython(populate_helpful_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_review_helpful_counts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='rejected_at',
+            field=models.DateTimeField(blank=True, help_text='Date when review was rejected by a moderator', null=True),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='rejection_reason',
+            field=models.CharField(blank=True, help_text='Why the review was rejected (internal)', max_length=255),
+        ),
+    ]
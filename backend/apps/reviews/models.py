@@ -1,11 +1,35 @@
 from django.db import models
+from django.db.models import ExpressionWrapper, F, FloatField, OuterRef, Value
+from django.db.models.functions import Cast, Greatest, Sqrt
 from django.contrib.auth import get_user_model
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.utils import timezone
+from apps.core.expressions import SubqueryCount
 from apps.core.models import TimeStampedModel
 from apps.businesses.models import Business
 
 User = get_user_model()
 
+# z for a 95% confidence interval
+WILSON_Z = 1.96
+
+
+def wilson_score(positive, negative, z=WILSON_Z):
+    """Lower bound of the Wilson score interval, as a database expression.
+    
+    ``positive`` and ``negative`` are expressions (e.g. ``F()`` plus a
+    delta). With no votes the score is 0; it approaches the helpful share
+    as votes accumulate, so one lucky vote does not outrank many good ones.
+    """
+    positive = Cast(positive, FloatField())
+    negative = Cast(negative, FloatField())
+    total = positive + negative
+    return ExpressionWrapper(
+        (positive + Value(z * z / 2) - Value(z) * Sqrt(positive * negative / Greatest(total, Value(1.0)) + Value(z * z / 4)))
+        / (total + Value(z * z)),
+        output_field=FloatField(),
+    )
+
 
 class Review(TimeStampedModel):
     """Customer reviews for businesses."""
@@ -27,6 +51,8 @@ class Review(TimeStampedModel):
         User, on_delete=models.SET_NULL, null=True, blank=True,
         related_name='approved_reviews', help_text="Admin who approved this review"
     )
+    rejected_at = models.DateTimeField(null=True, blank=True, help_text="Date when review was rejected by a moderator")
+    rejection_reason = models.CharField(max_length=255, blank=True, help_text="Why the review was rejected (internal)")
     
     # Additional fields
     service_quality = models.PositiveIntegerField(
@@ -49,14 +75,46 @@ class Review(TimeStampedModel):
     # Verification
     is_verified_purchase = models.BooleanField(default=False, help_text="Whether this review is from a verified customer")
     
+    # Helpful votes, maintained from ReviewHelpful
+    helpful_count = models.PositiveIntegerField(default=0, help_text="Number of helpful votes")
+    not_helpful_count = models.PositiveIntegerField(default=0, help_text="Number of not helpful votes")
+    helpful_rank = models.FloatField(default=0, help_text="Wilson score lower bound of the helpful votes, used for ranking")
+    
     class Meta:
         verbose_name = 'Review'
         verbose_name_plural = 'Reviews'
         ordering = ['-created_at']
         unique_together = ['business', 'user']  # One review per user per business
+        indexes = [
+            models.Index(fields=['business', 'is_approved', 'created_at', 'id']),
+            models.Index(fields=['business', 'is_approved', 'helpful_rank', 'id']),
+        ]
     
     def __str__(self):
         return f"{self.user.email} - {self.business.name} ({self.rating}/5)"
+    
+    @classmethod
+    def record_helpful_votes(cls, review_id, helpful=0, not_helpful=0):
+        """Apply vote deltas and the new rank in a single UPDATE."""
+        helpful_count = Greatest(F('helpful_count') + helpful, Value(0))
+        not_helpful_count = Greatest(F('not_helpful_count') + not_helpful, Value(0))
+        return cls.objects.filter(pk=review_id).update(
+            helpful_count=helpful_count,
+            not_helpful_count=not_helpful_count,
+            helpful_rank=wilson_score(helpful_count, not_helpful_count),
+            updated_at=timezone.now(),
+        )
+    
+    @classmethod
+    def recalculate_helpful_counts(cls, reviews=None):
+        """Rebuild vote counters and ranks from ``ReviewHelpful`` rows."""
+        reviews = reviews if reviews is not None else cls.objects.all()
+        votes = ReviewHelpful.objects.filter(review=OuterRef('pk'))
+        reviews.update(
+            helpful_count=SubqueryCount(votes.filter(is_helpful=True).values('pk')),
+            not_helpful_count=SubqueryCount(votes.filter(is_helpful=False).values('pk')),
+        )
+        return reviews.update(helpful_rank=wilson_score(F('helpful_count'), F('not_helpful_count')))
 
 
 class ReviewReply(TimeStampedModel):
@@ -73,6 +131,18 @@ class ReviewReply(TimeStampedModel):
     
     def __str__(self):
         return f"Reply to {self.review}"
+    
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # The reply is served as part of its review; bump the review's
+        # ``updated_at`` so API ETags change with it
+        Review.objects.filter(pk=self.review_id).update(updated_at=timezone.now())
+    
+    def delete(self, *args, **kwargs):
+        review_id = self.review_id
+        result = super().delete(*args, **kwargs)
+        Review.objects.filter(pk=review_id).update(updated_at=timezone.now())
+        return result
 
 
 class ReviewImage(TimeStampedModel):
@@ -0,0 +1,119 @@
+"""Batched review moderation.
+
+``approve_reviews`` and ``reject_reviews`` moderate any number of reviews in
+one transaction:
+
+- one UPDATE for the reviews and one for their open reports;
+- the affected businesses' review stats are recomputed with one grouped
+  query and their health status written back with one ``bulk_update``;
+- notifications for approved reviews are created in bulk (``review_approved``
+  to the reviewer, ``review_submitted`` to the business owner) through the
+  notification outbox.
+
+``moderation_queue`` lists reviews awaiting a decision, most reported first.
+"""
+from django.db import transaction
+from django.db.models import OuterRef
+from django.utils import timezone
+
+from apps.businesses.models import Business
+from apps.core.expressions import SubqueryCount
+from apps.notifications.fanout import notify_each
+from .models import Review, ReviewReport
+from .stats import compute_review_stats, invalidate_review_stats
+
+NOTIFY_CHANNELS = ('email', 'in_app')
+
+
+def open_report_count():
+    return SubqueryCount(ReviewReport.objects.filter(review=OuterRef('pk'), is_resolved=False).values('pk'))
+
+
+def moderation_queue():
+    """Reviews neither approved nor rejected, most open reports first, then oldest first."""
+    return (
+        Review.objects.filter(is_approved=False, rejected_at__isnull=True)
+        .annotate(open_reports=open_report_count())
+        .select_related('business', 'user')
+        .order_by('-open_reports', 'created_at', 'id')
+    )
+
+
+def refresh_businesses(business_ids):
+    """Drop cached review stats and recompute health status for ``business_ids``."""
+    business_ids = list(dict.fromkeys(business_ids))
+    if not business_ids:
+        return []
+    invalidate_review_stats(business_ids)
+    stats = compute_review_stats(business_ids)
+    businesses = list(Business.objects.filter(pk__in=business_ids))
+    now = timezone.now()
+    for business in businesses:
+        business._review_stats = stats[business.pk]
+        business.calculate_health_status()
+        business.updated_at = now
+    Business.objects.bulk_update(businesses, ['health_status', 'updated_at'], batch_size=500)
+    return businesses
+
+
+def _resolve_reports(review_ids, moderator, now):
+    return ReviewReport.objects.filter(review_id__in=review_ids, is_resolved=False).update(
+        is_resolved=True, resolved_by=moderator, resolved_at=now, updated_at=now
+    )
+
+
+def approve_reviews(reviews, moderator, notify=True):
+    """Approve the pending reviews among ``reviews`` (a queryset); returns how many."""
+    now = timezone.now()
+    with transaction.atomic():
+        rows = list(
+            reviews.filter(is_approved=False).select_for_update(of=('self',)).order_by()
+            .values_list('pk', 'business_id', 'user_id', 'rating', 'title', 'business__name', 'business__owner_id')
+        )
+        if not rows:
+            return 0
+        review_ids = [row[0] for row in rows]
+        Review.objects.filter(pk__in=review_ids).update(
+            is_approved=True, approved_at=now, approved_by=moderator,
+            rejected_at=None, rejection_reason='', updated_at=now
+        )
+        _resolve_reports(review_ids, moderator, now)
+        refresh_businesses(row[1] for row in rows)
+        if notify:
+            _notify_approved(rows)
+    return len(rows)
+
+
+def reject_reviews(reviews, moderator, reason=''):
+    """Reject ``reviews`` (a queryset), unpublishing approved ones; returns how many."""
+    now = timezone.now()
+    with transaction.atomic():
+        rows = list(
+            reviews.filter(rejected_at__isnull=True).select_for_update(of=('self',)).order_by()
+            .values_list('pk', 'business_id', 'is_approved')
+        )
+        if not rows:
+            return 0
+        review_ids = [row[0] for row in rows]
+        Review.objects.filter(pk__in=review_ids).update(
+            is_approved=False, is_featured=False, rejected_at=now,
+            rejection_reason=reason, updated_at=now
+        )
+        _resolve_reports(review_ids, moderator, now)
+        # Only unpublished reviews change what businesses show
+        refresh_businesses(row[1] for row in rows if row[2])
+    return len(rows)
+
+
+def _notify_approved(rows):
+    reviewers = []
+    owners = []
+    for review_id, business_id, user_id, rating, title, business_name, owner_id in rows:
+        context = {'business_name': business_name, 'rating': rating, 'review_title': title}
+        data = {'review_id': review_id, 'business_id': business_id}
+        reviewers.append((user_id, context, data))
+        if owner_id != user_id:
+            owners.append((owner_id, context, data))
+    for channel in NOTIFY_CHANNELS:
+        notify_each('review_approved', channel, reviewers)
+        notify_each('review_submitted', channel, owners)
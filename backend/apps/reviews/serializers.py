@@ -0,0 +1,34 @@
+from rest_framework import serializers
+
+from apps.core.serializers import SparseFieldsetMixin
+from .models import Review, ReviewReply
+
+
+class ReviewReplySerializer(serializers.ModelSerializer):
+    
+    class Meta:
+        model = ReviewReply
+        fields = ('message', 'created_at')
+        read_only_fields = fields
+
+
+class ReviewSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    business_slug = serializers.SlugField(source='business.slug', read_only=True)
+    user_name = serializers.CharField(source='user.full_name', read_only=True)
+    reply = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = Review
+        fields = (
+            'id', 'business', 'business_slug', 'user_name', 'rating', 'title', 'comment',
+            'service_quality', 'value_for_money', 'communication', 'timeliness',
+            'is_featured', 'is_verified_purchase', 'helpful_count', 'not_helpful_count',
+            'reply', 'created_at', 'updated_at'
+        )
+        read_only_fields = fields
+    
+    def get_reply(self, obj):
+        reply = getattr(obj, 'reply', None)
+        if reply is None or not reply.is_approved:
+            return None
+        return ReviewReplySerializer(reply).data
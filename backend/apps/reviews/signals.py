@@ -0,0 +1,56 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+from apps.businesses.models import Business
+from apps.core.freshness import touch_on_change
+from .models import Review, ReviewHelpful
+from .stats import invalidate_review_stats
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def refresh_business_review_stats(sender, instance, **kwargs):
+    """Approval, rating edits and deletes change the business's review stats."""
+    invalidate_review_stats([instance.business_id])
+
+
+# Reviews show the business slug and the reviewer's name
+touch_on_change(Business, ('slug',), lambda business: Review.objects.filter(business_id=business.pk))
+touch_on_change(get_user_model(), ('first_name', 'last_name'), lambda user: Review.objects.filter(user_id=user.pk))
+
+
+def _vote_deltas(is_helpful, sign):
+    return {'helpful': sign, 'not_helpful': 0} if is_helpful else {'helpful': 0, 'not_helpful': sign}
+
+
+def _refresh_vote_stats(review_id):
+    business_id = Review.objects.filter(pk=review_id).values_list('business_id', flat=True).first()
+    if business_id:
+        invalidate_review_stats([business_id])
+
+
+@receiver(pre_save, sender=ReviewHelpful)
+def remember_vote(sender, instance, **kwargs):
+    """Keep the stored vote so a flip can move it between the two counters."""
+    instance._stored_vote = None
+    if instance.pk and not instance._state.adding:
+        instance._stored_vote = ReviewHelpful.objects.filter(pk=instance.pk).values_list('is_helpful', flat=True).first()
+
+
+@receiver(post_save, sender=ReviewHelpful)
+def count_vote_on_save(sender, instance, created, **kwargs):
+    stored = None if created else instance._stored_vote
+    if stored == instance.is_helpful:
+        return
+    deltas = _vote_deltas(instance.is_helpful, 1)
+    if stored is not None:
+        for key, value in _vote_deltas(stored, -1).items():
+            deltas[key] += value
+    Review.record_helpful_votes(instance.review_id, **deltas)
+    _refresh_vote_stats(instance.review_id)
+
+
+@receiver(post_delete, sender=ReviewHelpful)
+def count_vote_on_delete(sender, instance, **kwargs):
+    Review.record_helpful_votes(instance.review_id, **_vote_deltas(instance.is_helpful, -1))
+    _refresh_vote_stats(instance.review_id)
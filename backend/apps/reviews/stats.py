@@ -0,0 +1,117 @@
+"""Approved-review statistics per business.
+
+``get_review_stats(business_ids)`` returns, for each business, the approved
+review count and average, a 1-5 rating histogram, the averages of the four
+sub-ratings and the helpful / not-helpful vote totals. Businesses missing
+from the cache are computed together in one grouped query over ``Review``
+and cached per business under a key that includes ``Business.updated_at``;
+approving, unapproving, editing or deleting a review (and voting on one)
+calls ``invalidate_review_stats``, which bumps that column. The key is
+therefore derived from the database, and a change made by one process is
+seen by all of them even when the cache backend is per-process.
+
+``attach_review_stats`` sets the stats on a page of ``Business`` objects so
+``Business.average_rating`` / ``review_count`` read them without a query.
+"""
+from django.core.cache import cache
+from django.db.models import Avg, Count, Q, Sum
+from django.utils import timezone
+
+from apps.businesses.models import Business
+from .models import Review
+
+CACHE_TIMEOUT = 60 * 60 * 6
+SUB_RATINGS = ('service_quality', 'value_for_money', 'communication', 'timeliness')
+RATINGS = range(1, 6)
+
+
+def cache_key(business_id, updated_at):
+    return f'review_stats:{business_id}:{updated_at.timestamp() if updated_at else 0}'
+
+
+def empty_stats():
+    return {
+        'review_count': 0,
+        'average_rating': 0,
+        'histogram': {rating: 0 for rating in RATINGS},
+        'sub_ratings': {name: None for name in SUB_RATINGS},
+        'helpful_votes': 0,
+        'not_helpful_votes': 0,
+    }
+
+
+def compute_review_stats(business_ids):
+    """Compute stats for ``business_ids`` in one grouped query, bypassing the cache."""
+    stats = {business_id: empty_stats() for business_id in business_ids}
+    if not stats:
+        return stats
+    rows = (
+        Review.objects.filter(business_id__in=list(stats), is_approved=True)
+        .order_by().values('business_id')
+        .annotate(
+            review_count=Count('pk'),
+            average_rating=Avg('rating'),
+            helpful_votes=Sum('helpful_count'),
+            not_helpful_votes=Sum('not_helpful_count'),
+            **{f'rating_{rating}': Count('pk', filter=Q(rating=rating)) for rating in RATINGS},
+            **{f'avg_{name}': Avg(name) for name in SUB_RATINGS},
+        )
+    )
+    for row in rows:
+        stats[row['business_id']] = {
+            'review_count': row['review_count'],
+            'average_rating': round(row['average_rating'], 2),
+            'histogram': {rating: row[f'rating_{rating}'] for rating in RATINGS},
+            'sub_ratings': {
+                name: round(row[f'avg_{name}'], 2) if row[f'avg_{name}'] is not None else None
+                for name in SUB_RATINGS
+            },
+            'helpful_votes': row['helpful_votes'] or 0,
+            'not_helpful_votes': row['not_helpful_votes'] or 0,
+        }
+    return stats
+
+
+def get_review_stats(business_ids, versions=None):
+    """Return ``{business_id: stats}``, computing only what the cache lacks.
+    
+    ``versions`` maps business ids to their ``updated_at``; it is read from
+    the database (one query) when not given.
+    """
+    business_ids = [business_id for business_id in dict.fromkeys(business_ids) if business_id is not None]
+    if versions is None:
+        versions = dict(Business.objects.filter(pk__in=business_ids).values_list('pk', 'updated_at'))
+    keys = {business_id: cache_key(business_id, versions.get(business_id)) for business_id in business_ids}
+    cached = cache.get_many(list(keys.values()))
+    stats = {}
+    missing = []
+    for business_id, key in keys.items():
+        value = cached.get(key)
+        if value is None:
+            missing.append(business_id)
+        else:
+            stats[business_id] = value
+    if missing:
+        computed = compute_review_stats(missing)
+        cache.set_many({keys[business_id]: value for business_id, value in computed.items()}, CACHE_TIMEOUT)
+        stats.update(computed)
+    return stats
+
+
+def attach_review_stats(businesses):
+    """Load stats for a page of businesses at once and set them on each instance."""
+    businesses = [business for business in businesses if business is not None]
+    stats = get_review_stats(
+        [business.pk for business in businesses],
+        versions={business.pk: business.updated_at for business in businesses},
+    )
+    for business in businesses:
+        business._review_stats = stats.get(business.pk) or empty_stats()
+    return businesses
+
+
+def invalidate_review_stats(business_ids):
+    """Bump ``Business.updated_at``, which moves both the stats cache key and API ETags."""
+    business_ids = list(dict.fromkeys(business_ids))
+    if business_ids:
+        Business.objects.filter(pk__in=business_ids).update(updated_at=timezone.now())
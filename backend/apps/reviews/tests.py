@@ -0,0 +1,142 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from apps.businesses.models import Business
+from apps.categories.models import Category
+from apps.notifications.models import Notification, NotificationTemplate
+from .models import Review, ReviewHelpful, ReviewReport
+from .moderation import approve_reviews, moderation_queue, reject_reviews
+
+User = get_user_model()
+
+
+class HelpfulVoteTests(TestCase):
+    """Vote counters kept by the ``ReviewHelpful`` signals must match a recount."""
+
+    def setUp(self):
+        owner = User.objects.create_user(username='owner', email='owner@example.com', password='x')
+        category = Category.objects.create(name='Food', slug='food')
+        business = Business.objects.create(
+            name='Pizza Place', slug='pizza-place', description='Pizza', business_type='service',
+            category=category, owner=owner, phone_number='+919876543210', email='pizza@example.com',
+            address_line_1='1 Main Road', city='Pune', state='MH', pincode='411001',
+        )
+        author = User.objects.create_user(username='author', email='author@example.com', password='x')
+        self.review = Review.objects.create(business=business, user=author, rating=4, comment='Good', is_approved=True)
+        self.voters = [
+            User.objects.create_user(username=f'voter{i}', email=f'voter{i}@example.com', password='x')
+            for i in range(3)
+        ]
+
+    def counts(self):
+        review = Review.objects.get(pk=self.review.pk)
+        return review.helpful_count, review.not_helpful_count, review.helpful_rank
+
+    def assertMatchesRecount(self, helpful, not_helpful):
+        stored = self.counts()
+        self.assertEqual(stored[:2], (helpful, not_helpful))
+        Review.recalculate_helpful_counts(Review.objects.filter(pk=self.review.pk))
+        self.assertEqual(self.counts(), stored)
+
+    def test_votes_are_counted(self):
+        ReviewHelpful.objects.create(review=self.review, user=self.voters[0], is_helpful=True)
+        ReviewHelpful.objects.create(review=self.review, user=self.voters[1], is_helpful=True)
+        ReviewHelpful.objects.create(review=self.review, user=self.voters[2], is_helpful=False)
+        self.assertMatchesRecount(2, 1)
+
+    def test_flipping_a_vote_moves_it_between_counters(self):
+        vote = ReviewHelpful.objects.create(review=self.review, user=self.voters[0], is_helpful=True)
+        rank_when_helpful = self.counts()[2]
+
+        vote.is_helpful = False
+        vote.save()
+        self.assertMatchesRecount(0, 1)
+        self.assertLess(self.counts()[2], rank_when_helpful)
+
+        vote.is_helpful = True
+        vote.save()
+        self.assertMatchesRecount(1, 0)
+
+    def test_saving_an_unchanged_vote_keeps_the_counters(self):
+        vote = ReviewHelpful.objects.create(review=self.review, user=self.voters[0], is_helpful=False)
+        vote.save()
+        self.assertMatchesRecount(0, 1)
+
+    def test_deleting_a_vote_uncounts_it(self):
+        vote = ReviewHelpful.objects.create(review=self.review, user=self.voters[0], is_helpful=True)
+        ReviewHelpful.objects.create(review=self.review, user=self.voters[1], is_helpful=False)
+        vote.delete()
+        self.assertMatchesRecount(0, 1)
+
+    def test_counters_never_go_negative(self):
+        Review.record_helpful_votes(self.review.pk, helpful=-1, not_helpful=-1)
+        self.assertEqual(self.counts()[:2], (0, 0))
+
+
+class ModerationTests(TestCase):
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', email='owner@example.com', password='x')
+        self.moderator = User.objects.create_user(username='mod', email='mod@example.com', password='x', is_staff=True)
+        category = Category.objects.create(name='Food', slug='food')
+        self.business = Business.objects.create(
+            name='Pizza Place', slug='pizza-place', description='Pizza', business_type='service',
+            category=category, owner=self.owner, phone_number='+919876543210', email='pizza@example.com',
+            address_line_1='1 Main Road', city='Pune', state='MH', pincode='411001',
+        )
+        self.authors = [
+            User.objects.create_user(username=f'author{i}', email=f'author{i}@example.com', password='x')
+            for i in range(3)
+        ]
+        self.reviews = [
+            Review.objects.create(business=self.business, user=author, rating=4, comment='Good')
+            for author in self.authors
+        ]
+        for event_type in ('review_approved', 'review_submitted'):
+            NotificationTemplate.objects.create(
+                name=event_type, notification_type='in_app', event_type=event_type,
+                subject='Review', content='{{ business_name }}'
+            )
+
+    def report(self, review, count):
+        for i in range(count):
+            reporter = User.objects.create_user(
+                username=f'reporter{review.pk}-{i}', email=f'reporter{review.pk}-{i}@example.com', password='x'
+            )
+            ReviewReport.objects.create(review=review, reported_by=reporter, reason='spam')
+
+    def test_queue_puts_the_most_reported_first(self):
+        self.report(self.reviews[2], 2)
+        self.report(self.reviews[1], 1)
+
+        queue = list(moderation_queue())
+
+        self.assertEqual(queue, [self.reviews[2], self.reviews[1], self.reviews[0]])
+        self.assertEqual([review.open_reports for review in queue], [2, 1, 0])
+
+    def test_approve_publishes_resolves_reports_and_notifies(self):
+        self.report(self.reviews[0], 1)
+        selection = Review.objects.filter(pk__in=[self.reviews[0].pk, self.reviews[1].pk])
+
+        self.assertEqual(approve_reviews(selection, self.moderator), 2)
+        self.assertEqual(approve_reviews(selection, self.moderator), 0)
+
+        self.assertEqual(list(moderation_queue()), [self.reviews[2]])
+        self.assertFalse(ReviewReport.objects.filter(is_resolved=False).exists())
+        self.assertEqual(
+            Notification.objects.filter(recipient__in=self.authors[:2], template__event_type='review_approved').count(), 2
+        )
+        self.assertEqual(
+            Notification.objects.filter(recipient=self.owner, template__event_type='review_submitted').count(), 2
+        )
+
+    def test_reject_unpublishes_and_leaves_the_queue(self):
+        approve_reviews(Review.objects.filter(pk=self.reviews[0].pk), self.moderator, notify=False)
+        selection = Review.objects.filter(pk__in=[self.reviews[0].pk, self.reviews[1].pk])
+
+        self.assertEqual(reject_reviews(selection, self.moderator, reason='Off topic'), 2)
+        self.assertEqual(reject_reviews(selection, self.moderator), 0)
+
+        rejected = Review.objects.filter(pk__in=[self.reviews[0].pk, self.reviews[1].pk])
+        self.assertEqual(set(rejected.values_list('is_approved', 'rejection_reason')), {(False, 'Off topic')})
+        self.assertEqual(list(moderation_queue()), [self.reviews[2]])
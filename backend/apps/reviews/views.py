@@ -0,0 +1,31 @@
+from apps.core.views import CachedReadOnlyViewSet
+from .models import Review
+from .serializers import ReviewSerializer
+
+
+class ReviewViewSet(CachedReadOnlyViewSet):
+    """Approved reviews of active businesses, newest first.
+    
+    Filters: ``?business=<slug>`` and ``?rating=``. ``?ordering=helpful``
+    pages by the stored helpful rank instead, which for one business is
+    read straight off the ``(business, is_approved, helpful_rank, id)`` index.
+    """
+    serializer_class = ReviewSerializer
+    orderings = {'newest': 'created_at', 'helpful': 'helpful_rank'}
+    
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.cursor_field = self.orderings.get(request.query_params.get('ordering'), self.cursor_field)
+    
+    def get_queryset(self):
+        queryset = Review.objects.filter(
+            is_approved=True, business__is_active=True
+        ).select_related('business', 'user', 'reply')
+        if getattr(self, 'swagger_fake_view', False):
+            return queryset
+        params = self.request.query_params
+        if params.get('business'):
+            queryset = queryset.filter(business__slug=params['business'])
+        if params.get('rating', '').isdigit():
+            queryset = queryset.filter(rating=int(params['rating']))
+        return queryset
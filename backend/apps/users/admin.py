@@ -4,14 +4,16 @@ from django.utils.html import format_html
 from .models import User, UserProfile, UserActivity
 from import_export import resources
 from import_export.admin import ImportExportModelAdmin
+from apps.core.admin import PrefixAutocompleteAdminMixin
 
 class UserResource(resources.ModelResource):
     class Meta:
         model = User
 
 @admin.register(User)
-class UserAdmin(ImportExportModelAdmin, BaseUserAdmin):
+class UserAdmin(PrefixAutocompleteAdminMixin, ImportExportModelAdmin, BaseUserAdmin):
     resource_class = UserResource
+    autocomplete_index = 'users'
 
 
     list_display = ('email', 'username', 'full_name', 'user_type', 'is_active', 'verification_status', 'created_at')
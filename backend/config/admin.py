@@ -11,6 +11,7 @@ from apps.crm.models import Lead, CRMContact, CRMDeal
 from apps.users.models import User
 from apps.reviews.models import Review
 from apps.payments.models import Payment, Subscription
+from apps.payments.reports import mrr, revenue as revenue_report, total_revenue
 
 
 class SearchhAdminSite(AdminSite):
@@ -64,10 +65,9 @@ class SearchhAdminSite(AdminSite):
         approved_reviews = Review.objects.filter(is_approved=True).count()
         
         # Payment statistics
-        total_payments = Payment.objects.filter(status='completed').count()
-        total_revenue = Payment.objects.filter(status='completed').aggregate(
-            total=Sum('amount')
-        )['total'] or 0
+        total_payments = revenue_report(status='completed')['payments'] or 0
+        revenue = total_revenue()
+        monthly_recurring_revenue = mrr()
         
         # Today's activity
         today = date.today()
@@ -108,7 +108,8 @@ class SearchhAdminSite(AdminSite):
                 'total_reviews': total_reviews,
                 'approved_reviews': approved_reviews,
                 'total_payments': total_payments,
-                'total_revenue': total_revenue,
+                'total_revenue': revenue,
+                'mrr': monthly_recurring_revenue,
                 'today_businesses': today_businesses,
                 'today_leads': today_leads,
                 'today_reviews': today_reviews,
@@ -0,0 +1,106 @@
+"""OpenAPI schema for the swagger/redoc pages, generated once and served from a file.
+
+``manage.py generate_api_schema`` writes the JSON schema to
+``settings.API_SCHEMA_FILE`` at deploy time. The schema view serves that
+file's bytes with an ETag (so browsers revalidate with a 304), reloading it
+only when its modification time changes. If the file is missing the schema
+is generated on first request and kept in memory.
+
+In DEBUG the file is ignored, since it goes stale as soon as code changes:
+the schema is generated once per process and ``?refresh=1`` (or
+``invalidate_schema()``) drops it.
+"""
+import hashlib
+import threading
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import quote_etag
+from drf_yasg import openapi
+from drf_yasg.codecs import OpenAPICodecJson
+from drf_yasg.renderers import OpenAPIRenderer, SwaggerJSONRenderer
+from drf_yasg.views import get_schema_view
+from rest_framework import permissions
+
+api_info = openapi.Info(
+    title="API Docs",
+    default_version='v1',
+    description="API documentation",
+)
+
+BaseSchemaView = get_schema_view(
+    api_info,
+    public=True,
+    permission_classes=(permissions.AllowAny,),
+)
+
+_lock = threading.Lock()
+_cached = {'content': None, 'etag': None, 'mtime': None}
+
+
+def generate_schema():
+    """Build the public schema and return it as JSON bytes."""
+    generator = BaseSchemaView.generator_class(api_info, 'v1')
+    return OpenAPICodecJson(validators=[]).encode(generator.get_schema(request=None, public=True))
+
+
+def write_schema_file(path=None):
+    """Generate the schema into ``path`` (default ``API_SCHEMA_FILE``); returns its size."""
+    path = path or settings.API_SCHEMA_FILE
+    content = generate_schema()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    invalidate_schema()
+    return len(content)
+
+
+def invalidate_schema():
+    with _lock:
+        _cached.update(content=None, etag=None, mtime=None)
+
+
+def _file_mtime():
+    try:
+        return settings.API_SCHEMA_FILE.stat().st_mtime
+    except FileNotFoundError:
+        return None
+
+
+def get_schema():
+    """Return ``(content, etag)`` for the current schema."""
+    with _lock:
+        mtime = None if settings.DEBUG else _file_mtime()
+        if _cached['content'] is None or _cached['mtime'] != mtime:
+            if mtime is not None:
+                content = settings.API_SCHEMA_FILE.read_bytes()
+            else:
+                content = generate_schema()
+            _cached.update(
+                content=content,
+                etag=quote_etag(hashlib.md5(content).hexdigest()),
+                mtime=mtime,
+            )
+        return _cached['content'], _cached['etag']
+
+
+class SchemaView(BaseSchemaView):
+    """drf_yasg schema view answering JSON spec requests from ``get_schema``.
+
+    The swagger/redoc HTML pages themselves stay with drf_yasg (they only
+    need the title and version); YAML is still generated per request.
+    """
+
+    def get(self, request, version='', format=None):
+        if not isinstance(request.accepted_renderer, (SwaggerJSONRenderer, OpenAPIRenderer)):
+            return super().get(request, version, format)
+        if settings.DEBUG and request.query_params.get('refresh'):
+            invalidate_schema()
+
+        content, etag = get_schema()
+        if etag in [tag.strip() for tag in request.headers.get('If-None-Match', '').split(',')]:
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(content, content_type=request.accepted_renderer.media_type)
+        response['ETag'] = etag
+        response['Cache-Control'] = 'public, max-age=0, must-revalidate'
+        return response
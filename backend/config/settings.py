@@ -121,6 +121,10 @@ STATIC_URL = '/static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 STATICFILES_DIRS = [BASE_DIR / 'backend' / 'static']
 
+# Pre-generated OpenAPI schema served by /swagger/ and /redoc/
+# (written by `manage.py generate_api_schema`, run after collectstatic)
+API_SCHEMA_FILE = STATIC_ROOT / 'openapi.json'
+
 
 # Media files
 MEDIA_URL = '/media/'
@@ -147,11 +151,19 @@ CKEDITOR_CONFIGS = {
 }
 
 # Email Configuration
-EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.console.EmailBackend')
 EMAIL_HOST = config('EMAIL_HOST', default='localhost')
 EMAIL_PORT = config('EMAIL_PORT', default=587, cast=int)
 EMAIL_USE_TLS = config('EMAIL_USE_TLS', default=True, cast=bool)
 EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
+DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='webmaster@localhost')
+
+# SMS Configuration (dotted path to a class with send(phone, content))
+SMS_PROVIDER = config('SMS_PROVIDER', default='apps.notifications.providers.ConsoleSMSProvider')
+
+# Invoice files (dotted path to a function turning invoice HTML into (content, extension);
+# use 'apps.payments.invoicing.weasyprint_pdf' for PDFs when weasyprint is installed)
+INVOICE_RENDERER = config('INVOICE_RENDERER', default='apps.payments.invoicing.html_document')
 
 # Admin Configuration
\ No newline at end of file
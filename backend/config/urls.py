@@ -3,25 +3,21 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
-from rest_framework import permissions
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
 from .admin import admin_site
-
-schema_view = get_schema_view(
-    openapi.Info(
-        title="API Docs",
-        default_version='v1',
-        description="API documentation",
-    ),
-    public=True,
-    permission_classes=(permissions.AllowAny,),
-)
+from .schema import SchemaView
 
 urlpatterns = [
     path('admin/', admin_site.urls),
-    path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-    path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
+    path('api/v1/', include('apps.core.urls')),
+    path('api/v1/', include('apps.messaging.urls')),
+    path('api/v1/', include('apps.businesses.urls')),
+    path('api/v1/', include('apps.categories.urls')),
+    path('api/v1/', include('apps.reviews.urls')),
+    path('api/v1/', include('apps.blog.urls')),
+    path('api/v1/', include('apps.crm.urls')),
+    path('api/v1/', include('apps.notifications.urls')),
+    path('swagger/', SchemaView.with_ui('swagger'), name='schema-swagger-ui'),
+    path('redoc/', SchemaView.with_ui('redoc'), name='schema-redoc'),
 ]
 
 # Serve media files in development